@@ -1,18 +1,23 @@
 # Importación de librerías
+import math
+
 import gurobipy as gp
 from gurobipy import GRB
 
-# Importación de parámetros globales
-# Diccionario con los costos por tipo de nodo
-from config import COST_BY_NODE_TYPE
+# Importación de parámetros por defecto
+from config import DEFAULT_PARAMS
+# Entorno de Gurobi compartido
+from Modelos.entorno_gurobi import obtener_entorno
 
 
-def base_model(totalNodes):
+def base_model(totalNodes, params=None, env=None):
     """
     Crea un modelo base de optimización para desplegar nodos con diferentes costos.
 
     Parámetros:
     - totalNodes (int): Número de nodos a desplegar (mínimo 4).
+    - params (ModelParams, opcional): Parámetros de costo y confiabilidad (por defecto DEFAULT_PARAMS).
+    - env (gurobipy.Env, opcional): Entorno donde crear el modelo (por defecto el entorno compartido del proceso).
 
     Retorna:
     - model (gurobipy.Model): Modelo base de Gurobi.
@@ -34,21 +39,28 @@ def base_model(totalNodes):
     - Minimizar el costo total, que es la suma de `nodesCost` y `linksCost`.
 
     Configuración adicional:
-    - Se desactiva la salida de Gurobi (`OutputFlag = 0`) para evitar mensajes en consola durante la optimización.
+    - Los parámetros del solver (p. ej. `OutputFlag = 0`) se aplican en el entorno (ver Modelos.entorno_gurobi),
+      no en cada modelo.
     """
+    if params is None:
+        params = DEFAULT_PARAMS
+
     # Validación de entrada
     if totalNodes < 4:
         raise ValueError("El número de nodos debe ser al menos 4.")
-    if not isinstance(COST_BY_NODE_TYPE, dict) or len(COST_BY_NODE_TYPE) == 0:
+    if len(params.costByNodeType) == 0:
         raise ValueError(
-            "COST_BY_NODE_TYPE debe ser un diccionario con los costos de los nodos.")
+            "params.costByNodeType debe contener los costos de los nodos.")
+
+    if env is None:
+        env = obtener_entorno()
 
     # Creación del modelo
-    model = gp.Model(f"General_Model_{totalNodes}_Nodes")
+    model = gp.Model(f"General_Model_{totalNodes}_Nodes", env=env)
 
     # Definición de conjuntos
     nodesSet = range(totalNodes)  # Conjunto de nodos
-    nodesTypeSet = range(len(COST_BY_NODE_TYPE))  # Conjunto de tipos de nodos
+    nodesTypeSet = range(len(params.costByNodeType))  # Conjunto de tipos de nodos
 
     # Definición de variables
     x = model.addVars(nodesSet, nodesTypeSet, vtype=GRB.BINARY,
@@ -62,7 +74,7 @@ def base_model(totalNodes):
     # Restricción 1: Definición del costo total de los nodos
     model.addConstr(
         nodesCost == gp.quicksum(
-            COST_BY_NODE_TYPE[i] * x[u, i] for u in nodesSet for i in nodesTypeSet),
+            params.costByNodeType[i] * x[u, i] for u in nodesSet for i in nodesTypeSet),
         name="NodesCost_def"
     )
 
@@ -78,10 +90,24 @@ def base_model(totalNodes):
     # Función objetivo: Minimizar el costo total
     model.setObjective(nodesCost + linksCost, GRB.MINIMIZE)
 
-    # Configuración del solver
-    model.setParam('OutputFlag', 0)  # Desactiva la salida de Gurobi en consola
-
     # Optimización
     model.optimize()
 
     return model
+
+
+def log_por_tipo(valores):
+    """
+    Logaritmo de un valor por tipo de nodo (confiabilidad o inconfiabilidad).
+
+    Como cada nodo tiene un único tipo, log(sum_i v_i * x[u, i]) = sum_i log(v_i) * x[u, i]:
+    los modelos usan estos coeficientes en restricciones lineales en lugar de una restricción
+    general log por nodo, lo que escala con el tamaño del catálogo.
+
+    Parámetros:
+    - valores (iterable[float]): Valor de cada tipo de nodo.
+
+    Retorna:
+    - list[float | None]: Logaritmo de cada valor; None si el valor es 0 (el tipo no puede usarse).
+    """
+    return [math.log(valor) if valor > 0 else None for valor in valores]
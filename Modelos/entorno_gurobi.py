@@ -0,0 +1,137 @@
+# ============================================================
+# Gestión de entornos de Gurobi compartidos
+# ============================================================
+import atexit
+import os
+import queue
+import threading
+from contextlib import contextmanager
+
+import gurobipy as gp
+
+# Parámetros aplicados a todo entorno creado por este módulo
+PARAMETROS_SOLVER = {
+    "OutputFlag": 0,  # Desactiva la salida de Gurobi en consola
+}
+
+# Entornos por proceso, indexados por sus parámetros (ver obtener_entorno)
+_entornos = {}
+_pidEntornos = None
+_candado = threading.Lock()
+
+
+def crear_entorno(parametros=None):
+    """
+    Crea y arranca un entorno de Gurobi con los parámetros del solver ya aplicados.
+
+    Parámetros:
+    - parametros (dict, opcional): Parámetros adicionales o que reemplazan a PARAMETROS_SOLVER.
+
+    Retorna:
+    - gurobipy.Env: Entorno iniciado; quien lo crea es responsable de liberarlo con dispose().
+    """
+    env = gp.Env(empty=True)
+    for nombre, valor in {**PARAMETROS_SOLVER, **(parametros or {})}.items():
+        env.setParam(nombre, valor)
+    env.start()
+    return env
+
+
+def obtener_entorno(parametros=None):
+    """
+    Retorna el entorno compartido del proceso actual para un conjunto de parámetros.
+
+    Se crea un único entorno por proceso (y por combinación de parámetros) la primera vez
+    que se pide; los procesos hijos de un pool crean el suyo propio. Los entornos se
+    liberan con liberar_entornos() o al terminar el proceso.
+
+    Parámetros:
+    - parametros (dict, opcional): Parámetros adicionales o que reemplazan a PARAMETROS_SOLVER.
+
+    Retorna:
+    - gurobipy.Env: Entorno compartido.
+    """
+    global _pidEntornos
+    clave = tuple(sorted((parametros or {}).items()))
+    with _candado:
+        if _pidEntornos != os.getpid():
+            # Proceso nuevo (fork): los entornos heredados pertenecen al padre
+            _entornos.clear()
+            _pidEntornos = os.getpid()
+        if clave not in _entornos:
+            _entornos[clave] = crear_entorno(parametros)
+        return _entornos[clave]
+
+
+def liberar_entornos():
+    """
+    Libera los entornos compartidos del proceso actual (y sus tokens de licencia).
+    """
+    with _candado:
+        if _pidEntornos == os.getpid():
+            for env in _entornos.values():
+                env.dispose()
+        _entornos.clear()
+
+
+atexit.register(liberar_entornos)
+
+
+class PoolEntornos:
+    """
+    Pool acotado de entornos de Gurobi para resolver modelos desde varios hilos.
+
+    Un entorno de Gurobi no debe usarse desde dos hilos a la vez; cada hilo toma un
+    entorno con adquirir() y lo devuelve al salir del bloque `with`.
+
+    Ejemplo:
+    >>> with PoolEntornos(4) as pool:
+    ...     with pool.adquirir() as env:
+    ...         baseModel = base_model(5, env=env)
+    ...         serie_model(baseModel, 5, 0.6, env=env)
+    """
+
+    def __init__(self, tamano, parametros=None):
+        if tamano < 1:
+            raise ValueError(f"El tamaño del pool debe ser al menos 1. Se recibió: {tamano}")
+        self._parametros = parametros
+        self._tamano = tamano
+        self._creados = []
+        self._libres = queue.LifoQueue()
+        self._candado = threading.Lock()
+
+    @contextmanager
+    def adquirir(self):
+        """
+        Toma un entorno del pool (creándolo si aún no se alcanzó el tamaño) y lo devuelve al terminar.
+        """
+        env = None
+        try:
+            env = self._libres.get_nowait()
+        except queue.Empty:
+            with self._candado:
+                if len(self._creados) < self._tamano:
+                    env = crear_entorno(self._parametros)
+                    self._creados.append(env)
+        if env is None:
+            env = self._libres.get()
+        try:
+            yield env
+        finally:
+            self._libres.put(env)
+
+    def cerrar(self):
+        """
+        Libera todos los entornos creados por el pool.
+        """
+        with self._candado:
+            for env in self._creados:
+                env.dispose()
+            self._creados.clear()
+            self._libres = queue.LifoQueue()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
@@ -0,0 +1,207 @@
+# ============================================================
+# Evaluación exacta y vectorizada de la confiabilidad (nodos y enlaces)
+# ============================================================
+import math
+
+from utils.utils import indice_variable
+# Importar parámetros por defecto
+from config import DEFAULT_PARAMS
+
+# Modelo de fallas de enlaces: cada enlace desplegado falla de forma independiente con probabilidad
+# 1 - params.linkReliability y está en serie con la red (si cae, la red deja de cumplir). Con L
+# enlaces la confiabilidad de la red es la de sus nodos por linkReliability^L, es decir, en
+# log-confiabilidad se suma L * log(linkReliability):
+# - Serie: n - 1 enlaces.
+# - Paralelo: n(n-1)/2 enlaces (malla completa).
+# - Híbrido: un enlace por nodo de la subred serie, uno entre subredes paralelas consecutivas y la
+#   malla completa de cada subred paralela (los mismos enlaces que se cobran en LinksCost_Hibrido).
+
+
+def log_confiabilidad_enlace(params=None):
+    """
+    Logaritmo de la confiabilidad de un enlace (0 con enlaces perfectos).
+    """
+    if params is None:
+        params = DEFAULT_PARAMS
+    return math.log(params.linkReliability)
+
+
+def enlaces_topologia(topologia, totalNodes):
+    """
+    Número de enlaces de la red: n - 1 en serie y n(n-1)/2 en paralelo (malla completa).
+    """
+    if topologia == "serie":
+        return totalNodes - 1
+    return totalNodes * (totalNodes - 1) // 2
+
+
+def _suma_logs(conteos, logs):
+    """
+    Suma sobre el último eje de conteo * log, tomando 0 donde el conteo es 0 (evita 0 * -inf).
+    """
+    import numpy as np
+
+    return np.where(conteos > 0, conteos * logs, 0.0).sum(axis=-1)
+
+
+def _log_paralela(logInconfiabilidad):
+    """
+    log(1 - exp(K)) con K = sum log(1 - r), la log-confiabilidad de una subred paralela.
+
+    log1p(-exp(K)) conserva la precisión cuando exp(K) es pequeño (alta confiabilidad) y
+    log(-expm1(K)) cuando K es cercano a 0.
+    """
+    import numpy as np
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(logInconfiabilidad < -math.log(2),
+                        np.log1p(-np.exp(logInconfiabilidad)),
+                        np.log(-np.expm1(logInconfiabilidad)))
+
+
+def log_confiabilidad_configuraciones(topologia, conteos, params=None):
+    """
+    Log-confiabilidad exacta de varias configuraciones a la vez, incluyendo los enlaces.
+
+    Solo depende de cuántos nodos de cada tipo hay en cada subred, por lo que evalúa miles de
+    configuraciones con unas pocas operaciones de numpy. Se trabaja en log para conservar la
+    precisión cerca de confiabilidad 1 (1 - prod(1 - r) se calcula con expm1).
+
+    Parámetros:
+    - topologia (str): "serie", "paralelo" o "hibrido".
+    - conteos (array-like): Nodos por tipo de cada configuración, de forma (m, tipos) en serie y
+      paralelo, o (m, subredes, tipos) en el híbrido (subred 0 en serie, las demás paralelas; una
+      subred sin nodos está inactiva).
+    - params (ModelParams, opcional): Parámetros del escenario (por defecto DEFAULT_PARAMS).
+
+    Retorna:
+    - numpy.ndarray: Log-confiabilidad de cada configuración, de forma (m,).
+    """
+    import numpy as np
+
+    if params is None:
+        params = DEFAULT_PARAMS
+
+    conteos = np.asarray(conteos, dtype=float)
+    reliability = np.asarray(params.reliabilityByNodeType, dtype=float)
+    with np.errstate(divide="ignore"):
+        logReliability = np.log(reliability)
+        logUnreliability = np.log1p(-reliability)
+    logEnlace = log_confiabilidad_enlace(params)
+    paralela = _log_paralela
+
+    if topologia == "serie":
+        totalNodes = conteos.sum(axis=-1)
+        return _suma_logs(conteos, logReliability) + logEnlace * (totalNodes - 1)
+
+    if topologia == "paralelo":
+        totalNodes = conteos.sum(axis=-1)
+        enlaces = totalNodes * (totalNodes - 1) / 2
+        return paralela(_suma_logs(conteos, logUnreliability)) + logEnlace * enlaces
+
+    if topologia == "hibrido":
+        tamanos = conteos.sum(axis=-1)  # (m, subredes)
+        tamanosParalelas = tamanos[:, 1:]
+        activas = tamanosParalelas > 0
+        logParalelas = np.where(activas, paralela(_suma_logs(conteos[:, 1:], logUnreliability)), 0.0)
+        enlaces = (tamanos[:, 0] + activas.sum(axis=-1) - 1
+                   + (tamanosParalelas * (tamanosParalelas - 1) / 2).sum(axis=-1))
+        return (_suma_logs(conteos[:, 0], logReliability) + logParalelas.sum(axis=-1)
+                + logEnlace * enlaces)
+
+    raise ValueError(f"Topología desconocida: {topologia}. Opciones: serie, paralelo, hibrido")
+
+
+def log_confiabilidad_escenarios(topologia, conteos, escenarios, params=None):
+    """
+    Log-confiabilidad de varias configuraciones en varios escenarios de confiabilidad de los nodos.
+
+    Igual que log_confiabilidad_configuraciones, pero la confiabilidad de cada tipo cambia por
+    escenario: las sumas por tipo pasan a ser productos de matrices (configuraciones x tipos) por
+    (tipos x escenarios), por lo que miles de escenarios cuestan unas pocas operaciones de numpy.
+    Los enlaces conservan params.linkReliability en todos los escenarios.
+
+    Parámetros:
+    - topologia (str): "serie", "paralelo" o "hibrido".
+    - conteos (array-like): Nodos por tipo de cada configuración (ver log_confiabilidad_configuraciones).
+    - escenarios (array-like): Confiabilidad de cada tipo por escenario, de forma (escenarios, tipos),
+      con valores en (0, 1).
+    - params (ModelParams, opcional): Parámetros del escenario (por defecto DEFAULT_PARAMS).
+
+    Retorna:
+    - numpy.ndarray: Log-confiabilidad de forma (m, escenarios).
+    """
+    import numpy as np
+
+    if params is None:
+        params = DEFAULT_PARAMS
+
+    conteos = np.asarray(conteos, dtype=float)
+    escenarios = np.asarray(escenarios, dtype=float)
+    logReliability = np.log(escenarios).T  # (tipos, escenarios)
+    logUnreliability = np.log1p(-escenarios).T
+    logEnlace = log_confiabilidad_enlace(params)
+
+    if topologia == "serie":
+        enlaces = conteos.sum(axis=-1) - 1
+        return conteos @ logReliability + (logEnlace * enlaces)[:, None]
+
+    if topologia == "paralelo":
+        totalNodes = conteos.sum(axis=-1)
+        enlaces = totalNodes * (totalNodes - 1) / 2
+        return _log_paralela(conteos @ logUnreliability) + (logEnlace * enlaces)[:, None]
+
+    if topologia == "hibrido":
+        tamanos = conteos.sum(axis=-1)  # (m, subredes)
+        tamanosParalelas = tamanos[:, 1:]
+        activas = tamanosParalelas > 0
+        # (m, subredes paralelas, escenarios); una subred inactiva aporta log 1 = 0
+        logParalelas = np.where(activas[:, :, None], _log_paralela(conteos[:, 1:] @ logUnreliability), 0.0)
+        enlaces = (tamanos[:, 0] + activas.sum(axis=-1) - 1
+                   + (tamanosParalelas * (tamanosParalelas - 1) / 2).sum(axis=-1))
+        return conteos[:, 0] @ logReliability + logParalelas.sum(axis=1) + (logEnlace * enlaces)[:, None]
+
+    raise ValueError(f"Topología desconocida: {topologia}. Opciones: serie, paralelo, hibrido")
+
+
+def confiabilidad_configuraciones(topologia, conteos, params=None):
+    """
+    Confiabilidad exacta de varias configuraciones (ver log_confiabilidad_configuraciones).
+    """
+    import numpy as np
+
+    return np.exp(log_confiabilidad_configuraciones(topologia, conteos, params))
+
+
+def conteos_desde_variables(variables, numTipos, numSubredes=None):
+    """
+    Nodos por tipo (y por subred en el híbrido) de una solución de los modelos.
+
+    Parámetros:
+    - variables (dict): Variables de decisión x[u, i] (e y[u, j] en el híbrido) y sus valores.
+    - numTipos (int): Número de tipos de nodo.
+    - numSubredes (int, opcional): Número de subredes del híbrido; sin él se cuentan solo los tipos.
+
+    Retorna:
+    - numpy.ndarray: Conteos de forma (tipos,) o (subredes, tipos), listos para apilarse y
+      pasarse a log_confiabilidad_configuraciones.
+    """
+    import numpy as np
+
+    tipos, subred = {}, {}
+    for var, val in variables.items():
+        if val > 0.5:
+            if var.startswith("x["):
+                u, i = indice_variable(var)[1]
+                tipos[u] = i
+            elif var.startswith("y["):
+                u, j = indice_variable(var)[1]
+                subred[u] = j
+
+    if numSubredes is None:
+        return np.bincount(list(tipos.values()), minlength=numTipos)
+
+    conteos = np.zeros((numSubredes, numTipos), dtype=int)
+    for u, i in tipos.items():
+        conteos[subred.get(u, 0), i] += 1
+    return conteos
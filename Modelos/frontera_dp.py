@@ -0,0 +1,188 @@
+# ============================================================
+# Fronteras exactas de serie y paralelo para todos los n (programación dinámica)
+# ============================================================
+import bisect
+import math
+import time
+
+from Modelos.evaluador import enlaces_topologia, log_confiabilidad_enlace
+from Modelos.objetivo import log_confiabilidad, log_inconfiabilidad, es_alta_confiabilidad
+# Importar parámetros por defecto
+from config import DEFAULT_PARAMS
+
+# Topologías cuya confiabilidad depende solo de cuántos nodos hay de cada tipo
+TOPOLOGIAS_DP = ("serie", "paralelo")
+
+# Tolerancia en log-confiabilidad al comparar con la requerida: absorbe el redondeo de sumar logaritmos
+# y de representar R cerca de 1 (1 - 0.99999 tiene error relativo ~1e-11). En alta confiabilidad
+# (ver Modelos.objetivo) es relativa al puntaje requerido: log R de serie es del orden de 1 - R
+TOLERANCIA_LOG = 1e-9
+
+
+def puntaje_tipo(topologia, confiabilidad):
+    """
+    Aporte aditivo de un nodo al puntaje de la red (mayor es más confiable).
+
+    - Serie: log(r), la red cumple si la suma es >= log(R).
+    - Paralelo: -log(1 - r), la red cumple si la suma es >= -log(1 - R).
+    """
+    if topologia == "serie":
+        return math.log(confiabilidad) if confiabilidad > 0 else -math.inf
+    if topologia == "paralelo":
+        return -math.log1p(-confiabilidad) if confiabilidad < 1 else math.inf
+    raise ValueError(f"Topología sin frontera DP: {topologia}. Opciones: {', '.join(TOPOLOGIAS_DP)}")
+
+
+def puntaje_requerido(topologia, totalNodes, requiredReliability, params=None):
+    """
+    Puntaje que deben sumar los nodos para que la red alcance la confiabilidad requerida.
+
+    Los enlaces no dependen de los tipos elegidos: con L enlaces de confiabilidad l, los nodos
+    deben alcanzar por sí solos R / l^L (ver Modelos.evaluador). Si eso supera 1, ninguna
+    configuración cumple y el puntaje es infinito.
+    """
+    if params is None:
+        params = DEFAULT_PARAMS
+    logEnlace = log_confiabilidad_enlace(params)
+    if logEnlace == 0 and topologia == "paralelo":
+        return -log_inconfiabilidad(requiredReliability)
+
+    logNodos = log_confiabilidad(requiredReliability) - enlaces_topologia(topologia, totalNodes) * logEnlace
+    if topologia == "serie":
+        return logNodos
+    return -math.log(-math.expm1(logNodos)) if logNodos < 0 else math.inf
+
+
+def _filtrar_dominadas(candidatos):
+    """
+    Conserva los puntos no dominados (menor costo, mayor puntaje) ordenados por costo creciente.
+    """
+    frontera = []
+    mejorPuntaje = -math.inf
+    for costo, puntaje, conteo in sorted(candidatos, key=lambda c: (c[0], -c[1])):
+        if puntaje > mejorPuntaje:
+            frontera.append((costo, puntaje, conteo))
+            mejorPuntaje = puntaje
+    return frontera
+
+
+def frontera_siguiente(frontera, costos, puntajes):
+    """
+    Frontera de n + 1 nodos a partir de la de n nodos.
+
+    Costo y puntaje son aditivos por nodo, así que quitar un nodo de una configuración no
+    dominada deja una configuración no dominada: basta con agregar un nodo de cada tipo a los
+    puntos de la frontera anterior y filtrar las dominadas.
+
+    Parámetros:
+    - frontera (list[tuple]): Puntos (costo de nodos, puntaje, conteo por tipo) de n nodos.
+    - costos (tuple[float]): Costo de cada tipo de nodo.
+    - puntajes (tuple[float]): Puntaje de cada tipo de nodo (ver puntaje_tipo).
+
+    Retorna:
+    - list[tuple]: Frontera de n + 1 nodos, con costo y puntaje estrictamente crecientes.
+    """
+    candidatos = {}
+    for costo, puntaje, conteo in frontera:
+        for i, (costoTipo, puntajeTipo) in enumerate(zip(costos, puntajes)):
+            nuevo = conteo[:i] + (conteo[i] + 1,) + conteo[i + 1:]
+            if nuevo not in candidatos:
+                candidatos[nuevo] = (costo + costoTipo, puntaje + puntajeTipo, nuevo)
+    return _filtrar_dominadas(candidatos.values())
+
+
+def iterar_fronteras(topologia, maxNodes, params=None, inicial=None):
+    """
+    Genera (n, frontera) para n = 1..maxNodes reutilizando la frontera anterior en cada paso.
+
+    Con `inicial` = (n0, frontera de n0 nodos) continúa desde n0 + 1 (para extender fronteras ya calculadas).
+    """
+    if params is None:
+        params = DEFAULT_PARAMS
+    puntajes = tuple(puntaje_tipo(topologia, r) for r in params.reliabilityByNodeType)
+
+    n0, frontera = inicial if inicial is not None else (0, [(0.0, 0.0, (0,) * len(params.costByNodeType))])
+    for n in range(n0 + 1, maxNodes + 1):
+        frontera = frontera_siguiente(frontera, params.costByNodeType, puntajes)
+        yield n, frontera
+
+
+def fronteras_multi_n(topologia, maxNodes, params=None, minNodes=4):
+    """
+    Calcula las fronteras costo vs confiabilidad de serie o paralelo para n = minNodes..maxNodes
+    en una sola pasada incremental: la frontera de n se obtiene de la de n - 1.
+
+    Parámetros:
+    - topologia (str): "serie" o "paralelo".
+    - maxNodes (int): Número máximo de nodos.
+    - params (ModelParams, opcional): Parámetros del escenario (por defecto DEFAULT_PARAMS).
+    - minNodes (int): Primer número de nodos a retornar.
+
+    Retorna:
+    - dict: Frontera de cada n (ver frontera_siguiente); cada punto guarda el costo de los nodos,
+      sin enlaces.
+    """
+    return {
+        n: frontera
+        for n, frontera in iterar_fronteras(topologia, maxNodes, params)
+        if n >= minNodes
+    }
+
+
+def costos_minimos(frontera, topologia, totalNodes, requiredReliabilities, params=None):
+    """
+    Configuración más barata de la frontera que alcanza cada confiabilidad requerida.
+
+    Parámetros:
+    - frontera (list[tuple]): Frontera de `totalNodes` nodos.
+    - topologia (str): "serie" o "paralelo".
+    - totalNodes (int): Número de nodos.
+    - requiredReliabilities (list[float]): Confiabilidades requeridas (0 < valor < 1).
+    - params (ModelParams, opcional): Parámetros del escenario (por defecto DEFAULT_PARAMS).
+
+    Retorna:
+    - list[tuple]: Por confiabilidad, (costo de nodos, costo de enlaces, conteo por tipo),
+      o (None, None, None) si ninguna configuración la alcanza.
+    """
+    if params is None:
+        params = DEFAULT_PARAMS
+    costoEnlaces = params.linkCost * enlaces_topologia(topologia, totalNodes)
+    # Puntajes crecientes con el costo: el primer punto que cumple es el más barato
+    puntajesFrontera = [puntaje for _, puntaje, _ in frontera]
+
+    soluciones = []
+    for reqRel in requiredReliabilities:
+        objetivo = puntaje_requerido(topologia, totalNodes, reqRel, params)
+        tolerancia = TOLERANCIA_LOG * min(1.0, abs(objetivo)) if es_alta_confiabilidad(reqRel) else TOLERANCIA_LOG
+        posicion = bisect.bisect_left(puntajesFrontera, objetivo - tolerancia)
+        if posicion == len(frontera):
+            soluciones.append((None, None, None))
+        else:
+            costoNodos, _, conteo = frontera[posicion]
+            soluciones.append((costoNodos, costoEnlaces, conteo))
+    return soluciones
+
+
+def resolver_multi_n(topologia, totalNodes, requiredReliabilities, params=None):
+    """
+    Resuelve una grilla de confiabilidades para varios números de nodos con una sola pasada DP.
+
+    Parámetros:
+    - topologia (str): "serie" o "paralelo".
+    - totalNodes (list[int]): Números de nodos a evaluar.
+    - requiredReliabilities (list[float]): Confiabilidades requeridas.
+    - params (ModelParams, opcional): Parámetros del escenario (por defecto DEFAULT_PARAMS).
+
+    Retorna:
+    - dict: Para cada n, (soluciones, tiempo_s): las soluciones de costos_minimos y el tiempo de
+      la pasada DP desde el n anterior solicitado.
+    """
+    pedidos = set(totalNodes)
+    resultados = {}
+    inicio = time.perf_counter()
+    for n, frontera in iterar_fronteras(topologia, max(pedidos), params):
+        if n in pedidos:
+            soluciones = costos_minimos(frontera, topologia, n, requiredReliabilities, params)
+            resultados[n] = (soluciones, time.perf_counter() - inicio)
+            inicio = time.perf_counter()
+    return resultados
@@ -0,0 +1,241 @@
+# ============================================================
+# Frontera costo vs confiabilidad del modelo híbrido (épsilon-restricción)
+# ============================================================
+import bisect
+import math
+
+from gurobipy import GRB
+
+from Modelos.hybrid_model import construir_hybrid_model
+from Modelos.evaluador import log_confiabilidad_configuraciones, conteos_desde_variables
+from Modelos.objetivo import ConfiabilidadRequerida, log_confiabilidad, log_inconfiabilidad, es_alta_confiabilidad
+from utils.utils import indice_variable
+# Importar parámetros por defecto
+from config import DEFAULT_PARAMS, MAX_RELIABILITY, LIMITE_NUEVES, UMBRAL_ALTA_CONFIABILIDAD
+
+# Tolerancia de factibilidad del modelo de la frontera: la separación entre escalones debe superarla
+TOLERANCIA_FACTIBILIDAD = 1e-9
+
+
+def _log1mexp(logValor):
+    """
+    log(1 - exp(logValor)) sin pérdida de precisión: log1p(-exp) si exp es pequeño, log(-expm1) si no.
+    """
+    if logValor < -math.log(2):
+        return math.log1p(-math.exp(logValor))
+    return math.log(-math.expm1(logValor))
+
+
+def log_confiabilidad_hibrido(variables, params=None):
+    """
+    Log-confiabilidad exacta de una configuración híbrida a partir de sus variables de decisión.
+
+    La subred 0 está en serie (producto de confiabilidades) y cada subred j > 0 es paralela
+    (1 - producto de inconfiabilidades); las subredes se conectan en serie entre sí y con los
+    enlaces (ver Modelos.evaluador).
+
+    Parámetros:
+    - variables (dict): Variables de decisión x[u, i] e y[u, j] y sus valores.
+    - params (ModelParams, opcional): Parámetros del escenario (por defecto DEFAULT_PARAMS).
+
+    Retorna:
+    - float: Log-confiabilidad total de la red.
+    """
+    if params is None:
+        params = DEFAULT_PARAMS
+    numTipos = len(params.reliabilityByNodeType)
+    numSubredes = 1 + max((indice_variable(var)[1][1] for var in variables if var.startswith("y[")), default=0)
+
+    conteos = conteos_desde_variables(variables, numTipos, numSubredes)
+    return float(log_confiabilidad_configuraciones("hibrido", conteos[None], params)[0])
+
+
+def confiabilidad_hibrido(variables, params=None):
+    """
+    Confiabilidad exacta de una configuración híbrida (ver log_confiabilidad_hibrido).
+    """
+    return math.exp(log_confiabilidad_hibrido(variables, params))
+
+
+def log_inconfiabilidad_hibrido(variables, params=None):
+    """
+    log(1 - R) exacto de una configuración híbrida, sin pasar por R (-inf si R = 1).
+    """
+    logConfiabilidad = log_confiabilidad_hibrido(variables, params)
+    return math.log(-math.expm1(logConfiabilidad)) if logConfiabilidad < 0 else -math.inf
+
+
+def _modelo_frontera(baseModel, totalNodes, objetivo, params, env, costoMinimo, inicio):
+    """
+    Modelo híbrido de un escalón de la frontera: tolerancia ajustada, cota inferior del costo
+    ("CotaInferiorCosto") y solución inicial (valores de las variables enteras por nombre).
+    """
+    model = construir_hybrid_model(baseModel, totalNodes, objetivo, params, env)
+    # La separación entre escalones es del orden de epsilon: la tolerancia debe ser menor
+    model.setParam("FeasibilityTol", TOLERANCIA_FACTIBILIDAD)
+    model.update()
+    model.addConstr(model.getObjective() >= costoMinimo, name="CotaInferiorCosto")
+    for var in model.getVars():
+        if var.VarName in inicio:
+            var.Start = inicio[var.VarName]
+    return model
+
+
+def frontera_hibrido(baseModel, totalNodes, confiabilidadInicial, confiabilidadMaxima=MAX_RELIABILITY,
+                     params=None, env=None, epsilon=1e-6, maxPasos=None):
+    """
+    Calcula la frontera escalonada costo vs confiabilidad del modelo híbrido.
+
+    En lugar de resolver una grilla fija, se resuelve para `confiabilidadInicial`, se mide la
+    confiabilidad que alcanza el óptimo y se exige apenas más para obtener el siguiente escalón,
+    hasta que el modelo es infactible (el último escalón es la máxima confiabilidad alcanzable)
+    o el objetivo supera config.LIMITE_NUEVES nueves. El avance se mide en log-inconfiabilidad
+    log(1 - R): cada escalón exige una inconfiabilidad una fracción `epsilon` menor que la
+    alcanzada, de modo que la resolución es la misma cerca de confiabilidad 1 que lejos de ella.
+
+    Mientras el objetivo está por debajo de config.UMBRAL_ALTA_CONFIABILIDAD el modelo se construye
+    una sola vez: entre escalones solo cambian el lado derecho de "TotalReliability", la cota
+    inferior del costo (la frontera es no decreciente) y la solución inicial (el óptimo anterior).
+    Desde el umbral la restricción de confiabilidad está escalada por la inconfiabilidad requerida
+    (ver construir_hybrid_model), sus coeficientes dependen del objetivo y el modelo se reconstruye
+    en cada escalón con la misma cota y solución inicial.
+
+    Parámetros:
+    - baseModel (gurobipy.Model): Modelo base generado por base_model.
+    - totalNodes (int): Número de nodos en la red (mínimo 4).
+    - confiabilidadInicial (float): Confiabilidad requerida del primer escalón (acepta una
+      ConfiabilidadRequerida de Modelos.objetivo).
+    - confiabilidadMaxima (float): Se detiene al alcanzar esta confiabilidad.
+    - params (ModelParams, opcional): Parámetros del escenario (por defecto DEFAULT_PARAMS).
+    - env (gurobipy.Env, opcional): Entorno donde copiar el modelo.
+    - epsilon (float): Reducción relativa de la inconfiabilidad entre escalones. El lado derecho debe
+      separarse de la confiabilidad alcanzada más que la tolerancia de factibilidad del modelo: si
+      el óptimo no cambia, el incremento se duplica (reintentando en frío) hasta avanzar.
+    - maxPasos (int, opcional): Número máximo de escalones.
+
+    Retorna:
+    - list[dict]: Escalones en orden creciente con claves "desde", "hasta" (confiabilidad alcanzada),
+      "log_inconfiabilidad" (log(1 - hasta), exacta aunque hasta redondee a 1), "costo",
+      "variables" y estadísticas del solver ("estado", "tiempo_s", "nodos_bnb", "iteraciones").
+      El costo mínimo para una confiabilidad r en (desde, hasta] es el costo del escalón.
+    """
+    if params is None:
+        params = DEFAULT_PARAMS
+
+    logMaxima = log_inconfiabilidad(confiabilidadMaxima)
+    logLimite = -LIMITE_NUEVES * math.log(10)
+    logUmbral = math.log(UMBRAL_ALTA_CONFIABILIDAD)
+
+    objetivo = confiabilidadInicial
+    model = _modelo_frontera(baseModel, totalNodes, objetivo, params, env, 0.0, {})
+    escalado = es_alta_confiabilidad(objetivo)
+
+    pasos = []
+    desde = confiabilidadInicial
+    incremento = None
+    while maxPasos is None or len(pasos) < maxPasos:
+        model.optimize()
+        if model.status != GRB.OPTIMAL:
+            break  # Ninguna configuración alcanza el objetivo: el último escalón es el máximo
+
+        variablesModelo = model.getVars()
+        variables = dict(zip(model.getAttr("VarName", variablesModelo), model.getAttr("X", variablesModelo)))
+        logAlcanzada = log_inconfiabilidad_hibrido(variables, params)
+        if pasos and logAlcanzada >= pasos[-1]["log_inconfiabilidad"]:
+            # Misma configuración dentro de la tolerancia: duplicar el incremento
+            if incremento >= 0.5:
+                break  # Ni la mitad de la inconfiabilidad restante cambia el óptimo
+            incremento = min(incremento * 2, 0.5)
+            logObjetivo = pasos[-1]["log_inconfiabilidad"] + math.log1p(-incremento)
+            if logObjetivo < logLimite:
+                break
+            objetivo = ConfiabilidadRequerida(logObjetivo)
+            if escalado or es_alta_confiabilidad(objetivo):
+                # La solución inicial puede quedar aceptada dentro de la tolerancia de las
+                # restricciones generales: el reintento parte en frío
+                model.dispose()
+                model = _modelo_frontera(baseModel, totalNodes, objetivo, params, env, pasos[-1]["costo"], {})
+                escalado = es_alta_confiabilidad(objetivo)
+            else:
+                model.getConstrByName("TotalReliability").RHS = log_confiabilidad(objetivo)
+                model.reset(1)
+            continue
+
+        alcanzada = -math.expm1(logAlcanzada)
+        if pasos and model.ObjVal <= pasos[-1]["costo"] + 1e-9 * max(1.0, abs(model.ObjVal)):
+            # Mismo costo con más confiabilidad: se extiende el escalón anterior
+            pasos[-1].update(hasta=alcanzada, log_inconfiabilidad=logAlcanzada, variables=variables)
+            pasos[-1]["tiempo_s"] += model.Runtime
+            pasos[-1]["nodos_bnb"] += model.NodeCount
+            pasos[-1]["iteraciones"] += model.IterCount
+        else:
+            pasos.append({
+                "desde": desde,
+                "hasta": alcanzada,
+                "log_inconfiabilidad": logAlcanzada,
+                "costo": model.ObjVal,
+                "variables": variables,
+                "estado": model.Status,
+                "tiempo_s": model.Runtime,
+                "nodos_bnb": model.NodeCount,
+                "iteraciones": model.IterCount,
+            })
+        desde = alcanzada
+        if logAlcanzada <= logMaxima:
+            break
+
+        # Siguiente escalón: exigir una inconfiabilidad apenas menor que la alcanzada. El incremento
+        # mínimo separa el lado derecho de la confiabilidad alcanzada más que la tolerancia: en log R
+        # sin escalar y relativo a la inconfiabilidad requerida en el modelo escalado
+        if logAlcanzada + math.log1p(-epsilon) <= logUmbral:
+            incremento = max(epsilon, 10 * TOLERANCIA_FACTIBILIDAD)
+        else:
+            incremento = max(epsilon, 10 * TOLERANCIA_FACTIBILIDAD / math.exp(logAlcanzada))
+        incremento = min(incremento, 0.5)
+        logObjetivo = logAlcanzada + math.log1p(-incremento)
+        if logObjetivo < logLimite:
+            break  # Objetivos más allá de LIMITE_NUEVES nueves no son representables
+        objetivo = ConfiabilidadRequerida(logObjetivo)
+
+        enteras = [var for var in variablesModelo if var.VType != GRB.CONTINUOUS]
+        if escalado or es_alta_confiabilidad(objetivo):
+            inicio = dict(zip(model.getAttr("VarName", enteras), model.getAttr("X", enteras)))
+            costoMinimo = model.ObjVal
+            model.dispose()
+            model = _modelo_frontera(baseModel, totalNodes, objetivo, params, env, costoMinimo, inicio)
+            escalado = es_alta_confiabilidad(objetivo)
+        else:
+            model.setAttr("Start", enteras, model.getAttr("X", enteras))
+            model.getConstrByName("CotaInferiorCosto").RHS = model.ObjVal
+            model.getConstrByName("TotalReliability").RHS = log_confiabilidad(objetivo)
+
+    model.dispose()
+    return pasos
+
+
+def costos_en_grilla(pasos, requiredReliabilities):
+    """
+    Evalúa la frontera escalonada en una grilla de confiabilidades requeridas.
+
+    La búsqueda se hace en log-inconfiabilidad, por lo que distingue objetivos de alta confiabilidad
+    (ConfiabilidadRequerida de Modelos.objetivo) que redondean al mismo float.
+
+    Parámetros:
+    - pasos (list[dict]): Resultado de frontera_hibrido.
+    - requiredReliabilities (list[float]): Confiabilidades requeridas.
+
+    Retorna:
+    - list[dict | None]: Escalón que resuelve cada confiabilidad (None si está fuera de la frontera).
+    """
+    # -log(1 - R) crece con R: orden creciente como la frontera
+    hastas = [-paso["log_inconfiabilidad"] for paso in pasos]
+    inicio = -log_inconfiabilidad(pasos[0]["desde"]) if pasos else None
+    resultado = []
+    for reqRel in requiredReliabilities:
+        objetivo = -log_inconfiabilidad(reqRel)
+        posicion = bisect.bisect_left(hastas, objetivo)
+        if not pasos or objetivo < inicio or posicion == len(pasos):
+            resultado.append(None)
+        else:
+            resultado.append(pasos[posicion])
+    return resultado
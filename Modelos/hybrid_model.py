@@ -6,37 +6,138 @@ from gurobipy import GRB
 import math
 
 from utils.validation import validar_entrada
-# Importar parámetros globales
-from config import LINK_COST, RELIABILITY_BY_NODE_TYPE
+from Modelos.base_model import log_por_tipo
+from Modelos.evaluador import log_confiabilidad_enlace
+from Modelos.objetivo import log_confiabilidad, log_inconfiabilidad, es_alta_confiabilidad
+from Modelos.pool_soluciones import romper_simetria_nodos, resolver_k_mejores, representantes_hibrido
+# Importar parámetros por defecto
+from config import DEFAULT_PARAMS
+
+# Holgura en log-confiabilidad de los cortes de cobertura: los cortes se derivan de un objetivo
+# apenas menor al requerido para no excluir soluciones que el solver acepta dentro de su tolerancia
+HOLGURA_CORTES = 1e-4
+
+# Alta confiabilidad: una subred paralela inactiva se representa con inconfiabilidad relativa
+# exp(-DESPLAZAMIENTO_SUBRED_INACTIVA) (~4e-18), despreciable frente a la requerida
+DESPLAZAMIENTO_SUBRED_INACTIVA = 40.0
+
 
 # ============================================================
-# Función principal: hybrid_model
+# Preprocesamiento: cotas y desigualdades válidas
 # ============================================================
 
 
-def hybrid_model(baseModel, totalNodes, requiredReliability):
+def _log(valor):
     """
-    Extiende el modelo base para incluir restricciones y costos del modelo híbrido.
+    Logaritmo natural que retorna -GRB.INFINITY en 0 (cota abierta).
+    """
+    return math.log(valor) if valor > 0 else -GRB.INFINITY
+
+
+def tabla_enlaces_paralelo(totalNodes):
+    """
+    Tabla de enlaces de una subred paralela (malla completa) según su tamaño.
+
+    Parámetros:
+    - totalNodes (int): Tamaño máximo de subred.
+
+    Retorna:
+    - Tuple[list[int], list[int]]: Tamaños 0..totalNodes y enlaces s(s-1)/2 de cada uno.
+    """
+    tamanos = list(range(totalNodes + 1))
+    return tamanos, [s * (s - 1) // 2 for s in tamanos]
+
+
+def cotas_cobertura(totalNodes, requiredReliability, reliabilityByNodeType, linkReliability=1.0):
+    """
+    Cotas de tamaño de subred y de enlaces implicadas por la confiabilidad requerida.
+
+    Toda subred está en serie con el resto (y con los enlaces), por lo que su confiabilidad debe
+    alcanzar por sí sola la requerida. Con el mejor tipo de nodo r_max y enlaces de confiabilidad l:
+    - La subred serie con k nodos tiene al menos k - 1 enlaces y confiabilidad a lo sumo
+      r_max^k * l^(k-1): k no puede superar la cota.
+    - Una subred paralela con m nodos tiene confiabilidad a lo sumo (1 - (1 - r_max)^m) * l^(m(m-1)/2):
+      solo los tamaños que alcanzan la requerida son posibles. Con enlaces perfectos la cota es
+      creciente en m y solo acota el tamaño mínimo; con l < 1 la malla también acota el máximo.
+    - La red con L enlaces tiene confiabilidad a lo sumo l^L: L no puede superar la cota.
+
+    Parámetros:
+    - totalNodes (int): Número de nodos en la red.
+    - requiredReliability (float): Confiabilidad total requerida; en alta confiabilidad (ver
+      Modelos.objetivo) la holgura de los cortes es relativa a la inconfiabilidad requerida.
+    - reliabilityByNodeType (tuple): Confiabilidad de cada tipo de nodo.
+    - linkReliability (float): Confiabilidad de cada enlace (1: enlaces perfectos).
+
+    Retorna:
+    - Tuple[int, int, int, int | None]: Máximo de nodos en la subred serie, mínimo y máximo de nodos
+      por subred paralela activa (mínimo mayor que totalNodes si ningún tamaño alcanza la requerida)
+      y máximo de enlaces (None con enlaces perfectos).
+    """
+    rMax = max(reliabilityByNodeType)
+    holgura = HOLGURA_CORTES
+    if es_alta_confiabilidad(requiredReliability):
+        holgura *= math.exp(log_inconfiabilidad(requiredReliability))
+    logObjetivo = log_confiabilidad(requiredReliability) - holgura
+    logEnlace = math.log(linkReliability)
+
+    maxSerie = totalNodes
+    if 0 < rMax and math.log(rMax) + logEnlace < 0:
+        maxSerie = min(totalNodes, math.floor((logObjetivo + logEnlace) / (math.log(rMax) + logEnlace)))
+
+    minParalelo, maxParalelo = 3, totalNodes
+    if 0 < rMax < 1 or logEnlace < 0:
+        def logParalela(m):
+            # log((1 - (1 - r_max)^m) * l^(m(m-1)/2))
+            logNodos = math.log(-math.expm1(m * math.log1p(-rMax))) if rMax < 1 else 0.0
+            return logNodos + logEnlace * m * (m - 1) / 2
+        posibles = [m for m in range(3, totalNodes + 1) if rMax > 0 and logParalela(m) >= logObjetivo]
+        minParalelo, maxParalelo = (posibles[0], posibles[-1]) if posibles else (totalNodes + 1, 0)
+
+    maxEnlaces = math.floor(logObjetivo / logEnlace) if logEnlace < 0 else None
+    return maxSerie, minParalelo, maxParalelo, maxEnlaces
+
+
+# ============================================================
+# Construcción del modelo híbrido
+# ============================================================
+
+
+def construir_hybrid_model(baseModel, totalNodes, requiredReliability, params=None, env=None, romperSimetria=False):
+    """
+    Construye (sin optimizar) el modelo híbrido sobre una copia del modelo base.
 
     Parámetros:
     - baseModel (gurobipy.Model): Modelo base generado por base_model.
     - totalNodes (int): Número de nodos en la red (mínimo 4).
-    - requiredReliability (float): Confiabilidad total requerida (0 < valor < 1).
+    - requiredReliability (float): Confiabilidad total requerida (0 < valor < 1); restricción "TotalReliability".
+      Desde config.UMBRAL_ALTA_CONFIABILIDAD (o con una ConfiabilidadRequerida de Modelos.objetivo)
+      la restricción se formula relativa a la inconfiabilidad requerida (ver más abajo).
+    - params (ModelParams, opcional): Parámetros del escenario; deben coincidir con los usados en base_model (por defecto DEFAULT_PARAMS).
+    - env (gurobipy.Env, opcional): Entorno donde copiar el modelo (por defecto el del modelo base).
+    - romperSimetria (bool): Agregar restricciones que eliminan configuraciones equivalentes por etiquetas
+      (siempre activas en alta confiabilidad).
 
     Retorna:
-    - costo_total (float): Costo total de la solución.
-    - variables_decision (dict): Variables de decisión y sus valores.
-    - model (gurobipy.Model): Modelo optimizado.
+    - model (gurobipy.Model): Modelo híbrido listo para optimizar.
     """
+    if params is None:
+        params = DEFAULT_PARAMS
+
     # Validación de entrada
-    validar_entrada(totalNodes, LINK_COST, RELIABILITY_BY_NODE_TYPE)
+    validar_entrada(totalNodes, params.linkCost, params.reliabilityByNodeType)
 
     # Copia del modelo base
-    model = baseModel.copy()
+    model = baseModel.copy(env=env) if env is not None else baseModel.copy()
 
     nodeSet = range(totalNodes)
     subnetSet = range(totalNodes // 3 + 1)
-    nodesTypeSet = range(len(RELIABILITY_BY_NODE_TYPE))
+    nodesTypeSet = range(len(params.reliabilityByNodeType))
+
+    # Cotas derivadas de los parámetros (preprocesamiento)
+    rMin, rMax = min(params.reliabilityByNodeType), max(params.reliabilityByNodeType)
+    tamanos, enlacesPorTamano = tabla_enlaces_paralelo(totalNodes)
+    maxSerie, minParalelo, maxParalelo, maxEnlaces = cotas_cobertura(
+        totalNodes, requiredReliability, params.reliabilityByNodeType, params.linkReliability)
 
     # Recuperar la variable linksCost del modelo base
     linksCost = model.getVarByName("linksCost")
@@ -58,8 +159,8 @@ def hybrid_model(baseModel, totalNodes, requiredReliability):
     # Variables adicionales
     y = model.addVars(nodeSet, subnetSet, vtype=GRB.BINARY, name="y")
     activeSubnet = model.addVars(subnetSet, vtype=GRB.BINARY, name="activeSubnet")
-    nodesBySubnet = model.addVars(subnetSet, vtype=GRB.INTEGER, name="nodesBySubnet")
-    parallelSubnetLinks = model.addVars(subnetSet, vtype=GRB.INTEGER, name="parallelSubnetLinks")
+    nodesBySubnet = model.addVars(subnetSet, ub=totalNodes, vtype=GRB.INTEGER, name="nodesBySubnet")
+    parallelSubnetLinks = model.addVars(subnetSet, ub=enlacesPorTamano[-1], vtype=GRB.INTEGER, name="parallelSubnetLinks")
 
     # Definiciones auxiliares
     model.addConstrs(  # Definición de nodos por subred
@@ -70,6 +171,11 @@ def hybrid_model(baseModel, totalNodes, requiredReliability):
         (2 * parallelSubnetLinks[j] == nodesBySubnet[j] * (nodesBySubnet[j] - 1) for j in subnetSet if j > 0),
         name="Enlaces_Paralelo_Subred"
     )
+    model.addConstrs(  # Envolvente lineal de la tabla de enlaces: exacta en los tamaños t y t + 1
+        (parallelSubnetLinks[j] >= enlacesPorTamano[t] + t * (nodesBySubnet[j] - t)
+         for j in subnetSet if j > 0 for t in tamanos[:-1]),
+        name="Enlaces_Paralelo_Tabla"
+    )
     model.addConstr( # Definición de enlaces paralelos por subred j = 0
         parallelSubnetLinks[0] == 0,
         name="Enlaces_Paralelo_Subred_Serie"
@@ -89,43 +195,81 @@ def hybrid_model(baseModel, totalNodes, requiredReliability):
         name="Subredes_Min_3"
     )
     model.addConstr( # La suma de nodos asignados a subredes activas debe ser igual al total de nodos
-        (gp.quicksum(activeSubnet[j]*nodesBySubnet[j] for j in subnetSet) == totalNodes),
+        (gp.quicksum(nodesBySubnet[j] for j in subnetSet) == totalNodes),
         name="Total_Nodos_Asignados"
     )
+    model.addConstrs( # Solo las subredes activas tienen nodos (linealiza activeSubnet[j]*nodesBySubnet[j])
+        (nodesBySubnet[j] <= totalNodes * activeSubnet[j] for j in subnetSet),
+        name="Subred_Inactiva_Vacia"
+    )
+
+    # Desigualdades válidas de cobertura derivadas de la confiabilidad requerida
+    if maxSerie < totalNodes:
+        model.addConstr( # La subred serie no puede superar maxSerie nodos
+            nodesBySubnet[0] <= maxSerie,
+            name="Cobertura_Serie"
+        )
+    if minParalelo > 3:
+        model.addConstrs( # Las subredes paralelo activas necesitan al menos minParalelo nodos
+            (nodesBySubnet[j] >= minParalelo * activeSubnet[j] for j in subnetSet if j > 0),
+            name="Cobertura_Paralelo"
+        )
+    if maxParalelo < totalNodes:
+        model.addConstrs( # Las subredes paralelo no pueden superar maxParalelo nodos (malla de enlaces)
+            (nodesBySubnet[j] <= maxParalelo for j in subnetSet if j > 0),
+            name="Cobertura_Paralelo_Max"
+        )
 
     # Cálculo del costo de enlaces
     extraSubnetConnections = gp.quicksum(activeSubnet[j] for j in subnetSet if j > 0) - 1
     totalParallelSubnetLinks = gp.quicksum(parallelSubnetLinks[j] for j in subnetSet if j > 0)
+    totalLinks = nodesBySubnet[0] + extraSubnetConnections + totalParallelSubnetLinks
     model.addConstr(
-        linksCost == LINK_COST * (nodesBySubnet[0] + extraSubnetConnections + totalParallelSubnetLinks),
+        linksCost == params.linkCost * totalLinks,
         name="LinksCost_Hibrido"
     )
+    if maxEnlaces is not None:
+        model.addConstr( # Presupuesto de enlaces: l^L no puede quedar por debajo de la requerida
+            totalLinks <= maxEnlaces,
+            name="Presupuesto_Enlaces"
+        )
 
     ############################ CONFIABILIDAD ############################
 
-    nodeReliability = model.addVars(nodeSet, vtype=GRB.CONTINUOUS, name="nodeReliability")
-    nodeUnreliability = model.addVars(nodeSet, vtype=GRB.CONTINUOUS, name="nodeUnreliability")
-    logNodeReliability = model.addVars(nodeSet, vtype=GRB.CONTINUOUS, lb=-GRB.INFINITY, name="logNodeReliability")
-    logNodeUnreliability = model.addVars(nodeSet, vtype=GRB.CONTINUOUS, lb=-GRB.INFINITY, name="logNodeUnreliability")
-    logSubnetTotalReliability = model.addVars(subnetSet, vtype=GRB.CONTINUOUS, lb=-GRB.INFINITY, name="logSubnetTotalReliability")
+    # Cotas de las variables continuas: acotan el dominio de las restricciones generales log/exp
+    minUnreliability, maxUnreliability = 1 - rMax, 1 - rMin
+    minParallelReliability = 1 - maxUnreliability ** 3  # Subred paralela activa con al menos 3 nodos
 
-    for u in nodeSet: # Definición de confiabilidad e inconfiabilidad de los nodos
-        model.addConstr( # Definición de nodeReliability[u]
-            nodeReliability[u] == gp.quicksum(RELIABILITY_BY_NODE_TYPE[i] * x[u, i] for i in nodesTypeSet),
-            name=f"NodeReliability_{u}"
-        )
-        model.addConstr(  # Definición de nodeUnreliability[u]
-            nodeUnreliability[u] == 1 - gp.quicksum(RELIABILITY_BY_NODE_TYPE[i] * x[u, i] for i in nodesTypeSet),
-            name=f"NodeUnreliability_{u}"
-        )
-        model.addGenConstrLog(  # Definición de logNodeReliability[u]
-            nodeReliability[u], logNodeReliability[u],
+    logNodeReliability = model.addVars(nodeSet, vtype=GRB.CONTINUOUS, lb=_log(rMin), ub=_log(rMax), name="logNodeReliability")
+    logNodeUnreliability = model.addVars(nodeSet, vtype=GRB.CONTINUOUS, lb=_log(minUnreliability), ub=_log(maxUnreliability), name="logNodeUnreliability")
+    logSubnetTotalReliability = model.addVars(subnetSet, vtype=GRB.CONTINUOUS, lb=-GRB.INFINITY, ub=0, name="logSubnetTotalReliability")
+
+    logReliability = log_por_tipo(params.reliabilityByNodeType)
+    logUnreliability = log_por_tipo(1 - r for r in params.reliabilityByNodeType)
+
+    # Alta confiabilidad: log R es del orden de la tolerancia del solver y 1 - exp(K_j) pierde la
+    # inconfiabilidad de la subred. La restricción -log R_red <= -log R se divide por U = 1 - R para
+    # que sus términos sean de orden 1: la subred serie y los enlaces entran con su log exacto y cada
+    # subred paralela, con z_j = exp(K_j) / U <= 1, con -log(1 - U z_j) / U = z_j + U z_j^2 / 2 + O(U^2)
+    # (error relativo de orden U^2, muy por debajo de la tolerancia del solver)
+    altaConfiabilidad = es_alta_confiabilidad(requiredReliability)
+    logInconfiabilidadRequerida = log_inconfiabilidad(requiredReliability)
+    inconfiabilidadRelativa = {}
+
+    for u in nodeSet: # Definición de log-confiabilidad y log-inconfiabilidad de los nodos
+        model.addConstr(  # Definición de logNodeReliability[u] (lineal en x, ver log_por_tipo)
+            logNodeReliability[u] == gp.quicksum(
+                logReliability[i] * x[u, i] for i in nodesTypeSet if logReliability[i] is not None),
             name=f"LogNodeReliability_{u}"
         )
-        model.addGenConstrLog(  # Definición de logNodeUnreliability[u]
-            nodeUnreliability[u], logNodeUnreliability[u],
+        model.addConstr(  # Definición de logNodeUnreliability[u]
+            logNodeUnreliability[u] == gp.quicksum(
+                logUnreliability[i] * x[u, i] for i in nodesTypeSet if logUnreliability[i] is not None),
             name=f"LogNodeUnreliability_{u}"
         )
+        for i in nodesTypeSet:
+            if logReliability[i] is None or logUnreliability[i] is None:  # log(0) no está definido
+                x[u, i].ub = 0
 
     for j in subnetSet: # Definición de confiabilidad por subredes
         if j == 0: # confiabilidad de la subred serie
@@ -134,21 +278,39 @@ def hybrid_model(baseModel, totalNodes, requiredReliability):
                 name=f"SerieSubnetReliability_def_0"
             )
         else: # confiabilidad de las subredes paralelas
-            subnetUnreliability = model.addVar(vtype=GRB.CONTINUOUS, lb=-GRB.INFINITY, name=f"subnetUnreliability_{j}")
-            expSubnetUnreliability = model.addVar(vtype=GRB.CONTINUOUS, lb=-GRB.INFINITY, name=f"expSubnetUnreliability_{j}")
-            subnetReliability = model.addVar(vtype=GRB.CONTINUOUS, name=f"subnetReliability_{j}")
-            logSubnetReliability = model.addVar(vtype=GRB.CONTINUOUS, lb=-GRB.INFINITY, name=f"logSubnetReliability_{j}")
+            subnetUnreliability = model.addVar(vtype=GRB.CONTINUOUS, lb=totalNodes * _log(minUnreliability), ub=0, name=f"subnetUnreliability_{j}")
+            if not altaConfiabilidad:
+                expSubnetUnreliability = model.addVar(vtype=GRB.CONTINUOUS, lb=0, ub=1, name=f"expSubnetUnreliability_{j}")
+                subnetReliability = model.addVar(vtype=GRB.CONTINUOUS, lb=minParallelReliability, ub=1, name=f"subnetReliability_{j}")
+                logSubnetReliability = model.addVar(vtype=GRB.CONTINUOUS, lb=_log(minParallelReliability), ub=0, name=f"logSubnetReliability_{j}")
 
             model.addConstr(  # Definir subnetUnreliability
                 subnetUnreliability == gp.quicksum(y[u, j] * logNodeUnreliability[u] for u in nodeSet),
                 name=f"SubnetUnreliability_def_{j}"
             )
+            if altaConfiabilidad:
+                # w_j = K_j - log U si está activa; -DESPLAZAMIENTO_SUBRED_INACTIVA si no (K_j = 0)
+                scaledUnreliability = model.addVar(
+                    vtype=GRB.CONTINUOUS, ub=0, name=f"scaledSubnetUnreliability_{j}",
+                    lb=min(totalNodes * _log(minUnreliability) - logInconfiabilidadRequerida, -DESPLAZAMIENTO_SUBRED_INACTIVA))
+                inconfiabilidadRelativa[j] = model.addVar(vtype=GRB.CONTINUOUS, lb=0, ub=1, name=f"relativeSubnetUnreliability_{j}")
+                model.addConstr(
+                    scaledUnreliability == subnetUnreliability - logInconfiabilidadRequerida
+                    - (1 - activeSubnet[j]) * (DESPLAZAMIENTO_SUBRED_INACTIVA - logInconfiabilidadRequerida),
+                    name=f"ScaledSubnetUnreliability_def_{j}"
+                )
+                model.addGenConstrExp(  # exp(K_j) / U
+                    scaledUnreliability, inconfiabilidadRelativa[j],
+                    name=f"relativeSubnetUnreliability_{j}"
+                )
+                continue
             model.addGenConstrExp(  # Definir relación del exp^K_j
                 subnetUnreliability, expSubnetUnreliability,
                 name=f"expSubnetUnreliability_{j}"
             )
-            model.addConstr( # Definición de subnetReliability
-                subnetReliability == 1 - (activeSubnet[j]*expSubnetUnreliability),
+            model.addConstr( # Definición de subnetReliability: 1 - exp(K_j) si está activa, 1 si no
+                # (una subred inactiva no tiene nodos, K_j = 0 y exp(K_j) = 1)
+                subnetReliability == 2 - activeSubnet[j] - expSubnetUnreliability,
                 name=f"SubnetReliability_{j}"
             )
             model.addGenConstrLog(  # Definir relación del log(1-exp(K_j))
@@ -160,21 +322,94 @@ def hybrid_model(baseModel, totalNodes, requiredReliability):
                 name=f"ParallelSubnetReliability_def_{j}"
             )
 
-    # Restricción para la confiabilidad total de la red
-    totalReliability = model.addVar(vtype=GRB.CONTINUOUS, lb=-GRB.INFINITY, name="TotalReliability")
+    # Enlaces en serie con la red: cada enlace cobrado en LinksCost_Hibrido suma log(linkReliability),
+    # lineal en las variables enteras de conteo de enlaces (ver Modelos.evaluador)
+    logEnlace = log_confiabilidad_enlace(params)
 
-    model.addConstr(  # Definición de totalReliability
-        totalReliability == gp.quicksum(logSubnetTotalReliability[j] for j in subnetSet),
-        name="TotalReliability_def"
-    )
+    if altaConfiabilidad:
+        inconfiabilidadRequerida = math.exp(logInconfiabilidadRequerida)
+        # Un tipo con -log r > U no cabe en la subred serie ni con un solo nodo; el resto tiene
+        # coeficientes log r / U en [-1, 0]
+        tiposSerie = [i for i in nodesTypeSet
+                      if logReliability[i] is not None and logReliability[i] >= -inconfiabilidadRequerida]
+        model.addConstrs(
+            (y[u, 0] + x[u, i] <= 1 for u in nodeSet for i in nodesTypeSet if i not in tiposSerie),
+            name="AltaConfiabilidad_TiposSerie"
+        )
+        model.addConstr(  # Constraint de confiabilidad total: -log R_red / U <= -log R / U (~1)
+            gp.quicksum(inconfiabilidadRelativa[j] + inconfiabilidadRequerida / 2 * inconfiabilidadRelativa[j] * inconfiabilidadRelativa[j]
+                        for j in subnetSet if j > 0)
+            - gp.quicksum(logReliability[i] / inconfiabilidadRequerida * y[u, 0] * x[u, i]
+                          for u in nodeSet for i in tiposSerie)
+            - (logEnlace / inconfiabilidadRequerida * totalLinks if logEnlace != 0 else 0)
+            <= -log_confiabilidad(requiredReliability) / inconfiabilidadRequerida,
+            name="TotalReliability"
+        )
+    else:
+        # Restricción para la confiabilidad total de la red
+        totalReliability = model.addVar(vtype=GRB.CONTINUOUS, lb=-GRB.INFINITY, ub=0, name="TotalReliability")
+        logLinks = logEnlace * totalLinks if logEnlace != 0 else 0
 
-    model.addConstr(  # Constraint de confiabilidad total
-        totalReliability >= math.log(requiredReliability),
-        name="TotalReliability"
-    )
+        model.addConstr(  # Definición de totalReliability
+            totalReliability == gp.quicksum(logSubnetTotalReliability[j] for j in subnetSet) + logLinks,
+            name="TotalReliability_def"
+        )
+
+        model.addConstr(  # Constraint de confiabilidad total
+            totalReliability >= log_confiabilidad(requiredReliability),
+            name="TotalReliability"
+        )
 
     ################## FIN DE CONFIABILIDAD ##################
 
+    # Eliminación de simetrías (modo k_best). En alta confiabilidad también se aplica: la cota de la
+    # relajación es débil y sin ella el branch-and-bound recorre cada permutación de subredes
+    if romperSimetria or altaConfiabilidad:
+        romper_simetria_nodos(model, x, nodeSet, nodesTypeSet, y, subnetSet)
+        model.addConstrs(  # Subredes paralelas ordenadas por tamaño
+            (nodesBySubnet[j] >= nodesBySubnet[j + 1] for j in subnetSet if j > 0 and j + 1 in subnetSet),
+            name="SimetriaSubredes"
+        )
+        model.addConstr(  # La subred serie solo se activa si tiene nodos
+            activeSubnet[0] <= nodesBySubnet[0],
+            name="SimetriaSubredSerie"
+        )
+
+    return model
+
+
+# ============================================================
+# Función principal: hybrid_model
+# ============================================================
+
+
+def hybrid_model(baseModel, totalNodes, requiredReliability, params=None, env=None, k_best=None):
+    """
+    Extiende el modelo base para incluir restricciones y costos del modelo híbrido.
+
+    Parámetros:
+    - baseModel (gurobipy.Model): Modelo base generado por base_model.
+    - totalNodes (int): Número de nodos en la red (mínimo 4).
+    - requiredReliability (float): Confiabilidad total requerida (0 < valor < 1).
+    - params (ModelParams, opcional): Parámetros del escenario; deben coincidir con los usados en base_model (por defecto DEFAULT_PARAMS).
+    - env (gurobipy.Env, opcional): Entorno donde copiar el modelo (por defecto el del modelo base).
+    - k_best (int, opcional): Si se indica, retorna las k configuraciones distintas más baratas
+      usando el pool de soluciones de Gurobi (una sola resolución).
+
+    Retorna:
+    - costo_total (float): Costo total de la solución.
+    - variables_decision (dict): Variables de decisión y sus valores.
+    - model (gurobipy.Model): Modelo optimizado.
+    Con `k_best`, costo_total y variables_decision son listas ordenadas por costo, una entrada por configuración.
+    """
+    model = construir_hybrid_model(baseModel, totalNodes, requiredReliability, params, env,
+                                   romperSimetria=k_best is not None)
+
+    # Pool de soluciones: k configuraciones más baratas
+    if k_best is not None:
+        return resolver_k_mejores(model, k_best, representantes_hibrido(totalNodes), topologia="hibrido",
+                                  requiredReliability=requiredReliability, params=params)
+
     # Optimización
     model.optimize()
 
@@ -184,4 +419,4 @@ def hybrid_model(baseModel, totalNodes, requiredReliability):
         return model.objVal, variables_decision, model
     else:
         print("No se encontró una solución óptima.")
-        return None, None, model
\ No newline at end of file
+        return None, None, model
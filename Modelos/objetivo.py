@@ -0,0 +1,120 @@
+# ============================================================
+# Confiabilidad requerida en espacio logarítmico (alta confiabilidad)
+# ============================================================
+import math
+
+from config import LIMITE_NUEVES, UMBRAL_ALTA_CONFIABILIDAD
+
+# Cerca de 1 la confiabilidad como float pierde la información que importa: 1 - 1e-9 guarda
+# la inconfiabilidad con ~7 cifras y desde ~16 nueves redondea a 1. Los objetivos de alta
+# confiabilidad se representan por su log-inconfiabilidad q = log(1 - R) (natural), de la que
+# log(R) = log1p(-exp(q)) se obtiene sin pasar por 1 - R.
+
+
+class ConfiabilidadRequerida(float):
+    """
+    Confiabilidad requerida que conserva su log-inconfiabilidad exacta.
+
+    Es un float (su valor es la confiabilidad R, redondeada), por lo que funciona en grillas,
+    registros, cachés y archivos de resultados igual que una confiabilidad común; los modelos
+    leen la log-inconfiabilidad con log_inconfiabilidad y log_confiabilidad en lugar de
+    calcularla desde el float.
+
+    Atributos:
+    - logInconfiabilidad (float): log(1 - R), negativo.
+    """
+    __slots__ = ("logInconfiabilidad",)
+
+    def __new__(cls, logInconfiabilidad):
+        logInconfiabilidad = float(logInconfiabilidad)
+        if not -LIMITE_NUEVES * math.log(10) <= logInconfiabilidad < 0:
+            raise ValueError(
+                f"La log-inconfiabilidad debe estar en [{-LIMITE_NUEVES * math.log(10):.4f}, 0) "
+                f"(hasta {LIMITE_NUEVES} nueves). Se recibió: {logInconfiabilidad}")
+        objetivo = super().__new__(cls, -math.expm1(logInconfiabilidad))
+        objetivo.logInconfiabilidad = logInconfiabilidad
+        return objetivo
+
+    def __reduce__(self):
+        # Conserva la log-inconfiabilidad al enviarse a procesos del pool
+        return ConfiabilidadRequerida, (self.logInconfiabilidad,)
+
+
+def desde_nueves(nueves):
+    """
+    Confiabilidad requerida con un número (no necesariamente entero) de nueves: 1 - 10^-nueves.
+    """
+    return ConfiabilidadRequerida(-nueves * math.log(10))
+
+
+def desde_log_inconfiabilidad(logInconfiabilidad):
+    """
+    Confiabilidad requerida con log(1 - R) = logInconfiabilidad (logaritmo natural).
+    """
+    return ConfiabilidadRequerida(logInconfiabilidad)
+
+
+def log_inconfiabilidad(requiredReliability):
+    """
+    log(1 - R) de una confiabilidad requerida (exacta si es ConfiabilidadRequerida; -inf si R = 1).
+    """
+    if isinstance(requiredReliability, ConfiabilidadRequerida):
+        return requiredReliability.logInconfiabilidad
+    return math.log1p(-requiredReliability) if requiredReliability < 1 else -math.inf
+
+
+def log_confiabilidad(requiredReliability):
+    """
+    log(R) de una confiabilidad requerida, sin pasar por 1 - R en el caso ConfiabilidadRequerida.
+    """
+    if isinstance(requiredReliability, ConfiabilidadRequerida):
+        return math.log1p(-math.exp(requiredReliability.logInconfiabilidad))
+    return math.log(requiredReliability)
+
+
+def nueves(requiredReliability):
+    """
+    Número de nueves -log10(1 - R) de una confiabilidad requerida.
+    """
+    return -log_inconfiabilidad(requiredReliability) / math.log(10)
+
+
+def es_alta_confiabilidad(requiredReliability):
+    """
+    Indica si la inconfiabilidad requerida está por debajo de config.UMBRAL_ALTA_CONFIABILIDAD.
+
+    Desde ese punto log(R) es del orden de la tolerancia de factibilidad del solver y los modelos
+    escalan su restricción de confiabilidad por la inconfiabilidad requerida.
+    """
+    return log_inconfiabilidad(requiredReliability) <= math.log(UMBRAL_ALTA_CONFIABILIDAD)
+
+
+def grilla_nueves(minNueves, maxNueves, cantidad):
+    """
+    Grilla de confiabilidades equiespaciada en número de nueves, incluyendo ambos extremos.
+
+    Parámetros:
+    - minNueves (float): Nueves del primer punto (mayor que 0).
+    - maxNueves (float): Nueves del último punto (a lo sumo config.LIMITE_NUEVES).
+    - cantidad (int): Número de puntos de la grilla.
+
+    Retorna:
+    - list[ConfiabilidadRequerida]: Confiabilidades requeridas en orden creciente.
+    """
+    if cantidad <= 0:
+        raise ValueError("El número de elementos debe ser mayor a 0.")
+    if not 0 < minNueves <= maxNueves <= LIMITE_NUEVES:
+        raise ValueError(
+            f"Los nueves deben cumplir 0 < mínimo <= máximo <= {LIMITE_NUEVES}. "
+            f"Se recibió: {minNueves} y {maxNueves}")
+    if cantidad == 1:
+        return [desde_nueves(minNueves)]
+
+    paso = (maxNueves - minNueves) / (cantidad - 1)
+    grilla = [desde_nueves(minNueves + k * paso) for k in range(cantidad)]
+    # Puntos que redondean al mismo float colapsarían en los resultados (claves por confiabilidad)
+    if any(anterior >= siguiente for anterior, siguiente in zip(grilla, grilla[1:])):
+        raise ValueError(
+            f"La grilla de {cantidad} puntos entre {minNueves} y {maxNueves} nueves tiene puntos "
+            f"indistinguibles en doble precisión; use menos puntos o menos nueves.")
+    return grilla
@@ -6,37 +6,53 @@ from gurobipy import GRB
 import math
 
 from utils.validation import validar_entrada
-# Importar parámetros globales
-from config import LINK_COST, RELIABILITY_BY_NODE_TYPE
+from Modelos.base_model import log_por_tipo
+from Modelos.evaluador import enlaces_topologia, log_confiabilidad_enlace
+from Modelos.objetivo import log_confiabilidad, log_inconfiabilidad
+from Modelos.pool_soluciones import romper_simetria_nodos, resolver_k_mejores
+# Importar parámetros por defecto
+from config import DEFAULT_PARAMS
 
 # ============================================================
 # Función principal: parallel_model
 # ============================================================
 
 
-def parallel_model(baseModel, totalNodes, requiredReliability):
+def parallel_model(baseModel, totalNodes, requiredReliability, params=None, env=None, k_best=None):
     """
     Extiende un modelo base para incluir restricciones y costos específicos del modelo paralelo.
 
+    Si params.linkReliability < 1, los n(n-1)/2 enlaces de la malla quedan en serie con los nodos:
+    los nodos deben alcanzar por sí solos R / linkReliability^(n(n-1)/2).
+
     Parámetros:
     - baseModel (gurobipy.Model): Modelo base.
     - totalNodes (int): Número de nodos en la red (mínimo 4).
-    - requiredReliability (float): Confiabilidad total requerida (0 < valor < 1).
+    - requiredReliability (float): Confiabilidad total requerida (0 < valor < 1); con una
+      ConfiabilidadRequerida (ver Modelos.objetivo) la restricción usa su log-inconfiabilidad exacta.
+    - params (ModelParams, opcional): Parámetros del escenario; deben coincidir con los usados en base_model (por defecto DEFAULT_PARAMS).
+    - env (gurobipy.Env, opcional): Entorno donde copiar el modelo (por defecto el del modelo base).
+    - k_best (int, opcional): Si se indica, retorna las k configuraciones distintas más baratas
+      usando el pool de soluciones de Gurobi (una sola resolución).
 
     Retorna:
     - costo_total (float): Costo total de la solución.
     - variables_decision (dict): Valores de las variables de decisión.
     - model (gurobipy.Model): Modelo optimizado.
+    Con `k_best`, costo_total y variables_decision son listas ordenadas por costo, una entrada por configuración.
 
     Lanza:
     - ValueError: Si los parámetros de entrada son inválidos.
     - Exception: Si no se encuentra una solución óptima.
     """
+    if params is None:
+        params = DEFAULT_PARAMS
+
     # Validación de entrada
-    validar_entrada(totalNodes, LINK_COST, RELIABILITY_BY_NODE_TYPE)
+    validar_entrada(totalNodes, params.linkCost, params.reliabilityByNodeType)
 
     # Copia del modelo base
-    model = baseModel.copy()
+    model = baseModel.copy(env=env) if env is not None else baseModel.copy()
 
     # Recuperar la variable linksCost del modelo base
     linksCost = model.getVarByName("linksCost")
@@ -52,32 +68,37 @@ def parallel_model(baseModel, totalNodes, requiredReliability):
 
     # Definir conjuntos de nodos y tipos de nodos
     nodeSet = range(totalNodes)
-    nodesTypeSet = range(len(RELIABILITY_BY_NODE_TYPE))
+    nodesTypeSet = range(len(params.reliabilityByNodeType))
 
-    # Agregar variables para la no confiabilidad de los nodos
-    nodeUnreliability = model.addVars(
-        nodeSet, vtype=GRB.CONTINUOUS, name="nodeUnreliability"
-    )
+    # Agregar variables para la log-no confiabilidad de los nodos
     logNodeUnreliability = model.addVars(
         nodeSet, vtype=GRB.CONTINUOUS, lb=-GRB.INFINITY, name="logNodeUnreliability"
     )
 
+    # Logaritmo de la no confiabilidad de cada tipo (lineal en x, ver log_por_tipo)
+    logUnreliability = log_por_tipo(1 - r for r in params.reliabilityByNodeType)
+
     for u in nodeSet:
         model.addConstr(
-            nodeUnreliability[u] == 1 - gp.quicksum(
-                RELIABILITY_BY_NODE_TYPE[i] * x[u, i] for i in nodesTypeSet
+            logNodeUnreliability[u] == gp.quicksum(
+                logUnreliability[i] * x[u, i] for i in nodesTypeSet if logUnreliability[i] is not None
             ),
-            name=f"NodeUnreliability_{u}"
+            name=f"LogNodeUnreliability_{u}"
         )
-        model.addGenConstrLog(
-            nodeUnreliability[u], logNodeUnreliability[
-                u], name=f"LogNodeUnreliability_{u}"
-        )
-
-    # Restricción para la confiabilidad total de la red
+        for i in nodesTypeSet:
+            if logUnreliability[i] is None:  # Confiabilidad 1: log(0) no está definido
+                x[u, i].ub = 0
+
+    # Restricción para la confiabilidad total de la red: sum log(1 - r_u) <= log(1 - R_nodos)
+    logEnlaces = enlaces_topologia("paralelo", totalNodes) * log_confiabilidad_enlace(params)
+    if logEnlaces == 0:
+        logInconfiabilidadMaxima = log_inconfiabilidad(requiredReliability)
+    else:
+        logNodos = log_confiabilidad(requiredReliability) - logEnlaces
+        # Si los enlaces solos no alcanzan R, ninguna configuración cumple
+        logInconfiabilidadMaxima = math.log(-math.expm1(logNodos)) if logNodos < 0 else -GRB.INFINITY
     model.addConstr(
-        gp.quicksum(logNodeUnreliability[u] for u in nodeSet) <= math.log(
-            1 - requiredReliability),
+        gp.quicksum(logNodeUnreliability[u] for u in nodeSet) <= logInconfiabilidadMaxima,
         name="TotalReliability"
     )
 
@@ -88,10 +109,16 @@ def parallel_model(baseModel, totalNodes, requiredReliability):
 
     # Agregar restricción específica del modelo paralelo
     model.addConstr(
-        linksCost == LINK_COST * (totalNodes * (totalNodes - 1)) / 2,
+        linksCost == params.linkCost * (totalNodes * (totalNodes - 1)) / 2,
         name="LinksCost_Paralelo"
     )
 
+    # Pool de soluciones: k configuraciones más baratas
+    if k_best is not None:
+        romper_simetria_nodos(model, x, nodeSet, nodesTypeSet)
+        return resolver_k_mejores(model, k_best, topologia="paralelo",
+                                  requiredReliability=requiredReliability, params=params)
+
     # Optimizar el modelo
     model.optimize()
 
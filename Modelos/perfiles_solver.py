@@ -0,0 +1,266 @@
+# ============================================================
+# Perfiles de parámetros de Gurobi por topología (ajuste automático)
+# ============================================================
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+
+from config import DEFAULT_PARAMS, CANDIDATOS_AJUSTE, TIEMPO_AJUSTE_S, MEJORA_MINIMA_AJUSTE
+
+# Archivo de perfiles (JSON):
+#   {"gurobi": "13.0.3",
+#    "perfiles": {"hibrido": {"parametros": {"MIPFocus": 1, ...}, "metodo": "local",
+#                             "instancias": [{"n": 10, "confiabilidad": 0.999}, ...],
+#                             "trabajo_defecto": ..., "trabajo_ajustado": ..., ...}}}
+# Solo "parametros" se usa al resolver; el resto documenta cómo se obtuvo el perfil.
+#
+# El ajuste compara el trabajo de Gurobi (atributo Work, determinista para una máquina y un número
+# de hilos) en lugar del tiempo de reloj: las instancias se resuelven en milisegundos y el tiempo
+# de reloj no permite distinguir cambios del orden de MEJORA_MINIMA_AJUSTE de forma repetible.
+
+# Métodos de ajuste: búsqueda local por coordenadas sobre CANDIDATOS_AJUSTE o Model.tune() de Gurobi
+METODOS_AJUSTE = ("local", "gurobi")
+
+# Parámetros que no forman parte de un perfil (salida, límites y los del propio ajuste)
+_PARAMETROS_EXCLUIDOS = ("OutputFlag", "LogToConsole", "LogFile", "TimeLimit", "WorkLimit")
+
+# Diferencia relativa máxima de costo óptimo con los parámetros por defecto
+_TOLERANCIA_COSTO = 1e-6
+
+
+def cargar_perfiles(ruta):
+    """
+    Carga los parámetros del solver por topología de un archivo de perfiles.
+
+    Parámetros:
+    - ruta (str): Archivo de perfiles escrito por guardar_perfil.
+
+    Retorna:
+    - dict: Parámetros de Gurobi (dict nombre -> valor) indexados por topología; vacío si el
+      archivo no existe.
+    """
+    if not os.path.exists(ruta):
+        return {}
+    with open(ruta) as archivo:
+        datos = json.load(archivo)
+    return {topologia: dict(perfil["parametros"]) for topologia, perfil in datos.get("perfiles", {}).items()}
+
+
+def guardar_perfil(ruta, topologia, perfil):
+    """
+    Guarda (o reemplaza) el perfil de una topología conservando los de las demás.
+
+    Parámetros:
+    - ruta (str): Archivo de perfiles.
+    - topologia (str): Clave de la topología.
+    - perfil (dict): Perfil retornado por ajustar_topologia.
+    """
+    import gurobipy as gp
+
+    perfiles = {}
+    if os.path.exists(ruta):
+        with open(ruta) as archivo:
+            perfiles = json.load(archivo).get("perfiles", {})
+    datos = {"gurobi": ".".join(map(str, gp.gurobi.version())), "perfiles": {**perfiles, topologia: perfil}}
+
+    directorio = os.path.dirname(ruta)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    temporal = f"{ruta}.tmp"
+    with open(temporal, "w") as archivo:
+        json.dump(datos, archivo, indent=2)
+    os.replace(temporal, ruta)
+
+
+def evaluar_parametros(topologia, instancias, modelosBase, params, parametros, cota=None):
+    """
+    Resuelve las instancias de una topología con un conjunto de parámetros y suma su trabajo.
+
+    Parámetros:
+    - topologia (str): Clave de la topología.
+    - instancias (list[tuple[int, float]]): Pares (n, confiabilidad requerida).
+    - modelosBase (dict): Modelos base indexados por n.
+    - params (ModelParams): Parámetros del escenario.
+    - parametros (dict): Parámetros de Gurobi a evaluar (además de PARAMETROS_SOLVER).
+    - cota (float, opcional): Trabajo total a partir del cual se abandona la evaluación (el
+      conjunto ya no puede mejorar al mejor conocido).
+
+    Retorna:
+    - dict | None: "trabajo" y "tiempo_s" totales y el costo de cada instancia ("costos"); None si
+      alguna instancia no terminó (alcanzó la cota o no se probó su optimalidad).
+    """
+    from gurobipy import GRB
+    from Modelos.entorno_gurobi import crear_entorno
+    from utils.sweep import obtener_modelo
+
+    modelo = obtener_modelo(topologia)
+    env = crear_entorno(parametros)
+    trabajo = tiempo = 0.0
+    costos = []
+    try:
+        for n, reqRel in instancias:
+            if cota is not None:
+                env.setParam("WorkLimit", max(cota - trabajo, 1e-6))
+            # Las instancias cortadas por la cota imprimirían "No se encontró una solución óptima"
+            with contextlib.redirect_stdout(io.StringIO()):
+                minCost, _, model = modelo(modelosBase[n], n, reqRel, params, env=env)
+            estado, trabajo, tiempo = model.Status, trabajo + model.Work, tiempo + model.Runtime
+            model.dispose()
+            if estado not in (GRB.OPTIMAL, GRB.INFEASIBLE):
+                return None
+            costos.append(minCost)
+    finally:
+        env.dispose()
+    return {"trabajo": trabajo, "tiempo_s": tiempo, "costos": costos}
+
+
+def _mismos_costos(costos, referencia):
+    """
+    Indica si dos listas de costos óptimos coinciden (None: instancia infactible).
+    """
+    return all(
+        (costo is None) == (ref is None)
+        and (costo is None or abs(costo - ref) <= _TOLERANCIA_COSTO * max(1.0, abs(ref)))
+        for costo, ref in zip(costos, referencia)
+    )
+
+
+def _busqueda_local(topologia, instancias, modelosBase, params, defecto, candidatos, fin):
+    """
+    Búsqueda por coordenadas: para cada parámetro prueba sus valores candidatos manteniendo los demás
+    y acepta el mejor si reduce el trabajo en al menos MEJORA_MINIMA_AJUSTE; repite mientras mejore.
+    """
+    mejor, mejorResultado = {}, defecto
+    mejoro = True
+    while mejoro and time.monotonic() < fin:
+        mejoro = False
+        for nombre, valores in candidatos.items():
+            ganador = None
+            for valor in valores:
+                if mejor.get(nombre) == valor or time.monotonic() >= fin:
+                    continue
+                prueba = {**mejor, nombre: valor}
+                cota = (ganador or mejorResultado)["trabajo"] * (1 - MEJORA_MINIMA_AJUSTE)
+                resultado = evaluar_parametros(topologia, instancias, modelosBase, params, prueba, cota)
+                if resultado is not None and _mismos_costos(resultado["costos"], defecto["costos"]):
+                    ganador = {**resultado, "parametros": prueba}
+            if ganador is not None:
+                mejor, mejorResultado = ganador.pop("parametros"), ganador
+                mejoro = True
+                print(f"  {topologia}: {nombre}={mejor[nombre]} -> trabajo {mejorResultado['trabajo']:.4f}", flush=True)
+    return mejor, mejorResultado
+
+
+def _leer_parametros_modelo(model):
+    """
+    Parámetros distintos de los por defecto de un modelo (los que Gurobi escribe en un archivo .prm).
+    """
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "ajuste.prm")
+        model.write(ruta)
+        with open(ruta) as archivo:
+            lineas = [linea.split() for linea in archivo if linea.strip() and not linea.startswith("#")]
+
+    parametros = {}
+    for nombre, valor in lineas:
+        if nombre in _PARAMETROS_EXCLUIDOS or nombre.startswith("Tune"):
+            continue
+        tipo = model.getParamInfo(nombre)[1]
+        parametros[nombre] = tipo(valor)
+    return parametros
+
+
+def _ajuste_gurobi(topologia, instancias, modelosBase, params, defecto, tiempoLimite):
+    """
+    Ajuste con Model.tune() sobre la instancia representativa más costosa; el resultado se valida
+    sobre todas las instancias como cualquier otro candidato.
+    """
+    from utils.sweep import obtener_modelo
+
+    trabajos = []
+    for n, reqRel in instancias:
+        resultado = evaluar_parametros(topologia, [(n, reqRel)], modelosBase, params, {})
+        trabajos.append(resultado["trabajo"])
+    n, reqRel = instancias[trabajos.index(max(trabajos))]
+
+    _, _, model = obtener_modelo(topologia)(modelosBase[n], n, reqRel, params)
+    model.reset()
+    model.setParam("TuneTimeLimit", tiempoLimite)
+    model.setParam("TuneResults", 1)
+    model.tune()
+    parametros = {}
+    if model.TuneResultCount > 0:
+        model.getTuneResult(0)
+        parametros = _leer_parametros_modelo(model)
+    model.dispose()
+
+    if parametros:
+        resultado = evaluar_parametros(topologia, instancias, modelosBase, params, parametros,
+                                       defecto["trabajo"] * (1 - MEJORA_MINIMA_AJUSTE))
+        if resultado is not None and _mismos_costos(resultado["costos"], defecto["costos"]):
+            return parametros, resultado
+    return {}, defecto
+
+
+def ajustar_topologia(topologia, totalNodes, requiredReliabilities, params=None, metodo="local",
+                      tiempoLimite=TIEMPO_AJUSTE_S, candidatos=None):
+    """
+    Busca los parámetros de Gurobi que minimizan el trabajo total de una topología sobre un conjunto
+    de instancias representativas (todas las combinaciones de n y confiabilidad requerida).
+
+    Un conjunto de parámetros solo se acepta si todas las instancias terminan con el mismo costo
+    óptimo (o la misma infactibilidad) que con los parámetros por defecto, de modo que aplicar el
+    perfil no cambia los resultados de los barridos.
+
+    Parámetros:
+    - topologia (str): Clave de la topología ("serie", "paralelo", "hibrido").
+    - totalNodes (list[int]): Números de nodos de las instancias.
+    - requiredReliabilities (list[float]): Confiabilidades requeridas de las instancias.
+    - params (ModelParams, opcional): Parámetros del escenario (por defecto DEFAULT_PARAMS).
+    - metodo (str): "local" (búsqueda por coordenadas sobre `candidatos`) o "gurobi" (Model.tune()).
+    - tiempoLimite (float): Segundos de ajuste (aproximado: la evaluación en curso termina).
+    - candidatos (dict, opcional): Valores a probar por parámetro (por defecto config.CANDIDATOS_AJUSTE).
+
+    Retorna:
+    - dict: Perfil con los parámetros ganadores ("parametros", vacío si ninguno mejora los por
+      defecto), el método, las instancias y el trabajo y tiempo totales por defecto y ajustados.
+    """
+    from utils.sweep import construir_modelo_base
+
+    if params is None:
+        params = DEFAULT_PARAMS
+    if metodo not in METODOS_AJUSTE:
+        raise ValueError(f"Método de ajuste desconocido: {metodo}. Opciones: {', '.join(METODOS_AJUSTE)}")
+
+    instancias = [(n, reqRel) for n in totalNodes for reqRel in requiredReliabilities]
+    if not instancias:
+        raise ValueError("Se necesita al menos una instancia (n, confiabilidad) para ajustar.")
+    modelosBase = {n: construir_modelo_base(n, params) for n in totalNodes}
+    fin = time.monotonic() + tiempoLimite
+
+    defecto = evaluar_parametros(topologia, instancias, modelosBase, params, {})
+    if defecto is None:
+        raise RuntimeError(f"Las instancias de {topologia} no se resuelven con los parámetros por defecto.")
+    print(f"  {topologia}: {len(instancias)} instancias, trabajo por defecto {defecto['trabajo']:.4f}", flush=True)
+
+    if metodo == "local":
+        parametros, ajustado = _busqueda_local(topologia, instancias, modelosBase, params, defecto,
+                                               CANDIDATOS_AJUSTE if candidatos is None else candidatos, fin)
+    else:
+        parametros, ajustado = _ajuste_gurobi(topologia, instancias, modelosBase, params, defecto,
+                                              max(1.0, fin - time.monotonic()))
+
+    for baseModel in modelosBase.values():
+        baseModel.dispose()
+    return {
+        "parametros": parametros,
+        "metodo": metodo,
+        "instancias": [{"n": n, "confiabilidad": reqRel} for n, reqRel in instancias],
+        "trabajo_defecto": defecto["trabajo"],
+        "trabajo_ajustado": ajustado["trabajo"],
+        "tiempo_defecto_s": defecto["tiempo_s"],
+        "tiempo_ajustado_s": ajustado["tiempo_s"],
+    }
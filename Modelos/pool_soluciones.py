@@ -0,0 +1,181 @@
+# ============================================================
+# Pool de soluciones: k configuraciones más baratas por objetivo
+# ============================================================
+import math
+from collections import defaultdict
+
+import gurobipy as gp
+from gurobipy import GRB
+
+from utils.utils import indice_variable
+# Importar parámetros por defecto
+from config import DEFAULT_PARAMS
+
+# Holgura en log-inconfiabilidad al comparar la confiabilidad exacta de una solución con la
+# requerida: absorbe el redondeo de la evaluación, no la tolerancia del solver (~1e-6)
+TOLERANCIA_OBJETIVO = 1e-12
+
+
+def romper_simetria_nodos(model, x, nodeSet, nodesTypeSet, y=None, subnetSet=None):
+    """
+    Agrega restricciones que ordenan los nodos para eliminar soluciones equivalentes por etiquetas.
+
+    Los nodos son intercambiables, por lo que se exige que la clave de cada nodo
+    (subred y tipo en el híbrido, solo tipo en serie/paralelo) sea no creciente en u.
+    No cambia el costo óptimo: cada configuración conserva un representante.
+
+    Parámetros:
+    - model (gurobipy.Model): Modelo a modificar.
+    - x (dict): Variables x[u, i] del modelo.
+    - nodeSet (range): Conjunto de nodos.
+    - nodesTypeSet (range): Conjunto de tipos de nodo.
+    - y (dict, opcional): Variables y[u, j] del modelo híbrido.
+    - subnetSet (range, opcional): Conjunto de subredes del modelo híbrido.
+    """
+    numTipos = len(nodesTypeSet)
+
+    def clave(u):
+        expresion = gp.quicksum(i * x[u, i] for i in nodesTypeSet)
+        if y is not None:
+            expresion += numTipos * gp.quicksum(j * y[u, j] for j in subnetSet)
+        return expresion
+
+    model.addConstrs(
+        (clave(u) >= clave(u + 1) for u in nodeSet if u + 1 in nodeSet),
+        name="SimetriaNodos"
+    )
+
+
+def clave_configuracion(variables):
+    """
+    Clave canónica de una configuración, independiente de las etiquetas de nodos y subredes.
+
+    Parámetros:
+    - variables (dict): Variables de decisión y sus valores.
+
+    Retorna:
+    - tuple: Tipos ordenados (serie/paralelo) o (tipos de la subred serie, tipos de cada subred paralela).
+    """
+    tipos = {}
+    subred = {}
+    for var, val in variables.items():
+        if val > 0.5:
+            if var.startswith("x["):
+                u, i = indice_variable(var)[1]
+                tipos[u] = i
+            elif var.startswith("y["):
+                u, j = indice_variable(var)[1]
+                subred[u] = j
+
+    if not subred:
+        return tuple(sorted(tipos.values()))
+
+    grupos = defaultdict(list)
+    for u, i in tipos.items():
+        grupos[subred[u]].append(i)
+    serie = tuple(sorted(grupos.pop(0, [])))
+    paralelas = tuple(sorted(tuple(sorted(grupo)) for grupo in grupos.values()))
+    return serie, paralelas
+
+
+def _cumplen_objetivo(soluciones, topologia, requiredReliability, params):
+    """
+    Indica qué soluciones alcanzan la confiabilidad requerida según su confiabilidad exacta.
+
+    El pool puede incluir soluciones que solo cumplen dentro de la tolerancia de factibilidad del
+    solver; se comparan las log-inconfiabilidades exactas (ver Modelos.evaluador), que conservan la
+    precisión también en alta confiabilidad.
+    """
+    import numpy as np
+    from Modelos.evaluador import log_confiabilidad_configuraciones, conteos_desde_variables
+    from Modelos.objetivo import log_inconfiabilidad
+
+    if not soluciones:
+        return []
+    numTipos = len(params.reliabilityByNodeType)
+    numSubredes = None
+    if topologia == "hibrido":
+        numSubredes = 1 + max(indice_variable(var)[1][1] for var in soluciones[0] if var.startswith("y["))
+    conteos = [conteos_desde_variables(solucion, numTipos, numSubredes) for solucion in soluciones]
+    logConfiabilidad = log_confiabilidad_configuraciones(topologia, conteos, params)
+    with np.errstate(divide="ignore"):
+        logInconfiabilidad = np.log(-np.expm1(logConfiabilidad))
+    objetivo = log_inconfiabilidad(requiredReliability)
+    return list(logInconfiabilidad <= objetivo + TOLERANCIA_OBJETIVO)
+
+
+def resolver_k_mejores(model, k_best, maxRepresentantes=1, poolGap=None, topologia=None,
+                       requiredReliability=None, params=None):
+    """
+    Resuelve el modelo con el pool de soluciones y retorna las k configuraciones distintas más baratas.
+
+    Con `topologia` y `requiredReliability` solo cuentan las configuraciones cuya confiabilidad
+    exacta alcanza la requerida: el pool de Gurobi acepta soluciones que la incumplen dentro de la
+    tolerancia de factibilidad, que se descartan y el pool se agranda hasta reunir k configuraciones.
+
+    Parámetros:
+    - model (gurobipy.Model): Modelo completo (sin optimizar).
+    - k_best (int): Número de configuraciones a retornar.
+    - maxRepresentantes (int): Cota de soluciones del pool que pueden representar la misma
+      configuración; el pool se agranda hasta esa cota si hay duplicados.
+    - poolGap (float, opcional): Brecha relativa máxima respecto del óptimo (parámetro PoolGap).
+    - topologia (str, opcional): "serie", "paralelo" o "hibrido"; necesaria para filtrar.
+    - requiredReliability (float, opcional): Confiabilidad requerida del modelo.
+    - params (ModelParams, opcional): Parámetros con los que se construyó el modelo (por defecto DEFAULT_PARAMS).
+
+    Retorna:
+    - costos (list[float]): Costos en orden creciente.
+    - variables_decision (list[dict]): Variables de decisión de cada configuración.
+    - model (gurobipy.Model): Modelo optimizado.
+    """
+    if k_best < 1:
+        raise ValueError(f"k_best debe ser al menos 1. Se recibió: {k_best}")
+    if params is None:
+        params = DEFAULT_PARAMS
+    filtrar = topologia is not None and requiredReliability is not None
+
+    model.setParam("PoolSearchMode", 2)  # Búsqueda sistemática de las mejores soluciones
+    if poolGap is not None:
+        model.setParam("PoolGap", poolGap)
+
+    tamanoPool = k_best if maxRepresentantes == 1 else min(k_best * maxRepresentantes, 4 * k_best)
+    model.update()  # Incluir las variables agregadas sobre la copia del modelo base
+    variables = model.getVars()
+    nombres = model.getAttr("VarName", variables)
+
+    while True:
+        model.setParam("PoolSolutions", tamanoPool)
+        model.optimize()
+        if model.status != GRB.OPTIMAL:
+            return [], [], model
+
+        costos, variables_decision, vistas = [], [], set()
+        for s in range(model.SolCount):
+            model.setParam("SolutionNumber", s)
+            solucion = dict(zip(nombres, model.getAttr("Xn", variables)))
+            clave = clave_configuracion(solucion)
+            if clave in vistas:
+                continue
+            vistas.add(clave)
+            costos.append(model.PoolObjVal)
+            variables_decision.append(solucion)
+
+        if filtrar:
+            cumplen = _cumplen_objetivo(variables_decision, topologia, requiredReliability, params)
+            costos = [costo for costo, cumple in zip(costos, cumplen) if cumple]
+            variables_decision = [solucion for solucion, cumple in zip(variables_decision, cumplen) if cumple]
+
+        # Pool completo con menos configuraciones distintas que k: agrandarlo. Cada configuración
+        # descartada por no cumplir también puede ocupar hasta maxRepresentantes lugares
+        maxPool = (k_best + len(vistas) - len(costos)) * maxRepresentantes
+        if len(costos) >= k_best or model.SolCount < tamanoPool or tamanoPool >= maxPool:
+            return costos[:k_best], variables_decision[:k_best], model
+        tamanoPool = min(maxPool, 2 * tamanoPool)
+
+
+def representantes_hibrido(totalNodes):
+    """
+    Cota de soluciones equivalentes por configuración en el híbrido tras romper la simetría de nodos:
+    permutaciones de las subredes paralelas.
+    """
+    return math.factorial(totalNodes // 3)
@@ -0,0 +1,262 @@
+# ============================================================
+# Modo robusto: confiabilidades de nodo inciertas (escenarios)
+# ============================================================
+import csv
+import dataclasses
+import json
+import math
+
+import numpy as np
+
+from Modelos.evaluador import log_confiabilidad_escenarios, log_confiabilidad_configuraciones, conteos_desde_variables
+from Modelos.frontera_dp import TOLERANCIA_LOG
+from Modelos.objetivo import log_confiabilidad
+from config import (DEFAULT_PARAMS, CUANTIL_ROBUSTO, NUM_ESCENARIOS, DISPERSION_ESCENARIOS,
+                    CANDIDATOS_ROBUSTO_INICIALES, MAX_CANDIDATOS_ROBUSTO)
+
+# Una configuración es robusta si alcanza la confiabilidad requerida en al menos m = ceil(cuantil * S)
+# de los S escenarios. La búsqueda es exacta sin resolver un modelo por escenario:
+# - Relajación: la confiabilidad de las tres topologías es creciente en la de cada nodo. Si A es un
+#   conjunto de S - m + 1 escenarios, toda configuración robusta cumple en alguno de ellos (no puede
+#   fallar en más de S - m) y, por monotonía, también con la envolvente u = máximo por tipo sobre A.
+#   Con A = los escenarios menos confiables, u queda cerca de la cola pesimista de la muestra.
+# - Enumeración: el modelo de la topología con confiabilidades u entrega, con el pool de soluciones,
+#   las k configuraciones más baratas de la relajación; se evalúan todas juntas en todos los
+#   escenarios (log_confiabilidad_escenarios) y la primera robusta en orden de costo es el óptimo.
+#   Si ninguna lo es, k se duplica hasta MAX_CANDIDATOS_ROBUSTO.
+
+# Distribuciones para muestrear escenarios alrededor de las confiabilidades nominales
+DISTRIBUCIONES = tuple(DISPERSION_ESCENARIOS)
+
+# Estados del resultado robusto
+ESTADO_ROBUSTO_OPTIMO = "optimo"
+ESTADO_ROBUSTO_INFACTIBLE = "infactible"  # Ninguna configuración cumple el cuantil (enumeración completa)
+ESTADO_ROBUSTO_LIMITE = "limite"  # Se alcanzó MAX_CANDIDATOS_ROBUSTO sin encontrar una configuración robusta
+
+
+def _validar_escenarios(escenarios, numTipos, origen):
+    escenarios = np.asarray(escenarios, dtype=float)
+    if escenarios.ndim != 2 or escenarios.shape[0] == 0 or escenarios.shape[1] != numTipos:
+        raise ValueError(
+            f"Los escenarios de {origen} deben tener forma (escenarios, {numTipos}). Se recibió: {escenarios.shape}")
+    if not np.all((escenarios > 0) & (escenarios < 1)):
+        raise ValueError(f"Las confiabilidades de los escenarios de {origen} deben estar en (0, 1).")
+    return escenarios
+
+
+def muestrear_escenarios(params=None, distribucion="logitnormal", numEscenarios=NUM_ESCENARIOS,
+                         dispersion=None, semilla=None):
+    """
+    Muestrea escenarios de confiabilidad por tipo de nodo alrededor de los valores nominales.
+
+    Los tipos se muestrean de forma independiente; para escenarios correlacionados (p. ej. un mismo
+    fabricante) use un archivo de escenarios (ver cargar_escenarios).
+
+    Parámetros:
+    - params (ModelParams, opcional): Parámetros con las confiabilidades nominales (por defecto DEFAULT_PARAMS).
+    - distribucion (str): "logitnormal" (logit(r) ~ Normal(logit(r nominal), dispersion)) o
+      "beta" (Beta con media r nominal y concentración alfa + beta = dispersion).
+    - numEscenarios (int): Número de escenarios.
+    - dispersion (float, opcional): Parámetro de dispersión (por defecto config.DISPERSION_ESCENARIOS).
+    - semilla (int, opcional): Semilla del generador, para muestras reproducibles.
+
+    Retorna:
+    - numpy.ndarray: Confiabilidades de forma (numEscenarios, tipos), en (0, 1).
+    """
+    if params is None:
+        params = DEFAULT_PARAMS
+    if distribucion not in DISTRIBUCIONES:
+        raise ValueError(f"Distribución desconocida: {distribucion}. Opciones: {', '.join(DISTRIBUCIONES)}")
+    if numEscenarios < 1:
+        raise ValueError(f"El número de escenarios debe ser al menos 1. Se recibió: {numEscenarios}")
+    if dispersion is None:
+        dispersion = DISPERSION_ESCENARIOS[distribucion]
+    if dispersion <= 0:
+        raise ValueError(f"La dispersión debe ser mayor a 0. Se recibió: {dispersion}")
+
+    nominal = _validar_escenarios([params.reliabilityByNodeType], len(params.reliabilityByNodeType),
+                                  "las confiabilidades nominales")[0]
+    generador = np.random.default_rng(semilla)
+    forma = (numEscenarios, len(nominal))
+    if distribucion == "logitnormal":
+        logit = np.log(nominal) - np.log1p(-nominal)
+        escenarios = 1 / (1 + np.exp(-(logit + dispersion * generador.standard_normal(forma))))
+    else:
+        escenarios = generador.beta(dispersion * nominal, dispersion * (1 - nominal), size=forma)
+    # Muy cerca de 0 o 1 el float redondea a los extremos, que los modelos no admiten
+    return np.clip(escenarios, np.finfo(float).tiny, np.nextafter(1.0, 0.0))
+
+
+def cargar_escenarios(ruta, params=None):
+    """
+    Carga escenarios de confiabilidad por tipo de nodo (p. ej. datos de campo).
+
+    Formatos:
+    - CSV con una columna por tipo, encabezada por su nombre (params.nodeTypeNames), y una fila por escenario.
+    - JSON con una lista de escenarios (o {"escenarios": [...]}), cada uno una lista en el orden de
+      los tipos o un objeto {nombre del tipo: confiabilidad}.
+    Las columnas de tipos que no están en params (p. ej. dominados y quitados del catálogo) se ignoran.
+
+    Parámetros:
+    - ruta (str): Archivo de escenarios.
+    - params (ModelParams, opcional): Parámetros con los tipos de nodo (por defecto DEFAULT_PARAMS).
+
+    Retorna:
+    - numpy.ndarray: Confiabilidades de forma (escenarios, tipos).
+    """
+    if params is None:
+        params = DEFAULT_PARAMS
+    nombres = params.nodeTypeNames
+
+    if ruta.endswith(".csv"):
+        with open(ruta, newline="") as archivo:
+            filas = list(csv.DictReader(archivo))
+    else:
+        with open(ruta) as archivo:
+            filas = json.load(archivo)
+        if isinstance(filas, dict):
+            filas = filas["escenarios"]
+
+    escenarios = []
+    for fila in filas:
+        if isinstance(fila, dict):
+            faltantes = [nombre for nombre in nombres if nombre not in fila]
+            if faltantes:
+                raise ValueError(f"Los escenarios de {ruta} no tienen los tipos: {', '.join(faltantes)}")
+            fila = [fila[nombre] for nombre in nombres]
+        escenarios.append([float(valor) for valor in fila])
+    return _validar_escenarios(escenarios, len(nombres), ruta)
+
+
+def escenarios_requeridos(numEscenarios, cuantil):
+    """
+    Número mínimo de escenarios en los que una configuración robusta debe cumplir: ceil(cuantil * S).
+    """
+    if not 0 < cuantil <= 1:
+        raise ValueError(f"El cuantil debe estar en (0, 1]. Se recibió: {cuantil}")
+    return max(1, math.ceil(cuantil * numEscenarios - 1e-9))
+
+
+def envolvente_optimista(escenarios, cuantil):
+    """
+    Confiabilidades por tipo con las que toda configuración robusta cumple la requerida (ver la
+    relajación al inicio del módulo): máximo por tipo sobre los S - m + 1 escenarios menos confiables.
+
+    Parámetros:
+    - escenarios (numpy.ndarray): Confiabilidades de forma (escenarios, tipos).
+    - cuantil (float): Fracción de escenarios en los que se debe cumplir.
+
+    Retorna:
+    - tuple[float, ...]: Confiabilidad de cada tipo para el modelo relajado.
+    """
+    numEscenarios = len(escenarios)
+    tamano = numEscenarios - escenarios_requeridos(numEscenarios, cuantil) + 1
+    # Menos confiables: mayor suma de log-inconfiabilidades
+    orden = np.argsort(-np.log1p(-escenarios).sum(axis=1), kind="stable")
+    return tuple(float(valor) for valor in escenarios[orden[:tamano]].max(axis=0))
+
+
+def evaluar_robustez(topologia, conteos, escenarios, requiredReliability, cuantil, params=None):
+    """
+    Evalúa varias configuraciones en todos los escenarios a la vez.
+
+    Parámetros:
+    - topologia (str): "serie", "paralelo" o "hibrido".
+    - conteos (array-like): Nodos por tipo de cada configuración (ver Modelos.evaluador).
+    - escenarios (numpy.ndarray): Confiabilidades de forma (escenarios, tipos).
+    - requiredReliability (float): Confiabilidad requerida (acepta ConfiabilidadRequerida).
+    - cuantil (float): Fracción de escenarios en los que se debe cumplir.
+    - params (ModelParams, opcional): Parámetros del escenario (por defecto DEFAULT_PARAMS).
+
+    Retorna:
+    - Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]: Por configuración: si es robusta, la
+      fracción de escenarios en los que cumple y la log-confiabilidad alcanzada en el cuantil (la
+      m-ésima mayor entre los escenarios).
+    """
+    logObjetivo = log_confiabilidad(requiredReliability)
+    # Misma tolerancia que el motor DP: absorbe el redondeo de sumar logaritmos
+    tolerancia = TOLERANCIA_LOG * min(1.0, abs(logObjetivo))
+    logConfiabilidad = log_confiabilidad_escenarios(topologia, conteos, escenarios, params)
+    numEscenarios = logConfiabilidad.shape[1]
+    requeridos = escenarios_requeridos(numEscenarios, cuantil)
+
+    cumplidos = (logConfiabilidad >= logObjetivo - tolerancia).sum(axis=1)
+    logCuantil = np.sort(logConfiabilidad, axis=1)[:, numEscenarios - requeridos]
+    return cumplidos >= requeridos, cumplidos / numEscenarios, logCuantil
+
+
+def resolver_robusto(topologia, baseModel, totalNodes, requiredReliability, escenarios, cuantil=CUANTIL_ROBUSTO,
+                     params=None, env=None, maxCandidatos=MAX_CANDIDATOS_ROBUSTO):
+    """
+    Configuración más barata que alcanza la confiabilidad requerida en al menos `cuantil` de los escenarios.
+
+    Parámetros:
+    - topologia (str): "serie", "paralelo" o "hibrido".
+    - baseModel (gurobipy.Model): Modelo base generado por base_model con `params`.
+    - totalNodes (int): Número de nodos.
+    - requiredReliability (float): Confiabilidad requerida (acepta ConfiabilidadRequerida).
+    - escenarios (array-like): Confiabilidades por tipo de forma (escenarios, tipos); ver
+      muestrear_escenarios y cargar_escenarios.
+    - cuantil (float): Fracción de escenarios en los que se debe cumplir (1: todos).
+    - params (ModelParams, opcional): Parámetros del escenario (por defecto DEFAULT_PARAMS); sus
+      confiabilidades de nodo solo se usan para reportar la confiabilidad nominal.
+    - env (gurobipy.Env, opcional): Entorno donde copiar los modelos.
+    - maxCandidatos (int): Configuraciones candidatas máximas por resolución del pool.
+
+    Retorna:
+    - costo_total (float | None): Costo de la configuración robusta (None si no se encontró).
+    - variables_decision (dict | None): Variables de decisión del modelo relajado para esa configuración.
+    - resumen (dict): Estado (ESTADO_ROBUSTO_*), escenarios, cuantil, fracción de escenarios en los que
+      cumple, log-confiabilidad en el cuantil y nominal, envolvente usada y candidatos evaluados.
+    """
+    from utils.sweep import obtener_modelo
+
+    if params is None:
+        params = DEFAULT_PARAMS
+    escenarios = _validar_escenarios(escenarios, len(params.reliabilityByNodeType), "la muestra")
+    numTipos = len(params.reliabilityByNodeType)
+    numSubredes = totalNodes // 3 + 1 if topologia == "hibrido" else None
+
+    envolvente = envolvente_optimista(escenarios, cuantil)
+    paramsRelajados = dataclasses.replace(params, reliabilityByNodeType=envolvente)
+    modelo = obtener_modelo(topologia)
+
+    resumen = {
+        "estado": ESTADO_ROBUSTO_LIMITE,
+        "escenarios": len(escenarios),
+        "cuantil": cuantil,
+        "escenarios_requeridos": escenarios_requeridos(len(escenarios), cuantil),
+        "envolvente": list(envolvente),
+        "candidatos": 0,
+        "resoluciones": 0,
+    }
+    k = min(CANDIDATOS_ROBUSTO_INICIALES, maxCandidatos)
+    while True:
+        costos, soluciones, model = modelo(baseModel, totalNodes, requiredReliability, paramsRelajados,
+                                           env=env, k_best=k)
+        model.dispose()
+        resumen["resoluciones"] += 1
+        resumen["candidatos"] = len(soluciones)
+
+        if soluciones:
+            conteos = np.array([conteos_desde_variables(variables, numTipos, numSubredes) for variables in soluciones])
+            robustas, fracciones, logCuantiles = evaluar_robustez(
+                topologia, conteos, escenarios, requiredReliability, cuantil, params)
+            if robustas.any():
+                elegida = int(np.argmax(robustas))  # Primera robusta en orden de costo
+                resumen.update(
+                    estado=ESTADO_ROBUSTO_OPTIMO,
+                    fraccion_cumple=float(fracciones[elegida]),
+                    log_confiabilidad_cuantil=float(logCuantiles[elegida]),
+                    log_confiabilidad_nominal=float(
+                        log_confiabilidad_configuraciones(topologia, conteos[elegida:elegida + 1], params)[0]),
+                )
+                return costos[elegida], soluciones[elegida], resumen
+
+        if len(soluciones) < k:
+            # El pool contiene todas las configuraciones de la relajación: ninguna es robusta
+            resumen["estado"] = ESTADO_ROBUSTO_INFACTIBLE
+            return None, None, resumen
+        if k >= maxCandidatos:
+            return None, None, resumen
+        k = min(2 * k, maxCandidatos)
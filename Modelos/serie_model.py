@@ -1,44 +1,56 @@
 # Importación de librerías
 import gurobipy as gp
 from gurobipy import GRB
-import math
 
 # Importación de utilidades y parámetros globales
 from utils.validation import validar_entrada
-# Costos y confiabilidades por tipo de nodo
-from config import LINK_COST, RELIABILITY_BY_NODE_TYPE
+from Modelos.base_model import log_por_tipo
+from Modelos.evaluador import enlaces_topologia, log_confiabilidad_enlace
+from Modelos.objetivo import log_confiabilidad, es_alta_confiabilidad
+from Modelos.pool_soluciones import romper_simetria_nodos, resolver_k_mejores
+# Parámetros por defecto
+from config import DEFAULT_PARAMS
 
 
-def serie_model(baseModel, totalNodes, requiredReliability):
+def serie_model(baseModel, totalNodes, requiredReliability, params=None, env=None, k_best=None):
     """
     Extiende el modelo base para incluir restricciones y costos del modelo en serie.
 
     Este modelo calcula la confiabilidad total de una red en serie, donde la confiabilidad total
-    es el producto de las confiabilidades individuales de los nodos. También ajusta el costo
-    total de los enlaces según el modelo en serie.
+    es el producto de las confiabilidades individuales de los nodos (y de los n - 1 enlaces si
+    params.linkReliability < 1). También ajusta el costo total de los enlaces según el modelo en serie.
 
     Parámetros:
     ----------
     - baseModel (gurobipy.Model): Modelo base generado previamente.
     - totalNodes (int): Número de nodos en la red (mínimo 4).
-    - requiredReliability (float): Confiabilidad total requerida para la red (entre 0 y 1).
+    - requiredReliability (float): Confiabilidad total requerida para la red (entre 0 y 1); una
+      ConfiabilidadRequerida (ver Modelos.objetivo) conserva su log-inconfiabilidad exacta.
+    - params (ModelParams, opcional): Parámetros del escenario; deben coincidir con los usados en base_model (por defecto DEFAULT_PARAMS).
+    - env (gurobipy.Env, opcional): Entorno donde copiar el modelo (por defecto el del modelo base).
+    - k_best (int, opcional): Si se indica, retorna las k configuraciones distintas más baratas
+      usando el pool de soluciones de Gurobi (una sola resolución).
 
     Retorna:
     -------
     - costo_total (float): Costo total de la solución óptima.
     - variables_decision (dict): Diccionario con las variables de decisión y sus valores.
     - model (gurobipy.Model): Modelo optimizado.
+    Con `k_best`, costo_total y variables_decision son listas ordenadas por costo, una entrada por configuración.
 
     Excepciones:
     ------------
     - ValueError: Si los parámetros de entrada no cumplen con las condiciones requeridas.
     - Exception: Si no se encuentra una solución óptima al modelo.
     """
+    if params is None:
+        params = DEFAULT_PARAMS
+
     # Validación de entrada
-    validar_entrada(totalNodes, LINK_COST, RELIABILITY_BY_NODE_TYPE)
+    validar_entrada(totalNodes, params.linkCost, params.reliabilityByNodeType)
 
     # Copia del modelo base
-    model = baseModel.copy()
+    model = baseModel.copy(env=env) if env is not None else baseModel.copy()
 
     # Recuperar la variable linksCost del modelo base
     linksCost = model.getVarByName("linksCost")
@@ -54,35 +66,51 @@ def serie_model(baseModel, totalNodes, requiredReliability):
 
     # Definir conjuntos de nodos y tipos de nodos
     nodeSet = range(totalNodes)
-    nodesTypeSet = range(len(RELIABILITY_BY_NODE_TYPE))
+    nodesTypeSet = range(len(params.reliabilityByNodeType))
 
-    # Agregar variables para la confiabilidad de los nodos
-    nodeReliability = model.addVars(
-        nodeSet, vtype=GRB.CONTINUOUS, lb=0.001, name="nodeReliability"
-    )
+    # Agregar variables para la log-confiabilidad de los nodos
     logNodeReliability = model.addVars(
         nodeSet, vtype=GRB.CONTINUOUS, lb=-GRB.INFINITY, name="logNodeReliability"
     )
 
+    # Logaritmo de la confiabilidad de cada tipo (lineal en x, ver log_por_tipo)
+    logReliability = log_por_tipo(params.reliabilityByNodeType)
+
     # Agregar restricciones para la confiabilidad de los nodos
     for u in nodeSet:
         model.addConstr(
-            nodeReliability[u] == gp.quicksum(
-                RELIABILITY_BY_NODE_TYPE[i] * x[u, i] for i in nodesTypeSet
+            logNodeReliability[u] == gp.quicksum(
+                logReliability[i] * x[u, i] for i in nodesTypeSet if logReliability[i] is not None
             ),
-            name=f"NodeReliability_{u}"
+            name=f"LogNodeReliability_{u}"
         )
-        model.addGenConstrLog(
-            nodeReliability[u], logNodeReliability[
-                u], name=f"LogNodeReliability_{u}"
+        for i in nodesTypeSet:
+            if logReliability[i] is None:  # Confiabilidad 0: el tipo no puede usarse
+                x[u, i].ub = 0
+
+    # Restricción para la confiabilidad total de la red; los enlaces aportan una constante
+    logEnlaces = enlaces_topologia("serie", totalNodes) * log_confiabilidad_enlace(params)
+    logNodos = log_confiabilidad(requiredReliability) - logEnlaces
+    if es_alta_confiabilidad(requiredReliability) and logNodos < 0:
+        # Alta confiabilidad: log R_nodos es del orden de la tolerancia del solver, por lo que la
+        # restricción se escala por |log R_nodos| y se escribe directamente sobre x. Un tipo con
+        # log r < log R_nodos no alcanza ni con un solo nodo: se excluye y los coeficientes
+        # restantes quedan en [-1, 0]
+        tiposPosibles = [i for i in nodesTypeSet
+                         if logReliability[i] is not None and logReliability[i] >= logNodos]
+        for u in nodeSet:
+            for i in nodesTypeSet:
+                if i not in tiposPosibles:
+                    x[u, i].ub = 0
+        model.addConstr(
+            gp.quicksum(logReliability[i] / -logNodos * x[u, i] for u in nodeSet for i in tiposPosibles) >= -1,
+            name="TotalReliability"
+        )
+    else:
+        model.addConstr(
+            gp.quicksum(logNodeReliability[u] for u in nodeSet) >= logNodos,
+            name="TotalReliability"
         )
-
-    # Restricción para la confiabilidad total de la red
-    model.addConstr(
-        gp.quicksum(logNodeReliability[u] for u in nodeSet) >= math.log(
-            requiredReliability),
-        name="TotalReliability"
-    )
 
     # Eliminar restricción general de linksCost (si existe)
     linksCost_Condition = model.getConstrByName("LinksCost_General")
@@ -91,9 +119,15 @@ def serie_model(baseModel, totalNodes, requiredReliability):
 
     # Agregar restricción específica del modelo en serie
     model.addConstr(
-        linksCost == LINK_COST * (totalNodes - 1), name="LinksCost_Serie"
+        linksCost == params.linkCost * (totalNodes - 1), name="LinksCost_Serie"
     )
 
+    # Pool de soluciones: k configuraciones más baratas
+    if k_best is not None:
+        romper_simetria_nodos(model, x, nodeSet, nodesTypeSet)
+        return resolver_k_mejores(model, k_best, topologia="serie",
+                                  requiredReliability=requiredReliability, params=params)
+
     # Optimizar el modelo
     model.optimize()
 
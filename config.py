@@ -1,23 +1,178 @@
 # Configuration file for the network reliability analysis
+from dataclasses import dataclass
 
 # Select the evaluation year for the analysis
 EVALUATION_YEAR = True # 2025: True, 2030: False
 
+
+@dataclass(frozen=True)
+class ModelParams:
+    """
+    Parámetros de costo y confiabilidad de un escenario de evaluación.
+
+    Es inmutable y hashable, por lo que puede pasarse a procesos del pool, usarse como
+    clave de caché y combinarse varios escenarios en un mismo proceso.
+
+    Atributos:
+    - costByNodeType (tuple[float, ...]): Costo por tipo de nodo (Low, Medium, High).
+    - reliabilityByNodeType (tuple[float, ...]): Confiabilidad por tipo de nodo.
+    - linkCost (float): Costo de un enlace.
+    - nodeTypeNames (tuple[str, ...], opcional): Nombre de cada tipo para tablas y gráficas
+      (por defecto Low/Medium/High con 3 tipos y "Tipo i" en otro caso).
+    - linkReliability (float, opcional): Confiabilidad de cada enlace (por defecto 1: enlaces
+      perfectos). Con un valor menor, todo enlace desplegado queda en serie con la red.
+    """
+    costByNodeType: tuple
+    reliabilityByNodeType: tuple
+    linkCost: float
+    nodeTypeNames: tuple = ()
+    linkReliability: float = 1.0
+
+    def __post_init__(self):
+        # Aceptar diccionarios {tipo: valor} o listas y guardarlos como tuplas
+        for campo in ("costByNodeType", "reliabilityByNodeType"):
+            valor = getattr(self, campo)
+            if isinstance(valor, dict):
+                valor = [valor[i] for i in sorted(valor)]
+            object.__setattr__(self, campo, tuple(float(v) for v in valor))
+        object.__setattr__(self, "linkCost", float(self.linkCost))
+        object.__setattr__(self, "linkReliability", float(self.linkReliability))
+        if not 0 < self.linkReliability <= 1:
+            raise ValueError(
+                f"linkReliability debe estar en (0, 1]. Se recibió: {self.linkReliability}")
+
+        if len(self.costByNodeType) == 0:
+            raise ValueError("costByNodeType debe tener al menos un tipo de nodo.")
+        if len(self.costByNodeType) != len(self.reliabilityByNodeType):
+            raise ValueError(
+                f"costByNodeType y reliabilityByNodeType deben tener la misma longitud. "
+                f"Se recibió: {len(self.costByNodeType)} y {len(self.reliabilityByNodeType)}")
+
+        nombres = tuple(str(nombre) for nombre in self.nodeTypeNames)
+        if not nombres:
+            nombres = ("Low", "Medium", "High") if len(self.costByNodeType) == 3 else \
+                tuple(f"Tipo {i}" for i in range(len(self.costByNodeType)))
+        if len(nombres) != len(self.costByNodeType):
+            raise ValueError(
+                f"nodeTypeNames debe tener un nombre por tipo de nodo. "
+                f"Se recibió: {len(nombres)} para {len(self.costByNodeType)} tipos")
+        object.__setattr__(self, "nodeTypeNames", nombres)
+
+    @classmethod
+    def para_anio(cls, evaluationYear=EVALUATION_YEAR):
+        """
+        Parámetros del escenario 2025 (True) o 2030 (False).
+        """
+        return cls(
+            costByNodeType=(
+                24.2 if evaluationYear else 10.74,  # Low Cost
+                91.82 if evaluationYear else 40.74,  # Medium Cost
+                227.06 if evaluationYear else 100.75   # High Cost
+            ),
+            reliabilityByNodeType=(0.9, 0.95, 0.99),
+            linkCost=7.69 if evaluationYear else 3.41,
+        )
+
+    def sin_dominados(self):
+        """
+        Retorna los parámetros sin los tipos dominados.
+
+        Un tipo está dominado si otro no es más caro ni menos confiable (y es estrictamente mejor en
+        algo, o es un duplicado anterior). Reemplazar un nodo dominado por el que lo domina no sube el
+        costo ni baja la confiabilidad en ninguna topología, así que quitarlo no cambia el óptimo.
+        Los tipos conservados mantienen su orden original.
+
+        Retorna:
+        - ModelParams: Parámetros con solo los tipos no dominados (el mismo objeto si no hay dominados).
+        """
+        orden = sorted(range(len(self.costByNodeType)),
+                       key=lambda i: (self.costByNodeType[i], -self.reliabilityByNodeType[i], i))
+        conservados = []
+        mejorConfiabilidad = float("-inf")
+        for i in orden:
+            if self.reliabilityByNodeType[i] > mejorConfiabilidad:
+                conservados.append(i)
+                mejorConfiabilidad = self.reliabilityByNodeType[i]
+        if len(conservados) == len(orden):
+            return self
+
+        conservados.sort()
+        return ModelParams(
+            costByNodeType=tuple(self.costByNodeType[i] for i in conservados),
+            reliabilityByNodeType=tuple(self.reliabilityByNodeType[i] for i in conservados),
+            linkCost=self.linkCost,
+            nodeTypeNames=tuple(self.nodeTypeNames[i] for i in conservados),
+            linkReliability=self.linkReliability,
+        )
+
+
+# Parámetros por defecto usados cuando no se pasa un ModelParams explícito
+DEFAULT_PARAMS = ModelParams.para_anio(EVALUATION_YEAR)
+
+# Constantes derivadas de DEFAULT_PARAMS (compatibilidad con el notebook)
 # Costos por tipo de nodo (Low, Medium, High)
-COST_BY_NODE_TYPE = {
-    0: 24.2 if EVALUATION_YEAR else 10.74,  # Low Cost
-    1: 91.82 if EVALUATION_YEAR else 40.74,  # Medium Cost
-    2: 227.06 if EVALUATION_YEAR else 100.75   # High Cost
-}
+COST_BY_NODE_TYPE = dict(enumerate(DEFAULT_PARAMS.costByNodeType))
 
 # Confiabilidad por tipo de nodo (Low, Medium, High)
-RELIABILITY_BY_NODE_TYPE = [0.9, 0.95, 0.99]
+RELIABILITY_BY_NODE_TYPE = list(DEFAULT_PARAMS.reliabilityByNodeType)
 
 # Costo de un enlace
-LINK_COST = 7.69 if EVALUATION_YEAR else 3.41
+LINK_COST = DEFAULT_PARAMS.linkCost
 
 # Número de valores equidistantes para confiabilidades requeridas
 NUM_EQUIDISTANT_VALUES = 200
 
 # Confiabilidad máxima
-MAX_RELIABILITY = 0.9999999999999999
\ No newline at end of file
+MAX_RELIABILITY = 0.9999999999999999
+
+# Grilla de alta confiabilidad por número de nueves (ver Modelos.objetivo)
+MIN_NUEVES = 4
+MAX_NUEVES = 9
+# Mayor número de nueves admitido: desde ~16, 1 - 10^-k redondea a 1 en doble precisión
+LIMITE_NUEVES = 15
+# Inconfiabilidad requerida desde la que los modelos escalan la restricción de confiabilidad
+# (log R ya es comparable a la tolerancia de factibilidad del solver)
+UMBRAL_ALTA_CONFIABILIDAD = 1e-4
+
+# Servicio local de consultas (ver utils.servicio)
+# Dirección por defecto: solo la interfaz local, el servicio no necesita red
+HOST_SERVICIO = "127.0.0.1"
+PUERTO_SERVICIO = 8765
+# Tiempo que se espera a otras consultas de la misma (topología, n) antes de despachar un lote
+VENTANA_LOTE_S = 0.002
+# Respuestas del solver guardadas en la caché LRU
+TAMANO_CACHE_SERVICIO = 4096
+
+# Ajuste de parámetros del solver por topología (ver Modelos.perfiles_solver)
+# Archivo de perfiles que los barridos aplican automáticamente si existe
+ARCHIVO_PERFILES_SOLVER = "resultados/perfiles_solver.json"
+# Valores probados por la búsqueda local para cada parámetro (además del valor por defecto)
+CANDIDATOS_AJUSTE = {
+    "MIPFocus": (1, 2, 3),
+    "Presolve": (0, 2),
+    "Cuts": (0, 2),
+    "Heuristics": (0.0, 0.2),
+    "Symmetry": (0, 2),
+    "BranchDir": (-1, 1),
+    "VarBranch": (0, 1, 2, 3),
+    "OBBT": (0, 1, 3),
+    "NLPHeur": (0, 1),
+}
+# Instancias representativas por defecto: números de nodos (la grilla se toma de la línea de comandos)
+NODOS_AJUSTE = [8, 10, 12]
+# Tiempo máximo de ajuste por topología
+TIEMPO_AJUSTE_S = 300
+# Reducción mínima del trabajo total para aceptar un cambio de parámetro (evita ajustar al ruido)
+MEJORA_MINIMA_AJUSTE = 0.05
+
+# Modo robusto con confiabilidades de nodo inciertas (ver Modelos.robusto)
+# Fracción de escenarios en los que debe cumplirse la confiabilidad requerida
+CUANTIL_ROBUSTO = 0.95
+# Escenarios muestreados cuando se da una distribución en lugar de un archivo de escenarios
+NUM_ESCENARIOS = 1000
+# Dispersión por defecto de cada distribución: desvío del logit de la confiabilidad ("logitnormal")
+# o concentración alfa + beta ("beta"; mayor concentración, menor dispersión)
+DISPERSION_ESCENARIOS = {"logitnormal": 0.5, "beta": 200.0}
+# Configuraciones candidatas del primer pool y máximo antes de abandonar la búsqueda
+CANDIDATOS_ROBUSTO_INICIALES = 8
+MAX_CANDIDATOS_ROBUSTO = 512
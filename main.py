@@ -1,91 +1,80 @@
-from Modelos.base_model import base_model
-from Modelos.serie_model import serie_model
-from Modelos.parallel_model import parallel_model
-from Modelos.hybrid_model import hybrid_model
-from utils.utils import *
-from config import *
-
-def calcular_combinaciones_confLineal(totalNodes, seriesRequiredReliabilities, parallelRequiredReliabilities, hybridRequiredReliabilities):
-
-    diccionarioResultados = {}
-
-    for n in totalNodes:
-        baseModel = base_model(n)
-
-        serieMinimizedCosts = []
-        parallelMinimizedCosts = []
-        hybridMinimizedCosts = []
-
-        for reqRel in seriesRequiredReliabilities:
-            serieMinCost, _, _ = serie_model(baseModel, n, reqRel)
-            serieMinimizedCosts.append(serieMinCost)
-        print(f"Calculo de costos minimizados para {n} nodos en serie terminado")
-
-        for reqRel in parallelRequiredReliabilities:
-            parallelMinCost, _, _ = parallel_model(baseModel, n, reqRel)
-            parallelMinimizedCosts.append(parallelMinCost)
-        print(f"Calculo de costos minimizados para {n} nodos en paralelo terminado")
-
-        for reqRel in hybridRequiredReliabilities:
-            hybridMinCost, _, _ = hybrid_model(baseModel, n, reqRel)
-            hybridMinimizedCosts.append(hybridMinCost)
-        print(f"Calculo de costos minimizados para {n} nodos en hibrido terminado")
-
-        diccionarioResultados[f"nodos_{n}_serie"] = serieMinimizedCosts
-        diccionarioResultados[f"nodos_{n}_paralelo"] = parallelMinimizedCosts
-        diccionarioResultados[f"nodos_{n}_hibrido"] = hybridMinimizedCosts
-
-    return diccionarioResultados
-
-def graficar_costosVsConfiabilidad(totalNodes, minimizedCosts, seriesRequiredReliabilities, parallelRequiredReliabilities, hybridRequiredReliabilities):
+import argparse
+import dataclasses
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+
+# Solo dependencias livianas al importar: gurobipy, pandas y matplotlib se cargan
+# dentro del subcomando que los necesita.
+from utils.sweep import (TOPOLOGIAS, TIPOS_GRILLA, MOTORES, obtener_modelo, construir_modelo_base, generar_confiabilidades,
+                         entorno_parametros, calcular_registros_barrido, costos_desde_registros, guardar_resultados, cargar_resultados)
+from Modelos.perfiles_solver import METODOS_AJUSTE
+from utils.exportacion import FORMATOS_DATASET, exportar_dataset, resultados_desde_dataset
+from utils.utils import cargar_pyplot, ajustar_eje_confiabilidad, graficar_costos_minimizados, mostrarResultadosTabla
+from config import (ModelParams, NUM_EQUIDISTANT_VALUES, MAX_RELIABILITY, MIN_NUEVES, MAX_NUEVES, EVALUATION_YEAR,
+                    HOST_SERVICIO, PUERTO_SERVICIO, VENTANA_LOTE_S, TAMANO_CACHE_SERVICIO,
+                    ARCHIVO_PERFILES_SOLVER, NODOS_AJUSTE, TIEMPO_AJUSTE_S, CUANTIL_ROBUSTO, NUM_ESCENARIOS,
+                    DISPERSION_ESCENARIOS)
+
+# Nombre de cada topología en títulos y directorios de gráficas
+TITULOS_TOPOLOGIA = {
+    "serie": "Series",
+    "paralelo": "Parallel",
+    "hibrido": "Hybrid",
+}
+
+
+def graficar_costosVsConfiabilidad(totalNodes, minimizedCosts, requiredReliabilities, topologias=tuple(TOPOLOGIAS)):
     try:
         for n in totalNodes:
-            serieMinimizedCosts = minimizedCosts[f"nodos_{n}_serie"]
-            parallelMinimizedCosts = minimizedCosts[f"nodos_{n}_paralelo"]
-            hybridMinimizedCosts = minimizedCosts[f"nodos_{n}_hibrido"]
-
-            # Plot the results
-            graficar_costos_minimizados(seriesRequiredReliabilities, serieMinimizedCosts, "Series", n)
-            graficar_costos_minimizados(parallelRequiredReliabilities, parallelMinimizedCosts, "Parallel", n)
-            graficar_costos_minimizados(hybridRequiredReliabilities, hybridMinimizedCosts, "Hybrid", n)
+            for topologia in topologias:
+                # Plot the results
+                graficar_costos_minimizados(requiredReliabilities, minimizedCosts[f"nodos_{n}_{topologia}"],
+                                            TITULOS_TOPOLOGIA[topologia], n)
 
         print("Graficado exitoso")
     except Exception as e:
         print(f"Error: {e}")
 
-def graficar_costosVsConfiabilidad_topologiasJuntas(totalNodes, minimizedCosts, seriesRequiredReliabilities, parallelRequiredReliabilities, hybridRequiredReliabilities):
+def graficar_costosVsConfiabilidad_topologiasJuntas(totalNodes, minimizedCosts, requiredReliabilities, topologias=tuple(TOPOLOGIAS)):
 
     print("Grafica de costos vs confiabilidad para topologias juntas")
+    plt = cargar_pyplot()
 
-    for n in totalNodes:
-        serieMinimizedCosts = minimizedCosts[f"nodos_{n}_serie"]
-        parallelMinimizedCosts = minimizedCosts[f"nodos_{n}_paralelo"]
-        hybridMinimizedCosts = minimizedCosts[f"nodos_{n}_hibrido"]
+    estilos = {
+        "serie": ('Serie', 'blue', 'blue'),
+        "paralelo": ('Paralelo', 'red', 'orange'),
+        "hibrido": ('Hibrido', 'green', 'green'),
+    }
 
+    for n in totalNodes:
         # Plot the results on the same graph
         plt.figure(figsize=(10, 6))
-        plt.plot(seriesRequiredReliabilities, serieMinimizedCosts, label='Serie', color='blue', linestyle='-', marker='.')
-        plt.plot(parallelRequiredReliabilities, parallelMinimizedCosts, label='Paralelo', color='red', linestyle='-', marker='.')
-        plt.plot(hybridRequiredReliabilities, hybridMinimizedCosts, label='Hibrido', color='green', linestyle='-', marker='.')
+        for topologia in topologias:
+            label, color, _ = estilos[topologia]
+            plt.plot(requiredReliabilities, minimizedCosts[f"nodos_{n}_{topologia}"], label=label, color=color, linestyle='-', marker='.')
         plt.title(f'Minimized Costs vs Required Reliability - Topology Comparation - {n} Nodes')
         plt.xlabel('Required Reliability')
+        ajustar_eje_confiabilidad(plt, requiredReliabilities)
         plt.ylabel('Minimized Costs')
         plt.grid(True)
 
         # Añadir etiquetas para el último y primer valor no nulo de cada grupo
-        for reliabilities, costs, color in zip(
-            [seriesRequiredReliabilities, parallelRequiredReliabilities, hybridRequiredReliabilities],
-            [serieMinimizedCosts, parallelMinimizedCosts, hybridMinimizedCosts],
-            ['blue', 'orange', 'green']
-        ):
+        for topologia in topologias:
+            costs = minimizedCosts[f"nodos_{n}_{topologia}"]
+            color = estilos[topologia][2]
             # Último valor no nulo
-            for x, y in reversed(list(zip(reliabilities, costs))):
+            for x, y in reversed(list(zip(requiredReliabilities, costs))):
                 if y is not None:
                     plt.text(x, y, f"({x:.2f}, {y:.2f})", fontsize=8, color=color, ha='right')
                     break
 
             # Primer valor no nulo
-            for x, y in zip(reliabilities, costs):
+            for x, y in zip(requiredReliabilities, costs):
                 if y is not None:
                     plt.text(x, y, f"({x:.2f}, {y:.2f})", fontsize=8, color=color, ha='left')
                     break
@@ -100,54 +89,77 @@ def graficar_costosVsConfiabilidad_topologiasJuntas(totalNodes, minimizedCosts,
             os.makedirs(directory)
 
         plt.savefig(os.path.join(directory, fileName))
+        plt.close()
 
         print(f"Grafica para {n} nodos guardada")
 
 # Grafica Número de nodos juntos
 
+# Con más curvas que esto se omiten las etiquetas por curva y la leyenda pasa a ser una barra de color
+MAX_CURVAS_ETIQUETADAS = 10
 
-def graficar_costosVsConfiabilidad_porTopologia(totalNodes, minimizedCosts,
-                                                seriesRequiredReliabilities,
-                                                parallelRequiredReliabilities,
-                                                hybridRequiredReliabilities):
-    print("Graficando costos vs confiabilidad por topología...")
 
-    topologias = [
-        ("Serie", "serie", seriesRequiredReliabilities, 'blue'),
-        ("Parallel", "paralelo", parallelRequiredReliabilities, 'orange'),
-        ("Hybrid", "hibrido", hybridRequiredReliabilities, 'green')
-    ]
+def _colores_nodos(plt, totalNodes):
+    """
+    Color de la curva de cada número de nodos: azul/rojo/verde para pocas curvas, un mapa de
+    color continuo (viridis) según n para muchas.
+    """
+    if len(totalNodes) <= 3:
+        return dict(zip(totalNodes, ['blue', 'red', 'green']))
+    mapa = plt.get_cmap('viridis')
+    normalizar = plt.Normalize(min(totalNodes), max(totalNodes))
+    return {n: mapa(normalizar(n)) for n in totalNodes}
+
+
+def _leyenda_nodos(plt, totalNodes):
+    if len(totalNodes) <= MAX_CURVAS_ETIQUETADAS:
+        plt.legend(loc='upper left')
+    else:
+        escala = plt.cm.ScalarMappable(cmap='viridis', norm=plt.Normalize(min(totalNodes), max(totalNodes)))
+        plt.colorbar(escala, ax=plt.gca(), label='Nodos')
+
+
+def graficar_costosVsConfiabilidad_porTopologia(totalNodes, minimizedCosts, requiredReliabilities,
+                                                topologias=tuple(TOPOLOGIAS)):
+    print("Graficando costos vs confiabilidad por topología...")
+    plt = cargar_pyplot()
 
-    for titulo, key, reliabilities, color_base in topologias:
+    for key in topologias:
+        titulo = {"serie": "Serie"}.get(key, TITULOS_TOPOLOGIA[key])
         plt.figure(figsize=(10, 6))
-        colores = ['blue', 'red', 'green']  # Un color por cada línea/nodos
+        colores = _colores_nodos(plt, totalNodes)  # Un color por cada línea/nodos
+        etiquetar = len(totalNodes) <= MAX_CURVAS_ETIQUETADAS
 
-        for i, n in enumerate(totalNodes):
+        for n in totalNodes:
+            color = colores[n]
             costos = minimizedCosts[f"nodos_{n}_{key}"]
-            plt.plot(reliabilities, costos, label=f'{n} Nodos',
-                     color=colores[i], linestyle='-', marker='.')
+            plt.plot(requiredReliabilities, costos, label=f'{n} Nodos',
+                     color=color, linestyle='-', marker='.' if etiquetar else None)
+            if not etiquetar:
+                continue
 
             # Etiqueta del primer valor no nulo
-            for x, y in zip(reliabilities, costos):
+            for x, y in zip(requiredReliabilities, costos):
                 if y is not None:
                     plt.text(x, y, f"({x:.2f}, {y:.2f})", fontsize=8,
-                             color=colores[i], ha='left')
+                             color=color, ha='left')
                     break
 
             # Etiqueta del último valor no nulo
-            for x, y in reversed(list(zip(reliabilities, costos))):
+            for x, y in reversed(list(zip(requiredReliabilities, costos))):
                 if y is not None:
                     plt.text(x, y, f"({x:.2f}, {y:.2f})", fontsize=8,
-                             color=colores[i], ha='right')
+                             color=color, ha='right')
                     break
 
         # Configuración visual
         plt.title(
             f'Minimized Costs vs Required Reliability - Nodes Number Comparation - {titulo} Topology')
         plt.xlabel('Required Reliability')
+        ajustar_eje_confiabilidad(plt, requiredReliabilities)
         plt.ylabel('Minimized Costs')
         plt.grid(True)
-        plt.legend(loc='upper left')
+        _leyenda_nodos(plt, totalNodes)
 
         # Guardado de la gráfica
         directory = f"graficas/NodosJuntosPorTopologia/{key}/"
@@ -163,45 +175,51 @@ def graficar_costosVsConfiabilidad_porTopologia(totalNodes, minimizedCosts,
 
 
 # grafica de zoom
-def graficar_costos_zoom_hibrido_paralelo(totalNodes, minimizedCosts,
-                                          parallelRequiredReliabilities,
-                                          hybridRequiredReliabilities):
+def graficar_costos_zoom_hibrido_paralelo(totalNodes, minimizedCosts, requiredReliabilities,
+                                          topologias=("hibrido", "paralelo")):
     print("Graficando zoom para topologías Híbrido y Paralelo...")
+    plt = cargar_pyplot()
 
-    topologias = [
-        ("Híbrido", "hibrido", hybridRequiredReliabilities, (0.90, 1.00)),
-        ("Paralelo", "paralelo", parallelRequiredReliabilities, (0.90, 1.00))
-    ]
+    titulos = {"hibrido": "Híbrido", "paralelo": "Paralelo"}
+    x_min, x_max = 0.90, 1.00
 
-    for titulo, key, reliabilidades, (x_min, x_max) in topologias:
+    for key in topologias:
+        if key not in titulos:
+            continue
+        titulo = titulos[key]
         plt.figure(figsize=(10, 6))
-        colores = ['blue', 'red', 'green']
+        colores = _colores_nodos(plt, totalNodes)  # Un color por cada línea/nodos
+        etiquetar = len(totalNodes) <= MAX_CURVAS_ETIQUETADAS
 
-        for i, n in enumerate(totalNodes):
+        for n in totalNodes:
+            color = colores[n]
             costos = minimizedCosts[f"nodos_{n}_{key}"]
-            plt.plot(reliabilidades, costos, label=f'{n} Nodos',
-                     color=colores[i], linestyle='-', marker='.')
+            plt.plot(requiredReliabilities, costos, label=f'{n} Nodos',
+                     color=color, linestyle='-', marker='.' if etiquetar else None)
+            if not etiquetar:
+                continue
 
             # Etiqueta del primer valor no nulo
-            for x, y in zip(reliabilidades, costos):
+            for x, y in zip(requiredReliabilities, costos):
                 if y is not None:
                     plt.text(x, y, f"({x:.2f}, {y:.2f})", fontsize=8,
-                             color=colores[i], ha='left')
+                             color=color, ha='left')
                     break
 
             # Etiqueta del último valor no nulo
-            for x, y in reversed(list(zip(reliabilidades, costos))):
+            for x, y in reversed(list(zip(requiredReliabilities, costos))):
                 if y is not None:
                     plt.text(x, y, f"({x:.2f}, {y:.2f})", fontsize=8,
-                             color=colores[i], ha='right')
+                             color=color, ha='right')
                     break
 
         plt.title(
             f'Minimized Costs vs Required Reliability - Zoom - Topología {titulo}')
         plt.xlabel('Required Reliability')
+        ajustar_eje_confiabilidad(plt, requiredReliabilities)
         plt.ylabel('Minimized Costs')
         plt.grid(True)
-        plt.legend(loc='upper left')
+        _leyenda_nodos(plt, totalNodes)
         plt.xlim(x_min, x_max)
 
         # Guardado
@@ -217,17 +235,722 @@ def graficar_costos_zoom_hibrido_paralelo(totalNodes, minimizedCosts,
         print(f"Gráfica con zoom para {titulo} guardada")
 
 
-# Ejecución
-minReliability = 0.999
-totalNodes = [5, 6, 11]
-
-seriesRequiredReliabilities = generate_equidistant_list(0.5, MAX_RELIABILITY, NUM_EQUIDISTANT_VALUES)
-parallelRequiredReliabilities = generate_equidistant_list(0.5, MAX_RELIABILITY, NUM_EQUIDISTANT_VALUES)
-hybridRequiredReliabilities = generate_equidistant_list(0.5, MAX_RELIABILITY, NUM_EQUIDISTANT_VALUES)
+def graficar_todo(totalNodes, minimizedCosts, requiredReliabilities, topologias=tuple(TOPOLOGIAS)):
+    """
+    Genera todas las gráficas del barrido para las topologías solicitadas.
+    """
+    graficar_costosVsConfiabilidad(totalNodes, minimizedCosts, requiredReliabilities, topologias)
+    graficar_costosVsConfiabilidad_topologiasJuntas(totalNodes, minimizedCosts, requiredReliabilities, topologias)
+    graficar_costosVsConfiabilidad_porTopologia(totalNodes, minimizedCosts, requiredReliabilities, topologias)
+    graficar_costos_zoom_hibrido_paralelo(totalNodes, minimizedCosts, requiredReliabilities, topologias)
+
+
+# ============================================================
+# Línea de comandos
+# ============================================================
+
+# Años de evaluación disponibles (ver ModelParams.para_anio)
+ANIOS_EVALUACION = {2025: True, 2030: False}
+
+
+def _agregar_opcion_anio(parser):
+    parser.add_argument("--anio", type=int, choices=sorted(ANIOS_EVALUACION),
+                        default=2025 if EVALUATION_YEAR else 2030,
+                        help="Año de evaluación de costos (por defecto el de config.EVALUATION_YEAR).")
+    parser.add_argument("--catalogo", default=None,
+                        help="Catálogo de tipos de nodo (CSV o JSON); los tipos dominados se descartan. "
+                             "Sin costo de enlace en el archivo se usa el de --anio.")
+    parser.add_argument("--confiabilidad-enlace", type=float, default=None,
+                        help="Confiabilidad de cada enlace, en serie con la red (por defecto la del "
+                             "catálogo o 1: enlaces perfectos).")
+
+
+def _params_desde_args(args):
+    if args.catalogo:
+        from utils.catalogo import cargar_catalogo
+        params = cargar_catalogo(args.catalogo, evaluationYear=ANIOS_EVALUACION[args.anio],
+                                 linkReliability=args.confiabilidad_enlace)
+        print(f"Catálogo {args.catalogo}: {len(params.costByNodeType)} tipos no dominados", file=sys.stderr)
+        return params
+    params = ModelParams.para_anio(ANIOS_EVALUACION[args.anio])
+    if args.confiabilidad_enlace is not None:
+        params = dataclasses.replace(params, linkReliability=args.confiabilidad_enlace)
+    return params
+
+
+def _numeros_nodos(texto):
+    """
+    Convierte "n" o un rango "a-b" (inclusive) en una lista de números de nodos.
+    """
+    inicio, _, fin = texto.partition("-")
+    try:
+        return list(range(int(inicio), int(fin or inicio) + 1))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Número de nodos inválido: {texto}")
+
+
+class _AccionNodos(argparse.Action):
+    """
+    Aplana los rangos de --nodos conservando el orden y sin repetidos.
+    """
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        setattr(namespace, self.dest, list(dict.fromkeys(n for rango in values for n in rango)))
+
+
+def _agregar_opciones_grilla(parser):
+    _agregar_opcion_anio(parser)
+    parser.add_argument("--nodos", type=_numeros_nodos, nargs="+", action=_AccionNodos, default=[5, 6, 11],
+                        help="Números de nodos a evaluar; acepta rangos como 4-100 (por defecto: 5 6 11).")
+    parser.add_argument("--topologias", nargs="+", choices=list(TOPOLOGIAS), default=list(TOPOLOGIAS),
+                        help="Topologías a resolver (por defecto: todas).")
+    parser.add_argument("--grilla", choices=TIPOS_GRILLA, default="lineal",
+                        help="Tipo de grilla de confiabilidades requeridas: lineal en confiabilidad o "
+                             "equiespaciada en número de nueves (--min-nueves a --max-nueves).")
+    parser.add_argument("--puntos", type=int, default=NUM_EQUIDISTANT_VALUES,
+                        help="Número de confiabilidades en la grilla.")
+    parser.add_argument("--min-confiabilidad", type=float, default=0.5,
+                        help="Confiabilidad inicial de la grilla (excluida).")
+    parser.add_argument("--max-confiabilidad", type=float, default=MAX_RELIABILITY,
+                        help="Confiabilidad final de la grilla (excluida).")
+    parser.add_argument("--min-nueves", type=float, default=MIN_NUEVES,
+                        help="Nueves del primer punto de la grilla 'nueves' (incluido).")
+    parser.add_argument("--max-nueves", type=float, default=MAX_NUEVES,
+                        help="Nueves del último punto de la grilla 'nueves' (incluido).")
+
+
+def _agregar_opciones_perfiles(parser):
+    parser.add_argument("--perfiles", default=ARCHIVO_PERFILES_SOLVER,
+                        help="Archivo de perfiles de parámetros de Gurobi por topología (ver 'ajustar'); "
+                             "se aplica si existe.")
+    parser.add_argument("--sin-perfiles", action="store_true",
+                        help="Resolver con los parámetros por defecto de Gurobi aunque exista el archivo de perfiles.")
+
+
+def _perfiles_desde_args(args):
+    if args.sin_perfiles:
+        return {}
+    from Modelos.perfiles_solver import cargar_perfiles
+
+    perfiles = {topologia: parametros for topologia, parametros in cargar_perfiles(args.perfiles).items() if parametros}
+    if perfiles:
+        print(f"Perfiles del solver de {args.perfiles}: "
+              + "; ".join(f"{topologia} {parametros}" for topologia, parametros in perfiles.items()), file=sys.stderr)
+    return perfiles
+
+
+def _grilla_desde_args(args):
+    if args.grilla == "nueves":
+        return generar_confiabilidades(args.grilla, args.min_nueves, args.max_nueves, args.puntos)
+    return generar_confiabilidades(args.grilla, args.min_confiabilidad, args.max_confiabilidad, args.puntos)
+
+
+def comando_sweep(args):
+    requiredReliabilities = _grilla_desde_args(args)
+    params = _params_desde_args(args)
+    registros = calcular_registros_barrido(
+        args.nodos, requiredReliabilities, args.topologias,
+        workers=args.workers, cacheDir=args.cache_dir, params=params, motor=args.motor,
+        perfiles=_perfiles_desde_args(args))
+    minimizedCosts = costos_desde_registros(registros)
+
+    if args.formato in FORMATOS_DATASET:
+        ejecucion = exportar_dataset(registros, args.salida, params, args.formato)
+        print(f"Resultados guardados en el dataset {args.salida} (ejecución {ejecucion})")
+    else:
+        guardar_resultados(args.salida, args.formato, args.nodos, args.topologias,
+                           requiredReliabilities, minimizedCosts)
+        print(f"Resultados guardados en {args.salida}")
+
+    if args.graficar:
+        graficar_todo(args.nodos, minimizedCosts, requiredReliabilities, args.topologias)
+
+
+def _log_confiabilidades_alcanzadas(topologia, totalNodes, soluciones, params):
+    """
+    Log-confiabilidad exacta (nodos y enlaces) de cada solución, evaluadas juntas; None si no hay solución.
+    """
+    from Modelos.evaluador import log_confiabilidad_configuraciones, conteos_desde_variables
+
+    numSubredes = totalNodes // 3 + 1 if topologia == "hibrido" else None
+    indices = [k for k, variables in enumerate(soluciones) if variables is not None]
+    resultado = [None] * len(soluciones)
+    if indices:
+        conteos = [conteos_desde_variables(soluciones[k], len(params.reliabilityByNodeType), numSubredes)
+                   for k in indices]
+        for k, logConfiabilidad in zip(indices, log_confiabilidad_configuraciones(topologia, conteos, params)):
+            resultado[k] = float(logConfiabilidad)
+    return resultado
+
+
+def _nueves_desde_log(logConfiabilidad):
+    """
+    Número de nueves -log10(1 - R) a partir de log R, sin pasar por R (None con R = 1).
+    """
+    return -math.log10(-math.expm1(logConfiabilidad)) if logConfiabilidad < 0 else None
+
+
+def _objetivo_desde_args(args):
+    """
+    Confiabilidad requerida de --confiabilidad, --nueves o --log-inconfiabilidad.
+    """
+    from Modelos.objetivo import desde_nueves, desde_log_inconfiabilidad
+
+    if args.nueves is not None:
+        return desde_nueves(args.nueves)
+    if args.log_inconfiabilidad is not None:
+        return desde_log_inconfiabilidad(args.log_inconfiabilidad)
+    return args.confiabilidad
+
+
+def _agregar_opciones_objetivo(parser, multiple=False):
+    grupo = parser.add_mutually_exclusive_group(required=True)
+    nargs = "+" if multiple else None
+    grupo.add_argument("--confiabilidad", type=float, nargs=nargs,
+                       help="Confiabilidad requerida" + (" (una o más)." if multiple else "."))
+    grupo.add_argument("--nueves", type=float, nargs=nargs,
+                       help="Confiabilidad requerida como número de nueves: 1 - 10^-nueves (alta confiabilidad).")
+    if not multiple:
+        grupo.add_argument("--log-inconfiabilidad", type=float,
+                           help="Confiabilidad requerida como log natural de 1 - R (alta confiabilidad).")
+
+
+def _escenarios_desde_args(args, params):
+    """
+    Escenarios de confiabilidad de --escenarios o muestreados con --distribucion.
+    """
+    from Modelos.robusto import cargar_escenarios, muestrear_escenarios
+
+    if args.escenarios:
+        return cargar_escenarios(args.escenarios, params)
+    return muestrear_escenarios(params, args.distribucion, args.num_escenarios, args.dispersion, args.semilla)
+
+
+def _solve_robusto(args, params, requiredReliability, baseModel):
+    from Modelos.objetivo import nueves
+    from Modelos.robusto import resolver_robusto, ESTADO_ROBUSTO_OPTIMO, ESTADO_ROBUSTO_INFACTIBLE
+
+    escenarios = _escenarios_desde_args(args, params)
+    costo, variables, resumen = resolver_robusto(
+        args.topologia, baseModel, args.nodos, requiredReliability, escenarios, args.cuantil, params)
+    optimo = resumen["estado"] == ESTADO_ROBUSTO_OPTIMO
+
+    if args.formato == "json":
+        if optimo:
+            resumen["nueves_cuantil"] = _nueves_desde_log(resumen["log_confiabilidad_cuantil"])
+            resumen["nueves_nominal"] = _nueves_desde_log(resumen["log_confiabilidad_nominal"])
+        print(json.dumps({
+            "topologia": args.topologia,
+            "nodos": args.nodos,
+            "confiabilidad": requiredReliability,
+            "nueves": nueves(requiredReliability),
+            "robusto": resumen,
+            "costo": costo,
+            "variables": variables,
+        }, indent=2))
+        return
+
+    print(f"Confiabilidad requerida: {requiredReliability} ({nueves(requiredReliability):.4f} nueves) en al menos "
+          f"{resumen['escenarios_requeridos']} de {resumen['escenarios']} escenarios (cuantil {resumen['cuantil']})")
+    print("Envolvente de la relajación: "
+          + ", ".join(f"{nombre}={valor:.6g}" for nombre, valor in zip(params.nodeTypeNames, resumen["envolvente"])))
+    if optimo:
+        for etiqueta, clave in (("en el cuantil", "log_confiabilidad_cuantil"), ("nominal", "log_confiabilidad_nominal")):
+            nuevesAlcanzados = _nueves_desde_log(resumen[clave])
+            print(f"Confiabilidad {etiqueta}: {math.exp(resumen[clave])}"
+                  + ("" if nuevesAlcanzados is None else f" ({nuevesAlcanzados:.4f} nueves)"))
+        print(f"Cumple en el {resumen['fraccion_cumple']:.2%} de los escenarios "
+              f"({resumen['candidatos']} candidatos, {resumen['resoluciones']} resoluciones)")
+    elif resumen["estado"] == ESTADO_ROBUSTO_INFACTIBLE:
+        print("Ninguna configuración cumple la confiabilidad requerida en el cuantil pedido.")
+    else:
+        print(f"Ninguna de las {resumen['candidatos']} configuraciones más baratas de la relajación es robusta "
+              f"(límite config.MAX_CANDIDATOS_ROBUSTO).")
+    mostrarResultadosTabla(args.nodos, costo, variables,
+                           "hibrido" if args.topologia == "hibrido" else "general",
+                           params.nodeTypeNames if args.catalogo else None)
+
+
+def comando_solve(args):
+    from Modelos.objetivo import nueves
+
+    params = _params_desde_args(args)
+    requiredReliability = _objetivo_desde_args(args)
+    robusto = args.escenarios or args.distribucion
+    if robusto and args.k_best:
+        raise SystemExit("--k-best no se puede combinar con el modo robusto (--escenarios o --distribucion).")
+    baseModel = construir_modelo_base(args.nodos, params)
+    if robusto:
+        _solve_robusto(args, params, requiredReliability, baseModel)
+        return
+    minCost, decisionVariables, _ = obtener_modelo(args.topologia)(
+        baseModel, args.nodos, requiredReliability, params, k_best=args.k_best)
+
+    # Sin --k-best se trata como una lista de una sola configuración
+    costos = minCost if args.k_best else [minCost]
+    soluciones = decisionVariables if args.k_best else [decisionVariables]
+    logAlcanzadas = _log_confiabilidades_alcanzadas(args.topologia, args.nodos, soluciones, params)
+    alcanzadas = [None if logR is None else math.exp(logR) for logR in logAlcanzadas]
+
+    if args.formato == "json":
+        print(json.dumps({
+            "topologia": args.topologia,
+            "nodos": args.nodos,
+            "confiabilidad": requiredReliability,
+            "nueves": nueves(requiredReliability),
+            "soluciones": [
+                {"costo": costo, "confiabilidad_alcanzada": alcanzada,
+                 "nueves_alcanzados": None if logR is None else _nueves_desde_log(logR), "variables": variables}
+                for costo, alcanzada, logR, variables in zip(costos, alcanzadas, logAlcanzadas, soluciones)
+            ],
+        }, indent=2))
+    else:
+        print(f"Confiabilidad requerida: {requiredReliability} ({nueves(requiredReliability):.4f} nueves)")
+        if not costos:
+            mostrarResultadosTabla(args.nodos, None, None)
+        for posicion, (costo, alcanzada, logR, variables) in enumerate(
+                zip(costos, alcanzadas, logAlcanzadas, soluciones), start=1):
+            if args.k_best:
+                print(f"Configuración {posicion} de {len(costos)}")
+            if alcanzada is not None:
+                nuevesAlcanzados = _nueves_desde_log(logR)
+                print(f"Confiabilidad alcanzada: {alcanzada}"
+                      + ("" if nuevesAlcanzados is None else f" ({nuevesAlcanzados:.4f} nueves)"))
+            mostrarResultadosTabla(args.nodos, costo, variables,
+                                   "hibrido" if args.topologia == "hibrido" else "general",
+                                   params.nodeTypeNames if args.catalogo else None)
+
+
+def comando_frontera(args):
+    from Modelos.frontera_hibrido import frontera_hibrido
+
+    params = _params_desde_args(args)
+    baseModel = construir_modelo_base(args.nodos, params)
+    pasos = frontera_hibrido(baseModel, args.nodos, args.min_confiabilidad, args.max_confiabilidad, params)
+
+    if args.formato == "json":
+        print(json.dumps({
+            "topologia": "hibrido",
+            "nodos": args.nodos,
+            "escalones": pasos,
+        }, indent=2))
+    else:
+        print(f"{'Desde':>20} {'Hasta':>20} {'Nueves':>8} {'Costo':>10} {'Tiempo s':>9}")
+        for paso in pasos:
+            nuevesHasta = -paso["log_inconfiabilidad"] / math.log(10)
+            print(f"{paso['desde']:>20.15f} {paso['hasta']:>20.15f} {nuevesHasta:>8.4f} {paso['costo']:>10.2f} {paso['tiempo_s']:>9.3f}")
+
+
+def comando_servir(args):
+    import asyncio
+    from utils.servicio import ServicioResolucion, servir
+
+    params = _params_desde_args(args)
+
+    async def ejecutar():
+        async with ServicioResolucion(params, args.workers, args.cache, args.ventana_lote / 1000, args.motor) as servicio:
+            tarea = asyncio.ensure_future(servir(
+                servicio, args.host, args.puerto,
+                lambda puerto: print(f"Servicio escuchando en {args.host}:{puerto}", file=sys.stderr, flush=True)))
+            for n in args.precalcular_hibrido:
+                escalones = await servicio.precalcular_hibrido(n, args.min_confiabilidad)
+                print(f"Frontera híbrida de {n} nodos lista: {escalones} escalones", file=sys.stderr, flush=True)
+            await tarea
 
-minimizedCosts = calcular_combinaciones_confLineal(totalNodes, seriesRequiredReliabilities, parallelRequiredReliabilities, hybridRequiredReliabilities)
-graficar_costosVsConfiabilidad(totalNodes, minimizedCosts, seriesRequiredReliabilities,parallelRequiredReliabilities, hybridRequiredReliabilities)
-graficar_costosVsConfiabilidad_topologiasJuntas(totalNodes, minimizedCosts, seriesRequiredReliabilities, parallelRequiredReliabilities, hybridRequiredReliabilities)
-graficar_costosVsConfiabilidad_porTopologia(totalNodes, minimizedCosts, seriesRequiredReliabilities, parallelRequiredReliabilities, hybridRequiredReliabilities)
-graficar_costos_zoom_hibrido_paralelo(totalNodes, minimizedCosts, parallelRequiredReliabilities, hybridRequiredReliabilities)
-print("Fin del programa")
+    try:
+        asyncio.run(ejecutar())
+    except KeyboardInterrupt:
+        pass
+
+
+def comando_consultar(args):
+    import asyncio
+    from utils.servicio import ClienteServicio
+
+    from Modelos.objetivo import desde_nueves
+
+    confiabilidades = args.confiabilidad or [desde_nueves(k) for k in args.nueves]
+    consultas = [(args.topologia, n, reqRel) for n in args.nodos for reqRel in confiabilidades]
+
+    async def ejecutar():
+        rondas = []
+        async with ClienteServicio(args.host, args.puerto) as cliente:
+            for _ in range(args.repeticiones):
+                # Todas las consultas de una ronda se envían juntas (el servicio las agrupa)
+                inicio = time.perf_counter()
+                respuestas = await asyncio.gather(*(cliente.consultar(*consulta) for consulta in consultas))
+                rondas.append((time.perf_counter() - inicio, respuestas))
+            estadisticas = await cliente.estadisticas()
+        return rondas, estadisticas
+
+    rondas, estadisticas = asyncio.run(ejecutar())
+    if args.formato == "json":
+        print(json.dumps({"rondas": [respuestas for _, respuestas in rondas], "estadisticas": estadisticas}, indent=2))
+        return
+
+    for numero, (tiempo, respuestas) in enumerate(rondas, start=1):
+        if numero == 1:
+            print(f"{'Nodos':>5} {'Confiabilidad':>16} {'Costo':>10} {'Origen':>17}")
+            for respuesta in respuestas:
+                if not respuesta["ok"]:
+                    print(f"Error: {respuesta['error']}")
+                    continue
+                registro = respuesta["registro"]
+                costo = "-" if registro["costo"] is None else f"{registro['costo']:.2f}"
+                print(f"{registro['n']:>5} {registro['confiabilidad_requerida']:>16.10f} {costo:>10} {respuesta['origen']:>17}")
+        origenes = Counter(respuesta.get("origen", "error") for respuesta in respuestas)
+        latencias = sorted(respuesta["latencia_ms"] for respuesta in respuestas if respuesta["ok"])
+        print(f"Ronda {numero}: {len(respuestas)} consultas en {tiempo * 1000:.2f} ms "
+              f"(servicio máx {latencias[-1] if latencias else 0:.2f} ms) "
+              + ", ".join(f"{origen}={cantidad}" for origen, cantidad in sorted(origenes.items())))
+    print("Servicio: " + ", ".join(f"{clave}={valor}" for clave, valor in estadisticas.items()))
+
+
+def comando_particionar(args):
+    from utils.cola import particionar_barrido
+
+    unidades = particionar_barrido(
+        args.cola, args.nodos, _grilla_desde_args(args), args.topologias, _params_desde_args(args),
+        motor=args.motor, escenario=args.escenario, puntosPorUnidad=args.puntos_por_unidad,
+        perfiles=_perfiles_desde_args(args))
+    print(f"Escenario {args.escenario}: {len(unidades)} unidades escritas en {args.cola}")
+
+
+def comando_trabajar(args):
+    from utils.cola import trabajar, reencolar_fallidas
+
+    if args.reintentar_fallidas:
+        print(f"{reencolar_fallidas(args.cola)} unidades fallidas devueltas a pendientes")
+    resueltas, fallidas = trabajar(args.cola, esperar=args.esperar, vencimientoS=args.vencimiento,
+                                   maxUnidades=args.max_unidades)
+    print(f"Trabajador terminado: {resueltas} unidades resueltas, {fallidas} fallidas")
+
+
+def comando_unir(args):
+    from utils.cola import unir_resultados
+
+    barrido, params = unir_resultados(args.cola, args.escenario)
+    registros = barrido["registros"]
+    minimizedCosts = costos_desde_registros(registros)
+
+    if args.formato in FORMATOS_DATASET:
+        ejecucion = exportar_dataset(registros, args.salida, params, args.formato)
+        print(f"Resultados guardados en el dataset {args.salida} (ejecución {ejecucion})")
+    else:
+        guardar_resultados(args.salida, args.formato, barrido["nodos"], barrido["topologias"],
+                           barrido["confiabilidades"], minimizedCosts)
+        print(f"Resultados guardados en {args.salida}")
+
+    if args.graficar:
+        graficar_todo(barrido["nodos"], minimizedCosts, barrido["confiabilidades"], barrido["topologias"])
+
+
+def comando_ajustar(args):
+    from Modelos.perfiles_solver import ajustar_topologia, guardar_perfil
+
+    requiredReliabilities = _grilla_desde_args(args)
+    params = _params_desde_args(args)
+    for topologia in args.topologias:
+        print(f"Ajustando {topologia} ({args.metodo}, hasta {args.tiempo:g} s)...", flush=True)
+        perfil = ajustar_topologia(topologia, args.nodos, requiredReliabilities, params,
+                                   metodo=args.metodo, tiempoLimite=args.tiempo)
+        guardar_perfil(args.perfiles, topologia, perfil)
+        print(f"{topologia}: {perfil['parametros'] or 'parámetros por defecto'}; trabajo "
+              f"{perfil['trabajo_defecto']:.4f} -> {perfil['trabajo_ajustado']:.4f}, tiempo "
+              f"{perfil['tiempo_defecto_s']:.3f} s -> {perfil['tiempo_ajustado_s']:.3f} s", flush=True)
+    print(f"Perfiles guardados en {args.perfiles}")
+
+
+def comando_plot(args):
+    if os.path.isdir(args.entrada):
+        # Dataset columnar: Arrow si contiene archivos .arrow, Parquet en otro caso
+        formato = "parquet"
+        for _, _, archivos in os.walk(args.entrada):
+            if any(archivo.endswith(".arrow") for archivo in archivos):
+                formato = "arrow"
+                break
+        totalNodes, topologias, requiredReliabilities, minimizedCosts = resultados_desde_dataset(
+            args.entrada, formato, args.ejecucion)
+    else:
+        totalNodes, topologias, requiredReliabilities, minimizedCosts = cargar_resultados(args.entrada)
+    graficar_todo(totalNodes, minimizedCosts, requiredReliabilities, topologias)
+
+
+# Módulos medidos por el benchmark de importación y dependencias pesadas a vigilar
+MODULOS_IMPORTACION = ("config", "utils.validation", "utils.utils", "utils.sweep", "main",
+                       "Modelos.base_model", "Modelos.hybrid_model")
+DEPENDENCIAS_PESADAS = ("gurobipy", "numpy", "pandas", "matplotlib")
+
+
+def medir_importaciones(modulos=MODULOS_IMPORTACION, repeticiones=5):
+    """
+    Mide el tiempo de importación de cada módulo en un intérprete nuevo.
+
+    Parámetros:
+    - modulos (iterable[str]): Módulos a importar.
+    - repeticiones (int): Intérpretes lanzados por módulo; se reporta el mínimo.
+
+    Retorna:
+    - list[dict]: Tiempo mínimo de importación (ms) y dependencias pesadas cargadas por módulo.
+    """
+    codigo = (
+        "import sys, time, json\n"
+        "inicio = time.perf_counter()\n"
+        "import {modulo}\n"
+        "fin = time.perf_counter()\n"
+        "print(json.dumps([fin - inicio, [m for m in {pesadas!r} if m in sys.modules]]))\n"
+    )
+    raiz = os.path.dirname(os.path.abspath(__file__))
+    filas = []
+    for modulo in modulos:
+        tiempos = []
+        for _ in range(repeticiones):
+            salida = subprocess.run(
+                [sys.executable, "-c", codigo.format(modulo=modulo, pesadas=DEPENDENCIAS_PESADAS)],
+                cwd=raiz, capture_output=True, text=True)
+            if salida.returncode != 0:
+                raise RuntimeError(f"No se pudo importar {modulo}: {salida.stderr.strip()}")
+            tiempo, cargadas = json.loads(salida.stdout.strip().splitlines()[-1])
+            tiempos.append(tiempo)
+        filas.append({"modulo": modulo, "importacion_ms": min(tiempos) * 1000, "pesadas": cargadas})
+    return filas
+
+
+def comando_bench(args):
+    if args.importaciones:
+        filas = medir_importaciones(repeticiones=args.repeticiones)
+        if args.formato == "json":
+            print(json.dumps(filas, indent=2))
+        else:
+            print(f"{'Módulo':<22} {'Import ms':>10}  Dependencias pesadas")
+            for fila in filas:
+                print(f"{fila['modulo']:<22} {fila['importacion_ms']:>10.2f}  {', '.join(fila['pesadas']) or '-'}")
+        return
+
+    requiredReliabilities = _grilla_desde_args(args)
+    params = _params_desde_args(args)
+    # Con --comparar-perfiles cada combinación se mide con los parámetros por defecto y con su perfil
+    perfiles = _perfiles_desde_args(args) if args.comparar_perfiles else {}
+    if args.comparar_perfiles and not perfiles:
+        raise SystemExit(f"No hay perfiles que comparar en {args.perfiles} (ver 'ajustar').")
+    filas = []
+
+    for n in args.nodos:
+        inicio = time.perf_counter()
+        baseModel = construir_modelo_base(n, params)
+        tiempoBase = time.perf_counter() - inicio
+
+        for topologia in args.topologias:
+            modelo = obtener_modelo(topologia)
+            variantes = {"defecto": None}
+            if perfiles.get(topologia):
+                variantes["ajustado"] = perfiles[topologia]
+            for perfil, parametrosSolver in variantes.items():
+                env = entorno_parametros(parametrosSolver)
+                tiempos = []
+                trabajo = 0.0
+                for _ in range(args.repeticiones):
+                    for reqRel in requiredReliabilities:
+                        inicio = time.perf_counter()
+                        _, _, model = modelo(baseModel, n, reqRel, params, env=env)
+                        tiempos.append(time.perf_counter() - inicio)
+                        trabajo += model.Work
+                        model.dispose()
+                filas.append({
+                    "topologia": topologia,
+                    "nodos": n,
+                    "perfil": perfil,
+                    "resoluciones": len(tiempos),
+                    "base_ms": tiempoBase * 1000,
+                    "total_s": sum(tiempos),
+                    "media_ms": sum(tiempos) / len(tiempos) * 1000,
+                    "max_ms": max(tiempos) * 1000,
+                    "trabajo": trabajo,
+                })
+
+    if args.formato == "json":
+        print(json.dumps(filas, indent=2))
+    else:
+        print(f"{'Topología':<10} {'Nodos':>5} {'Perfil':<9} {'Solves':>7} {'Base ms':>9} {'Total s':>9} "
+              f"{'Media ms':>9} {'Max ms':>9} {'Trabajo':>9}")
+        for fila in filas:
+            print(f"{fila['topologia']:<10} {fila['nodos']:>5} {fila['perfil']:<9} {fila['resoluciones']:>7} "
+                  f"{fila['base_ms']:>9.2f} {fila['total_s']:>9.3f} {fila['media_ms']:>9.2f} {fila['max_ms']:>9.2f} "
+                  f"{fila['trabajo']:>9.4f}")
+
+    if perfiles:
+        # Aceleración del perfil por topología sobre todas las combinaciones medidas
+        for topologia in args.topologias:
+            totales = {}
+            for fila in filas:
+                if fila["topologia"] == topologia:
+                    total_s, trabajo = totales.get(fila["perfil"], (0.0, 0.0))
+                    totales[fila["perfil"]] = (total_s + fila["total_s"], trabajo + fila["trabajo"])
+            if "ajustado" in totales:
+                (tiempoDefecto, trabajoDefecto), (tiempoAjustado, trabajoAjustado) = totales["defecto"], totales["ajustado"]
+                print(f"{topologia}: aceleración con perfil x{tiempoDefecto / tiempoAjustado:.2f} en tiempo, "
+                      f"x{trabajoDefecto / trabajoAjustado:.2f} en trabajo de Gurobi", file=sys.stderr)
+
+
+def construir_parser():
+    parser = argparse.ArgumentParser(
+        description="Optimización de costo vs confiabilidad para topologías serie, paralelo e híbrida.")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    sweep = subparsers.add_parser("sweep", help="Barrido de costos mínimos sobre una grilla de confiabilidades.")
+    _agregar_opciones_grilla(sweep)
+    sweep.add_argument("--workers", type=int, default=1,
+                       help="Número de procesos para resolver combinaciones (n, topología) en paralelo.")
+    sweep.add_argument("--motor", choices=MOTORES, default="gurobi",
+                       help="'dp' calcula serie y paralelo para todos los n en una pasada (el híbrido usa Gurobi).")
+    sweep.add_argument("--cache-dir", default=None,
+                       help="Directorio de caché de resultados por (n, topología, grilla).")
+    sweep.add_argument("--formato", choices=["json", "csv", *FORMATOS_DATASET], default="json",
+                       help="Formato de resultados: archivo JSON/CSV o dataset Parquet/Arrow particionado.")
+    sweep.add_argument("--salida", default="resultados/sweep.json",
+                       help="Archivo de resultados (directorio del dataset con parquet/arrow).")
+    sweep.add_argument("--graficar", action="store_true",
+                       help="Generar las gráficas al terminar el barrido.")
+    _agregar_opciones_perfiles(sweep)
+    sweep.set_defaults(func=comando_sweep)
+
+    solve = subparsers.add_parser("solve", help="Resuelve una única instancia (topología, n, confiabilidad).")
+    solve.add_argument("--nodos", type=int, required=True, help="Número de nodos.")
+    solve.add_argument("--topologia", choices=list(TOPOLOGIAS), required=True, help="Topología a resolver.")
+    _agregar_opciones_objetivo(solve)
+    solve.add_argument("--k-best", type=int, default=None,
+                       help="Retornar las k configuraciones distintas más baratas (pool de soluciones).")
+    robusto = solve.add_argument_group(
+        "modo robusto", "Confiabilidades de nodo inciertas: la configuración más barata que cumple en al menos "
+                        "--cuantil de los escenarios.")
+    origen = robusto.add_mutually_exclusive_group()
+    origen.add_argument("--escenarios", default=None,
+                        help="Archivo de escenarios (CSV con una columna por tipo o JSON); activa el modo robusto.")
+    origen.add_argument("--distribucion", choices=sorted(DISPERSION_ESCENARIOS), default=None,
+                        help="Muestrear escenarios alrededor de las confiabilidades nominales; activa el modo robusto.")
+    robusto.add_argument("--num-escenarios", type=int, default=NUM_ESCENARIOS, help="Escenarios a muestrear.")
+    robusto.add_argument("--dispersion", type=float, default=None,
+                         help="Desvío del logit (logitnormal) o concentración (beta); por defecto "
+                              "config.DISPERSION_ESCENARIOS.")
+    robusto.add_argument("--semilla", type=int, default=None, help="Semilla del muestreo (reproducible).")
+    robusto.add_argument("--cuantil", type=float, default=CUANTIL_ROBUSTO,
+                         help="Fracción de escenarios en los que se debe cumplir la confiabilidad requerida.")
+    _agregar_opcion_anio(solve)
+    solve.add_argument("--formato", choices=["tabla", "json"], default="tabla", help="Formato de salida.")
+    solve.set_defaults(func=comando_solve)
+
+    frontera = subparsers.add_parser(
+        "frontera", help="Frontera escalonada costo vs confiabilidad del modelo híbrido (un único modelo).")
+    frontera.add_argument("--nodos", type=int, required=True, help="Número de nodos.")
+    frontera.add_argument("--min-confiabilidad", type=float, default=0.5,
+                          help="Confiabilidad requerida del primer escalón.")
+    frontera.add_argument("--max-confiabilidad", type=float, default=MAX_RELIABILITY,
+                          help="Se detiene al alcanzar esta confiabilidad.")
+    _agregar_opcion_anio(frontera)
+    frontera.add_argument("--formato", choices=["tabla", "json"], default="tabla", help="Formato de salida.")
+    frontera.set_defaults(func=comando_frontera)
+
+    servicio = subparsers.add_parser(
+        "servir", help="Servicio local (asyncio) de consultas con lotes, fronteras precalculadas y caché.")
+    _agregar_opcion_anio(servicio)
+    servicio.add_argument("--host", default=HOST_SERVICIO, help="Interfaz donde escuchar (por defecto solo la local).")
+    servicio.add_argument("--puerto", type=int, default=PUERTO_SERVICIO, help="Puerto TCP (0 elige uno libre).")
+    servicio.add_argument("--workers", type=int, default=1, help="Procesos del pool del solver.")
+    servicio.add_argument("--cache", type=int, default=TAMANO_CACHE_SERVICIO, help="Respuestas del solver en la caché LRU.")
+    servicio.add_argument("--ventana-lote", type=float, default=VENTANA_LOTE_S * 1000,
+                          help="Milisegundos de espera para agrupar consultas de la misma (topología, n).")
+    servicio.add_argument("--motor", choices=MOTORES, default="dp",
+                          help="'dp' responde serie y paralelo desde sus fronteras exactas; 'gurobi' usa siempre el solver.")
+    servicio.add_argument("--precalcular-hibrido", type=_numeros_nodos, nargs="+", action=_AccionNodos, default=[],
+                          help="Números de nodos cuya frontera híbrida se calcula al iniciar (acepta rangos).")
+    servicio.add_argument("--min-confiabilidad", type=float, default=0.5,
+                          help="Confiabilidad inicial de las fronteras híbridas precalculadas.")
+    servicio.set_defaults(func=comando_servir)
+
+    consultar = subparsers.add_parser("consultar", help="Cliente del servicio local: envía consultas y mide latencias.")
+    consultar.add_argument("--host", default=HOST_SERVICIO, help="Host del servicio.")
+    consultar.add_argument("--puerto", type=int, default=PUERTO_SERVICIO, help="Puerto del servicio.")
+    consultar.add_argument("--topologia", choices=list(TOPOLOGIAS), required=True, help="Topología a consultar.")
+    consultar.add_argument("--nodos", type=_numeros_nodos, nargs="+", action=_AccionNodos, required=True,
+                           help="Números de nodos; acepta rangos como 4-20.")
+    _agregar_opciones_objetivo(consultar, multiple=True)
+    consultar.add_argument("--repeticiones", type=int, default=2,
+                           help="Rondas de las mismas consultas (desde la segunda se responden de caché o frontera).")
+    consultar.add_argument("--formato", choices=["tabla", "json"], default="tabla", help="Formato de salida.")
+    consultar.set_defaults(func=comando_consultar)
+
+    particionar = subparsers.add_parser(
+        "particionar", help="Divide un barrido en unidades de trabajo en una cola de directorio compartido.")
+    particionar.add_argument("--cola", required=True, help="Directorio de la cola (compartido entre trabajadores).")
+    _agregar_opciones_grilla(particionar)
+    particionar.add_argument("--motor", choices=MOTORES, default="gurobi",
+                             help="'dp' deja serie y paralelo como una unidad por topología (todos los n).")
+    particionar.add_argument("--escenario", default="base",
+                             help="Nombre del escenario; varios escenarios pueden compartir la cola.")
+    particionar.add_argument("--puntos-por-unidad", type=int, default=None,
+                             help="Confiabilidades por unidad (por defecto la grilla completa de cada n).")
+    _agregar_opciones_perfiles(particionar)
+    particionar.set_defaults(func=comando_particionar)
+
+    trabajador = subparsers.add_parser(
+        "trabajar", help="Trabajador de la cola: reclama unidades, las resuelve y escribe sus resultados.")
+    trabajador.add_argument("--cola", required=True, help="Directorio de la cola.")
+    trabajador.add_argument("--esperar", action="store_true",
+                            help="Seguir sondeando mientras otros trabajadores tengan unidades en curso.")
+    trabajador.add_argument("--vencimiento", type=float, default=None,
+                            help="Segundos tras los que una unidad en curso se reencola (trabajador caído).")
+    trabajador.add_argument("--reintentar-fallidas", action="store_true",
+                            help="Devolver a pendientes las unidades fallidas antes de empezar.")
+    trabajador.add_argument("--max-unidades", type=int, default=None, help="Terminar tras este número de unidades.")
+    trabajador.set_defaults(func=comando_trabajar)
+
+    unir = subparsers.add_parser("unir", help="Une los resultados de un escenario de la cola en un archivo o dataset.")
+    unir.add_argument("--cola", required=True, help="Directorio de la cola.")
+    unir.add_argument("--escenario", default="base", help="Escenario a unir.")
+    unir.add_argument("--formato", choices=["json", "csv", *FORMATOS_DATASET], default="json",
+                      help="Formato de resultados: archivo JSON/CSV o dataset Parquet/Arrow particionado.")
+    unir.add_argument("--salida", default="resultados/sweep.json",
+                      help="Archivo de resultados (directorio del dataset con parquet/arrow).")
+    unir.add_argument("--graficar", action="store_true", help="Generar las gráficas de los resultados unidos.")
+    unir.set_defaults(func=comando_unir)
+
+    ajustar = subparsers.add_parser(
+        "ajustar", help="Ajusta los parámetros de Gurobi por topología y los guarda como perfiles para los barridos.")
+    _agregar_opciones_grilla(ajustar)
+    ajustar.set_defaults(nodos=NODOS_AJUSTE, puntos=5)
+    ajustar.add_argument("--metodo", choices=METODOS_AJUSTE, default="local",
+                         help="'local': búsqueda por coordenadas sobre config.CANDIDATOS_AJUSTE; "
+                              "'gurobi': Model.tune() sobre la instancia más costosa.")
+    ajustar.add_argument("--tiempo", type=float, default=TIEMPO_AJUSTE_S, help="Segundos de ajuste por topología.")
+    ajustar.add_argument("--perfiles", default=ARCHIVO_PERFILES_SOLVER,
+                         help="Archivo de perfiles donde guardar (se conservan los de otras topologías).")
+    ajustar.set_defaults(func=comando_ajustar)
+
+    plot = subparsers.add_parser("plot", help="Genera las gráficas a partir de un archivo de resultados.")
+    plot.add_argument("entrada", help="Archivo (JSON o CSV) o directorio de dataset generado por 'sweep'.")
+    plot.add_argument("--ejecucion", default=None, help="Ejecución del dataset a graficar (por defecto todas).")
+    plot.set_defaults(func=comando_plot)
+
+    bench = subparsers.add_parser("bench", help="Mide tiempos de construcción y resolución de los modelos.")
+    _agregar_opciones_grilla(bench)
+    bench.set_defaults(puntos=10)
+    bench.add_argument("--repeticiones", type=int, default=1,
+                       help="Repeticiones de la grilla por combinación (o intérpretes por módulo con --importaciones).")
+    bench.add_argument("--importaciones", action="store_true",
+                       help="Medir el tiempo de importación de los módulos en lugar de los modelos.")
+    bench.add_argument("--comparar-perfiles", action="store_true",
+                       help="Medir cada combinación con los parámetros por defecto y con el perfil de su topología.")
+    _agregar_opciones_perfiles(bench)
+    bench.add_argument("--formato", choices=["tabla", "json"], default="tabla", help="Formato de salida.")
+    bench.set_defaults(func=comando_bench)
+
+    return parser
+
+
+def main(argv=None):
+    args = construir_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
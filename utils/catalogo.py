@@ -0,0 +1,66 @@
+import csv
+import json
+
+from config import ModelParams, EVALUATION_YEAR
+
+# Formatos de catálogo de tipos de nodo:
+# - CSV con encabezado nombre,costo,confiabilidad (una fila por tipo/SKU).
+# - JSON con {"costoEnlace": opcional, "confiabilidadEnlace": opcional,
+#   "tipos": [{"nombre", "costo", "confiabilidad"}, ...]} o directamente la lista de tipos.
+COLUMNAS_CATALOGO = ("nombre", "costo", "confiabilidad")
+
+
+def _leer_tipos(ruta):
+    """
+    Lee las filas de tipos y los datos de enlace (costo y confiabilidad, si el archivo los trae)
+    de un catálogo.
+    """
+    if ruta.endswith(".csv"):
+        with open(ruta, newline="") as archivo:
+            lector = csv.DictReader(archivo)
+            faltantes = set(COLUMNAS_CATALOGO) - set(lector.fieldnames or ())
+            if faltantes:
+                raise ValueError(
+                    f"El catálogo {ruta} no tiene las columnas: {', '.join(sorted(faltantes))}")
+            return list(lector), {}
+
+    with open(ruta) as archivo:
+        datos = json.load(archivo)
+    if isinstance(datos, list):
+        return datos, {}
+    return datos["tipos"], {clave: datos[clave] for clave in ("costoEnlace", "confiabilidadEnlace") if clave in datos}
+
+
+def cargar_catalogo(ruta, linkCost=None, evaluationYear=EVALUATION_YEAR, podar=True, linkReliability=None):
+    """
+    Carga un catálogo de tipos de nodo (CSV o JSON) como parámetros del modelo.
+
+    Parámetros:
+    - ruta (str): Archivo del catálogo (ver COLUMNAS_CATALOGO).
+    - linkCost (float, opcional): Costo de un enlace; tiene prioridad sobre el del archivo. Si
+      ninguno lo define se usa el del año de evaluación.
+    - evaluationYear (bool): Año de evaluación para el costo de enlace por defecto (2025: True, 2030: False).
+    - podar (bool): Quitar los tipos dominados (ver ModelParams.sin_dominados).
+    - linkReliability (float, opcional): Confiabilidad de un enlace; tiene prioridad sobre la del
+      archivo (por defecto enlaces perfectos).
+
+    Retorna:
+    - ModelParams: Parámetros con un tipo por fila del catálogo.
+    """
+    tipos, enlace = _leer_tipos(ruta)
+    if not tipos:
+        raise ValueError(f"El catálogo {ruta} no tiene tipos de nodo.")
+
+    if linkCost is None:
+        linkCost = enlace.get("costoEnlace", ModelParams.para_anio(evaluationYear).linkCost)
+    if linkReliability is None:
+        linkReliability = enlace.get("confiabilidadEnlace", 1.0)
+
+    params = ModelParams(
+        costByNodeType=tuple(float(tipo["costo"]) for tipo in tipos),
+        reliabilityByNodeType=tuple(float(tipo["confiabilidad"]) for tipo in tipos),
+        linkCost=linkCost,
+        nodeTypeNames=tuple(tipo.get("nombre") or f"Tipo {i}" for i, tipo in enumerate(tipos)),
+        linkReliability=linkReliability,
+    )
+    return params.sin_dominados() if podar else params
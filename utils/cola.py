@@ -0,0 +1,379 @@
+# ============================================================
+# Barrido distribuido sobre una cola de trabajo en un directorio compartido
+# ============================================================
+import dataclasses
+import json
+import os
+import socket
+import time
+import traceback
+import uuid
+
+from utils.sweep import (TOPOLOGIAS, MOTORES, construir_modelo_base, calcular_registros_topologia,
+                         calcular_registros_dp, _usa_dp)
+from Modelos.objetivo import ConfiabilidadRequerida, desde_log_inconfiabilidad, log_inconfiabilidad
+from config import DEFAULT_PARAMS, ModelParams
+
+# Estructura de la cola (todas las operaciones son renombres o escrituras atómicas, por lo que
+# varios procesos o máquinas pueden compartir el directorio, p. ej. por NFS):
+#   barridos/<escenario>.json   manifiesto del barrido (grilla, parámetros y unidades)
+#   pendientes/<unidad>.json    unidades sin reclamar
+#   en_curso/<unidad>@<reclamo>.json
+#                               unidades reclamadas (el mtime es el inicio del reclamo; <reclamo>
+#                               identifica al trabajador que la reclamó esa vez)
+#   resultados/<unidad>.json    registros de cada unidad terminada
+#   fallidas/<unidad>.json      unidad y traza del error
+DIRECTORIOS_COLA = ("barridos", "pendientes", "en_curso", "resultados", "fallidas")
+
+# Espera entre sondeos de un trabajador que aguarda unidades nuevas
+ESPERA_SONDEO_S = 1.0
+
+# Separa el id de la unidad del identificador del reclamo en los archivos de en_curso
+SEPARADOR_RECLAMO = "@"
+
+
+def _escribir_json(ruta, datos):
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, "w") as archivo:
+        json.dump(datos, archivo)
+    os.replace(temporal, ruta)
+
+
+def _leer_json(ruta):
+    with open(ruta) as archivo:
+        return json.load(archivo)
+
+
+def _params_desde_dict(datos):
+    return ModelParams(**datos)
+
+
+def _objetivos_unidad(unidad):
+    """
+    Confiabilidades requeridas de una unidad, con su log-inconfiabilidad exacta si se particionó
+    una grilla de alta confiabilidad (ver Modelos.objetivo).
+    """
+    if "log_inconfiabilidades" not in unidad:
+        return unidad["confiabilidades"]
+    return [desde_log_inconfiabilidad(q) for q in unidad["log_inconfiabilidades"]]
+
+
+def crear_cola(directorio):
+    """
+    Crea (si no existen) los subdirectorios de la cola.
+    """
+    for nombre in DIRECTORIOS_COLA:
+        os.makedirs(os.path.join(directorio, nombre), exist_ok=True)
+
+
+def particionar_barrido(directorio, totalNodes, requiredReliabilities, topologias=tuple(TOPOLOGIAS),
+                        params=None, motor="gurobi", escenario="base", puntosPorUnidad=None, perfiles=None):
+    """
+    Divide un barrido en unidades de trabajo y las escribe en la cola.
+
+    Cada unidad es una topología, un n y un tramo de la grilla; con el motor "dp", serie y paralelo
+    son una sola unidad por topología que cubre todos los n (una pasada DP). Las unidades se
+    nombran de modo que el orden alfabético reparte primero las más costosas (híbrido y n grandes).
+    Varios escenarios (p. ej. años o catálogos) pueden compartir la misma cola.
+
+    Parámetros:
+    - directorio (str): Directorio de la cola (compartido entre trabajadores).
+    - totalNodes (list[int]): Números de nodos a evaluar.
+    - requiredReliabilities (list[float]): Grilla de confiabilidades.
+    - topologias (iterable[str]): Topologías a resolver.
+    - params (ModelParams, opcional): Parámetros del escenario (por defecto DEFAULT_PARAMS).
+    - motor (str): "gurobi" o "dp" (ver utils.sweep.MOTORES).
+    - escenario (str): Nombre del escenario; identifica el barrido al unir resultados.
+    - puntosPorUnidad (int, opcional): Confiabilidades por unidad (por defecto la grilla completa).
+    - perfiles (dict, opcional): Parámetros de Gurobi por topología (ver Modelos.perfiles_solver); se
+      guardan en las unidades para que todos los trabajadores resuelvan con los mismos.
+
+    Retorna:
+    - list[str]: Identificadores de las unidades escritas.
+    """
+    if params is None:
+        params = DEFAULT_PARAMS
+    if perfiles is None:
+        perfiles = {}
+    for topologia in topologias:
+        if topologia not in TOPOLOGIAS:
+            raise ValueError(f"Topología desconocida: {topologia}. Opciones: {', '.join(TOPOLOGIAS)}")
+    if motor not in MOTORES:
+        raise ValueError(f"Motor desconocido: {motor}. Opciones: {', '.join(MOTORES)}")
+    if not escenario or any(caracter in escenario for caracter in "/\\-"):
+        raise ValueError(f"Nombre de escenario inválido: {escenario!r} (no puede estar vacío ni contener '/', '\\' o '-').")
+
+    crear_cola(directorio)
+    manifiesto = os.path.join(directorio, "barridos", f"{escenario}.json")
+    if os.path.exists(manifiesto):
+        raise FileExistsError(f"El escenario {escenario} ya existe en la cola {directorio}.")
+
+    requiredReliabilities = list(requiredReliabilities)
+    tamano = puntosPorUnidad or len(requiredReliabilities)
+    tramos = [requiredReliabilities[i:i + tamano] for i in range(0, len(requiredReliabilities), tamano)]
+
+    unidades = []
+    for topologia in topologias:
+        if _usa_dp(topologia, motor):
+            unidades.append({"topologia": topologia, "nodos": list(totalNodes), "confiabilidades": requiredReliabilities})
+            continue
+        for n in totalNodes:
+            for tramo in tramos:
+                unidades.append({"topologia": topologia, "nodos": [n], "confiabilidades": tramo})
+
+    # Más costosas primero: híbrido antes que el resto y, dentro de cada topología, n decreciente
+    unidades.sort(key=lambda unidad: (unidad["topologia"] != "hibrido", -max(unidad["nodos"])))
+    datosParams = dataclasses.asdict(params)
+    for posicion, unidad in enumerate(unidades):
+        unidad.update(id=f"{posicion:06d}-{escenario}-{unidad['topologia']}-n{max(unidad['nodos'])}",
+                      escenario=escenario, motor=motor, params=datosParams)
+        # El JSON guarda la confiabilidad como float: los objetivos de alta confiabilidad viajan
+        # también como log-inconfiabilidad para llegar exactos a los modelos
+        if any(isinstance(reqRel, ConfiabilidadRequerida) for reqRel in unidad["confiabilidades"]):
+            unidad["log_inconfiabilidades"] = [log_inconfiabilidad(reqRel) for reqRel in unidad["confiabilidades"]]
+        if perfiles.get(unidad["topologia"]) and not _usa_dp(unidad["topologia"], motor):
+            unidad["parametros_solver"] = perfiles[unidad["topologia"]]
+
+    # El manifiesto se escribe antes que las unidades: un trabajador nunca ve unidades huérfanas
+    _escribir_json(manifiesto, {
+        "escenario": escenario,
+        "nodos": list(totalNodes),
+        "topologias": list(topologias),
+        "confiabilidades": requiredReliabilities,
+        "motor": motor,
+        "params": datosParams,
+        "perfiles": perfiles,
+        "unidades": [unidad["id"] for unidad in unidades],
+    })
+    for unidad in unidades:
+        _escribir_json(os.path.join(directorio, "pendientes", f"{unidad['id']}.json"), unidad)
+    return [unidad["id"] for unidad in unidades]
+
+
+def reclamar_unidad(directorio):
+    """
+    Reclama atómicamente la siguiente unidad pendiente (renombrándola a en_curso).
+
+    El archivo reclamado lleva un identificador propio del reclamo: si la unidad vence y otro
+    trabajador la vuelve a reclamar, cada uno solo ve (y borra) su propio archivo.
+
+    Retorna:
+    - Tuple[dict, str] | None: La unidad reclamada y la ruta de su archivo en en_curso, o None si no
+      quedan pendientes.
+    """
+    pendientes = os.path.join(directorio, "pendientes")
+    for nombre in sorted(os.listdir(pendientes)):
+        if not nombre.endswith(".json"):
+            continue
+        origen = os.path.join(pendientes, nombre)
+        destino = os.path.join(directorio, "en_curso",
+                               f"{nombre[:-len('.json')]}{SEPARADOR_RECLAMO}{uuid.uuid4().hex}.json")
+        try:
+            # El inicio del reclamo se marca antes del renombre (que conserva el mtime): la unidad
+            # nunca aparece en en_curso con la hora de partición (ver reencolar_vencidas)
+            os.utime(origen)
+            os.rename(origen, destino)
+            unidad = _leer_json(destino)
+        except FileNotFoundError:
+            continue  # Otro trabajador la reclamó primero o se reencoló: reclamo perdido
+        return unidad, destino
+    return None
+
+
+def reencolar_vencidas(directorio, vencimientoS):
+    """
+    Devuelve a pendientes las unidades reclamadas hace más de `vencimientoS` segundos (trabajadores caídos).
+
+    Retorna:
+    - int: Número de unidades reencoladas.
+    """
+    enCurso = os.path.join(directorio, "en_curso")
+    limite = time.time() - vencimientoS
+    reencoladas = 0
+    for nombre in os.listdir(enCurso):
+        ruta = os.path.join(enCurso, nombre)
+        try:
+            if nombre.endswith(".json") and os.path.getmtime(ruta) < limite:
+                unidad = nombre[:-len(".json")].split(SEPARADOR_RECLAMO)[0]
+                os.rename(ruta, os.path.join(directorio, "pendientes", f"{unidad}.json"))
+                reencoladas += 1
+        except FileNotFoundError:
+            continue  # Terminó o la reencoló otro trabajador
+    return reencoladas
+
+
+def reencolar_fallidas(directorio):
+    """
+    Devuelve a pendientes las unidades fallidas (p. ej. tras corregir la causa del error).
+
+    Retorna:
+    - int: Número de unidades reencoladas.
+    """
+    fallidas = os.path.join(directorio, "fallidas")
+    reencoladas = 0
+    for nombre in os.listdir(fallidas):
+        if not nombre.endswith(".json"):
+            continue
+        # Se reclama con un renombre atómico a un nombre propio (como en reclamar_unidad): si dos
+        # trabajadores reencolan a la vez, solo uno la lee y la escribe en pendientes
+        reclamada = os.path.join(fallidas, f"{nombre[:-len('.json')]}{SEPARADOR_RECLAMO}{uuid.uuid4().hex}.reencolar")
+        try:
+            os.rename(os.path.join(fallidas, nombre), reclamada)
+        except FileNotFoundError:
+            continue  # La reencoló otro trabajador
+        _escribir_json(os.path.join(directorio, "pendientes", nombre), _leer_json(reclamada)["unidad"])
+        os.remove(reclamada)
+        reencoladas += 1
+    return reencoladas
+
+
+def resolver_unidad(unidad, modelosBase=None):
+    """
+    Resuelve una unidad de trabajo con los modelos de cada topología.
+
+    Parámetros:
+    - unidad (dict): Unidad escrita por particionar_barrido.
+    - modelosBase (dict, opcional): Modelos base ya construidos, indexados por (n, params); se
+      reutilizan entre unidades del mismo trabajador.
+
+    Retorna:
+    - dict: Registros (ver utils.sweep.registro_solucion) indexados por "nodos_{n}_{topologia}".
+    """
+    params = _params_desde_dict(unidad["params"])
+    topologia = unidad["topologia"]
+    requiredReliabilities = _objetivos_unidad(unidad)
+
+    if _usa_dp(topologia, unidad["motor"]):
+        registrosPorN = calcular_registros_dp(unidad["nodos"], topologia, requiredReliabilities, params)
+        return {f"nodos_{n}_{topologia}": registros for n, registros in registrosPorN.items()}
+
+    if modelosBase is None:
+        modelosBase = {}
+    resultado = {}
+    for n in unidad["nodos"]:
+        if (n, params) not in modelosBase:
+            modelosBase[n, params] = construir_modelo_base(n, params)
+        resultado[f"nodos_{n}_{topologia}"] = calcular_registros_topologia(
+            n, topologia, requiredReliabilities, modelosBase[n, params], params, unidad.get("parametros_solver"))
+    return resultado
+
+
+def trabajar(directorio, esperar=False, vencimientoS=None, maxUnidades=None, trabajador=None):
+    """
+    Bucle de un trabajador: reclama unidades, las resuelve y escribe sus resultados hasta vaciar la cola.
+
+    Parámetros:
+    - directorio (str): Directorio de la cola.
+    - esperar (bool): Seguir sondeando mientras haya unidades en curso de otros trabajadores (que
+      podrían reencolarse) en lugar de terminar al no encontrar pendientes.
+    - vencimientoS (float, opcional): Reencolar antes de cada reclamo las unidades en curso más
+      antiguas que esto (ver reencolar_vencidas).
+    - maxUnidades (int, opcional): Terminar tras resolver este número de unidades.
+    - trabajador (str, opcional): Nombre del trabajador en los resultados (por defecto host:pid).
+
+    Retorna:
+    - Tuple[int, int]: Unidades resueltas y unidades fallidas por este trabajador.
+    """
+    crear_cola(directorio)
+    if trabajador is None:
+        trabajador = f"{socket.gethostname()}:{os.getpid()}"
+    modelosBase = {}
+    resueltas = fallidas = 0
+
+    while maxUnidades is None or resueltas + fallidas < maxUnidades:
+        if vencimientoS is not None:
+            reencolar_vencidas(directorio, vencimientoS)
+        reclamo = reclamar_unidad(directorio)
+        if reclamo is None:
+            if esperar and os.listdir(os.path.join(directorio, "en_curso")):
+                time.sleep(ESPERA_SONDEO_S)
+                continue
+            break
+
+        unidad, rutaReclamo = reclamo
+        nombre = f"{unidad['id']}.json"
+        inicio = time.perf_counter()
+        try:
+            registros = resolver_unidad(unidad, modelosBase)
+        except Exception:
+            _escribir_json(os.path.join(directorio, "fallidas", nombre),
+                           {"unidad": unidad, "trabajador": trabajador, "error": traceback.format_exc()})
+            fallidas += 1
+            print(f"[{trabajador}] Unidad {unidad['id']} fallida", flush=True)
+        else:
+            _escribir_json(os.path.join(directorio, "resultados", nombre), {
+                "unidad": unidad,
+                "trabajador": trabajador,
+                "tiempo_s": time.perf_counter() - inicio,
+                "registros": registros,
+            })
+            resueltas += 1
+            print(f"[{trabajador}] Unidad {unidad['id']} resuelta en {time.perf_counter() - inicio:.2f} s", flush=True)
+        finally:
+            try:
+                os.remove(rutaReclamo)  # Solo el archivo de este reclamo, nunca el de otro trabajador
+            except FileNotFoundError:
+                pass  # Reencolada por vencimiento mientras se resolvía
+
+    return resueltas, fallidas
+
+
+def estado_cola(directorio, escenario=None):
+    """
+    Cuenta las unidades de la cola por estado.
+
+    Parámetros:
+    - directorio (str): Directorio de la cola.
+    - escenario (str, opcional): Contar solo las unidades de este escenario.
+
+    Retorna:
+    - dict: Número de unidades pendientes, en curso, con resultado y fallidas.
+    """
+    estado = {}
+    for nombre in ("pendientes", "en_curso", "resultados", "fallidas"):
+        archivos = [archivo for archivo in os.listdir(os.path.join(directorio, nombre)) if archivo.endswith(".json")]
+        if escenario is not None:
+            archivos = [archivo for archivo in archivos if archivo.split("-")[1] == escenario]
+        estado[nombre] = len(archivos)
+    return estado
+
+
+def unir_resultados(directorio, escenario="base"):
+    """
+    Reconstruye los registros del barrido de un escenario a partir de los resultados de sus unidades.
+
+    Parámetros:
+    - directorio (str): Directorio de la cola.
+    - escenario (str): Escenario a unir.
+
+    Retorna:
+    - Tuple[dict, ModelParams]: Manifiesto del barrido (nodos, topologías, confiabilidades, ...) con
+      los registros indexados por "nodos_{n}_{topologia}" en la clave "registros" (mismo formato y
+      orden que utils.sweep.calcular_registros_barrido), y los parámetros del escenario.
+
+    Excepciones:
+    - RuntimeError: Si hay unidades sin resultado (pendientes, en curso o fallidas).
+    """
+    manifiesto = _leer_json(os.path.join(directorio, "barridos", f"{escenario}.json"))
+    carpeta = os.path.join(directorio, "resultados")
+
+    faltantes = [unidad for unidad in manifiesto["unidades"]
+                 if not os.path.exists(os.path.join(carpeta, f"{unidad}.json"))]
+    if faltantes:
+        raise RuntimeError(
+            f"El escenario {escenario} tiene {len(faltantes)} de {len(manifiesto['unidades'])} unidades sin "
+            f"resultado ({', '.join(f'{k}={v}' for k, v in estado_cola(directorio, escenario).items())}).")
+
+    # Cada clave junta sus tramos de la grilla, reordenados según el manifiesto
+    posicion = {reqRel: i for i, reqRel in enumerate(manifiesto["confiabilidades"])}
+    registrosPorClave = {}
+    for unidad in manifiesto["unidades"]:
+        for clave, registros in _leer_json(os.path.join(carpeta, f"{unidad}.json"))["registros"].items():
+            registrosPorClave.setdefault(clave, []).extend(registros)
+
+    manifiesto["registros"] = {
+        f"nodos_{n}_{topologia}": sorted(registrosPorClave[f"nodos_{n}_{topologia}"],
+                                         key=lambda registro: posicion[registro["confiabilidad_requerida"]])
+        for n in manifiesto["nodos"] for topologia in manifiesto["topologias"]
+    }
+    return manifiesto, _params_desde_dict(manifiesto["params"])
@@ -0,0 +1,163 @@
+import os
+
+# pyarrow es una dependencia opcional: solo se importa al exportar o leer un dataset.
+
+# Formatos de dataset soportados: Parquet (comprimido) y Arrow IPC (mapeable en memoria sin decodificar)
+FORMATOS_DATASET = {
+    "parquet": "parquet",
+    "arrow": "ipc",
+}
+
+# Columnas de partición del dataset (directorios topologia=.../n=...)
+COLUMNAS_PARTICION = ["topologia", "n"]
+
+
+def _importar_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+    except ImportError as e:
+        raise ImportError(
+            "La exportación columnar requiere pyarrow. Instálelo con: pip install pyarrow") from e
+    return pa, ds
+
+
+def _esquema(pa):
+    return pa.schema([
+        ("ejecucion", pa.string()),
+        ("topologia", pa.string()),
+        ("n", pa.int32()),
+        ("confiabilidad_requerida", pa.float64()),
+        ("costo", pa.float64()),
+        ("costo_nodos", pa.float64()),
+        ("costo_enlaces", pa.float64()),
+        ("nodos_por_tipo", pa.list_(pa.int32())),
+        ("nodos_por_subred", pa.list_(pa.int32())),
+        ("estado", pa.int32()),
+        ("tiempo_s", pa.float64()),
+        ("nodos_bnb", pa.float64()),
+        ("iteraciones", pa.float64()),
+        ("costo_enlace", pa.float64()),
+        ("costos_por_tipo", pa.list_(pa.float64())),
+        ("confiabilidades_por_tipo", pa.list_(pa.float64())),
+        ("confiabilidad_enlace", pa.float64()),
+    ])
+
+
+def exportar_dataset(registrosPorClave, directorio, params, formato="parquet", ejecucion=None):
+    """
+    Escribe los registros de un barrido como dataset columnar particionado por topología y n.
+
+    Cada llamada agrega archivos nuevos (uno por partición) identificados por `ejecucion`,
+    por lo que varios barridos pueden acumularse en el mismo directorio.
+
+    Parámetros:
+    - registrosPorClave (dict): Resultado de calcular_registros_barrido.
+    - directorio (str): Directorio raíz del dataset.
+    - params (ModelParams): Parámetros del escenario (se guardan en cada fila).
+    - formato (str): "parquet" o "arrow".
+    - ejecucion (str, opcional): Identificador del barrido (por defecto un identificador aleatorio).
+
+    Retorna:
+    - str: Identificador de la ejecución escrita.
+    """
+    if formato not in FORMATOS_DATASET:
+        raise ValueError(
+            f"Formato desconocido: {formato}. Opciones: {', '.join(FORMATOS_DATASET)}")
+    pa, ds = _importar_pyarrow()
+
+    if ejecucion is None:
+        ejecucion = os.urandom(6).hex()
+
+    esquema = _esquema(pa)
+    columnas = {campo: [] for campo in esquema.names}
+    for registros in registrosPorClave.values():
+        for registro in registros:
+            for campo in esquema.names:
+                if campo in registro:
+                    columnas[campo].append(registro[campo])
+            columnas["ejecucion"].append(ejecucion)
+            columnas["costo_enlace"].append(params.linkCost)
+            columnas["costos_por_tipo"].append(list(params.costByNodeType))
+            columnas["confiabilidades_por_tipo"].append(list(params.reliabilityByNodeType))
+            columnas["confiabilidad_enlace"].append(params.linkReliability)
+
+    tabla = pa.Table.from_pydict(columnas, schema=esquema)
+
+    os.makedirs(directorio, exist_ok=True)
+    ds.write_dataset(
+        tabla, directorio,
+        format=FORMATOS_DATASET[formato],
+        partitioning=COLUMNAS_PARTICION,
+        partitioning_flavor="hive",
+        basename_template=f"{ejecucion}-{{i}}.{formato}",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+    return ejecucion
+
+
+def leer_dataset(directorio, formato="parquet"):
+    """
+    Abre un dataset exportado con exportar_dataset sin cargarlo en memoria.
+
+    Los archivos se leen con memory map; las lecturas posteriores pueden proyectar columnas
+    y filtrar particiones para no materializar el dataset completo, por ejemplo:
+
+    >>> import pyarrow.dataset as ds
+    >>> datos = leer_dataset("resultados/dataset")
+    >>> datos.to_table(columns=["confiabilidad_requerida", "costo"],
+    ...                filter=(ds.field("topologia") == "hibrido") & (ds.field("n") == 11))
+
+    Parámetros:
+    - directorio (str): Directorio raíz del dataset.
+    - formato (str): "parquet" o "arrow".
+
+    Retorna:
+    - pyarrow.dataset.Dataset: Dataset particionado por topología y n.
+    """
+    if formato not in FORMATOS_DATASET:
+        raise ValueError(
+            f"Formato desconocido: {formato}. Opciones: {', '.join(FORMATOS_DATASET)}")
+    pa, ds = _importar_pyarrow()
+    from pyarrow import fs
+
+    return ds.dataset(
+        directorio,
+        format=FORMATOS_DATASET[formato],
+        partitioning="hive",
+        schema=_esquema(pa),
+        filesystem=fs.LocalFileSystem(use_mmap=True),
+    )
+
+
+def resultados_desde_dataset(directorio, formato="parquet", ejecucion=None):
+    """
+    Reconstruye la estructura de resultados de un barrido (nodos_{n}_{topologia}) desde un dataset.
+
+    Parámetros:
+    - directorio (str): Directorio raíz del dataset.
+    - formato (str): "parquet" o "arrow".
+    - ejecucion (str, opcional): Ejecución a cargar; por defecto todas (deben compartir la grilla).
+
+    Retorna:
+    - Tuple[list[int], list[str], list[float], dict]: nodos, topologías, confiabilidades y resultados.
+    """
+    _, ds = _importar_pyarrow()
+    filtro = ds.field("ejecucion") == ejecucion if ejecucion is not None else None
+    tabla = leer_dataset(directorio, formato).to_table(
+        columns=["topologia", "n", "confiabilidad_requerida", "costo"], filter=filtro)
+
+    columnas = tabla.to_pydict()
+    totalNodes = sorted(set(columnas["n"]))
+    topologias = [t for t in ("serie", "paralelo", "hibrido") if t in set(columnas["topologia"])]
+    requiredReliabilities = sorted(set(columnas["confiabilidad_requerida"]))
+    posicion = {reqRel: i for i, reqRel in enumerate(requiredReliabilities)}
+
+    minimizedCosts = {
+        f"nodos_{n}_{topologia}": [None] * len(requiredReliabilities)
+        for n in totalNodes for topologia in topologias
+    }
+    for topologia, n, reqRel, costo in zip(columnas["topologia"], columnas["n"],
+                                           columnas["confiabilidad_requerida"], columnas["costo"]):
+        minimizedCosts[f"nodos_{n}_{topologia}"][posicion[reqRel]] = costo
+    return totalNodes, topologias, requiredReliabilities, minimizedCosts
@@ -0,0 +1,421 @@
+# ============================================================
+# Servicio local de resolución (asyncio): lotes, fronteras precalculadas y caché
+# ============================================================
+import asyncio
+import itertools
+import json
+import time
+from collections import OrderedDict, Counter
+
+from Modelos.frontera_dp import TOPOLOGIAS_DP
+from Modelos.objetivo import ConfiabilidadRequerida, desde_nueves, desde_log_inconfiabilidad
+from utils.sweep import TOPOLOGIAS, construir_modelo_base, calcular_registros_topologia, registro_dp, registro_escalon
+from config import DEFAULT_PARAMS, HOST_SERVICIO, PUERTO_SERVICIO, VENTANA_LOTE_S, TAMANO_CACHE_SERVICIO
+
+# Origen de cada respuesta (ver ServicioResolucion.resolver)
+ORIGENES = ("frontera_dp", "frontera_hibrido", "cache", "solver")
+
+# Modelos base de cada proceso del pool, indexados por (n, params)
+_modelosBase = {}
+
+
+def _modelo_base(totalNodes, params):
+    clave = (totalNodes, params)
+    if clave not in _modelosBase:
+        _modelosBase[clave] = construir_modelo_base(totalNodes, params)
+    return _modelosBase[clave]
+
+
+def _calentar():
+    """
+    Importa gurobipy y crea el entorno del proceso para que la primera consulta no pague ese costo.
+    """
+    from Modelos.entorno_gurobi import obtener_entorno
+    obtener_entorno()
+
+
+def _resolver_lote(totalNodes, topologia, requiredReliabilities, params):
+    """
+    Unidad de trabajo del pool: resuelve un lote de confiabilidades de la misma (topología, n)
+    reutilizando el modelo base del proceso.
+    """
+    return calcular_registros_topologia(
+        totalNodes, topologia, requiredReliabilities, _modelo_base(totalNodes, params), params)
+
+
+def _calcular_frontera_hibrido(totalNodes, confiabilidadInicial, params):
+    """
+    Unidad de trabajo del pool: frontera escalonada del híbrido (ver Modelos.frontera_hibrido).
+    """
+    from Modelos.frontera_hibrido import frontera_hibrido
+    return frontera_hibrido(_modelo_base(totalNodes, params), totalNodes, confiabilidadInicial, params=params)
+
+
+def clave_objetivo(requiredReliability):
+    """
+    Clave de caché, consultas en vuelo y lotes de una confiabilidad requerida.
+
+    Objetivos de alta confiabilidad distintos (ConfiabilidadRequerida de Modelos.objetivo) pueden
+    redondear al mismo float: se distinguen por su log-inconfiabilidad.
+    """
+    if isinstance(requiredReliability, ConfiabilidadRequerida):
+        return ("log_inconfiabilidad", requiredReliability.logInconfiabilidad)
+    return requiredReliability
+
+
+def validar_consulta(topologia, totalNodes, requiredReliability):
+    """
+    Valida una consulta antes de encolarla; lanza ValueError si no es válida.
+    """
+    if topologia not in TOPOLOGIAS:
+        raise ValueError(f"Topología desconocida: {topologia}. Opciones: {', '.join(TOPOLOGIAS)}")
+    if not isinstance(totalNodes, int) or totalNodes < 4:
+        raise ValueError(f"El número de nodos debe ser un entero mayor o igual a 4. Se recibió: {totalNodes}")
+    if not 0 < requiredReliability < 1:
+        raise ValueError(f"La confiabilidad requerida debe estar en (0, 1). Se recibió: {requiredReliability}")
+
+
+class ServicioResolucion:
+    """
+    Servicio asíncrono de consultas (topología, n, confiabilidad) sobre los modelos.
+
+    Cada consulta se responde con la primera fuente disponible:
+    1. Serie y paralelo (motor "dp"): frontera exacta de Modelos.frontera_dp, que se extiende bajo
+       demanda hasta el mayor n consultado; no usa el solver.
+    2. Híbrido: frontera precalculada con precalcular_hibrido, si cubre la confiabilidad.
+    3. Caché LRU de respuestas anteriores del solver.
+    4. Solver en un pool de procesos. Las consultas de la misma (topología, n) que llegan dentro
+       de `ventanaLote` se despachan como un único lote (un modelo base por proceso, reutilizado
+       entre lotes) y las consultas repetidas en vuelo comparten el mismo resultado.
+
+    Uso:
+    >>> async with ServicioResolucion(workers=2) as servicio:
+    ...     respuesta = await servicio.resolver("hibrido", 8, 0.99)
+    """
+
+    def __init__(self, params=None, workers=1, tamanoCache=TAMANO_CACHE_SERVICIO, ventanaLote=VENTANA_LOTE_S, motor="dp"):
+        """
+        Parámetros:
+        - params (ModelParams, opcional): Parámetros del escenario (por defecto DEFAULT_PARAMS).
+        - workers (int): Procesos del pool del solver.
+        - tamanoCache (int): Respuestas del solver guardadas en la caché LRU.
+        - ventanaLote (float): Segundos de espera para agrupar consultas de la misma (topología, n).
+        - motor (str): "dp" responde serie y paralelo desde sus fronteras; "gurobi" usa siempre el solver.
+        """
+        self.params = params if params is not None else DEFAULT_PARAMS
+        self.workers = max(1, workers)
+        self.tamanoCache = tamanoCache
+        self.ventanaLote = ventanaLote
+        self.motor = motor
+
+        self._pool = None
+        self._cache = OrderedDict()
+        self._fronterasDp = {}  # topología -> {n: frontera}
+        self._candadosDp = {}
+        self._fronterasHibrido = {}  # n -> escalones
+        self._lotes = {}  # (topología, n) -> {confiabilidad: futuro}
+        self._enVuelo = {}  # (topología, n, confiabilidad) -> futuro
+        self._tareas = set()
+        self._contadores = Counter()
+
+    async def __aenter__(self):
+        await self.iniciar()
+        return self
+
+    async def __aexit__(self, *excepcion):
+        await self.cerrar()
+
+    async def iniciar(self):
+        """
+        Crea el pool de procesos y carga gurobipy en cada uno.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._pool, _calentar) for _ in range(self.workers)))
+
+    async def cerrar(self):
+        """
+        Espera los lotes en curso y libera el pool.
+        """
+        if self._tareas:
+            await asyncio.gather(*self._tareas, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    # -------------------- Consultas --------------------
+
+    async def resolver(self, topologia, totalNodes, requiredReliability):
+        """
+        Resuelve una consulta.
+
+        Parámetros:
+        - topologia (str): "serie", "paralelo" o "hibrido".
+        - totalNodes (int): Número de nodos.
+        - requiredReliability (float): Confiabilidad requerida (0 < valor < 1); una ConfiabilidadRequerida
+          (ver Modelos.objetivo) llega a los modelos con su log-inconfiabilidad exacta.
+
+        Retorna:
+        - dict: {"origen": uno de ORIGENES, "registro": registro en el formato de registro_solucion}.
+        """
+        validar_consulta(topologia, totalNodes, requiredReliability)
+        self._contadores["consultas"] += 1
+
+        if self.motor == "dp" and topologia in TOPOLOGIAS_DP:
+            registro = await self._desde_frontera_dp(topologia, totalNodes, requiredReliability)
+            return self._respuesta("frontera_dp", registro)
+
+        if topologia == "hibrido" and totalNodes in self._fronterasHibrido:
+            registro = self._desde_frontera_hibrido(totalNodes, requiredReliability)
+            if registro is not None:
+                return self._respuesta("frontera_hibrido", registro)
+
+        clave = (topologia, totalNodes, clave_objetivo(requiredReliability))
+        if clave in self._cache:
+            self._cache.move_to_end(clave)
+            return self._respuesta("cache", self._cache[clave])
+
+        return self._respuesta("solver", await self._encolar(clave, requiredReliability))
+
+    async def precalcular_hibrido(self, totalNodes, confiabilidadInicial=0.5):
+        """
+        Calcula en el pool la frontera del híbrido para `totalNodes`; desde entonces las consultas
+        con confiabilidad en su rango se responden sin resolver.
+
+        Retorna:
+        - int: Número de escalones de la frontera.
+        """
+        loop = asyncio.get_running_loop()
+        pasos = await loop.run_in_executor(
+            self._pool, _calcular_frontera_hibrido, totalNodes, confiabilidadInicial, self.params)
+        self._fronterasHibrido[totalNodes] = pasos
+        return len(pasos)
+
+    def estadisticas(self):
+        """
+        Contadores del servicio: consultas, respuestas por origen, lotes despachados, resoluciones
+        del solver y consultas que compartieron una resolución en vuelo.
+        """
+        return {
+            **{clave: self._contadores[clave] for clave in ("consultas", *ORIGENES, "lotes", "resoluciones", "coalescidas")},
+            "cache_tamano": len(self._cache),
+            "fronteras_dp": {topologia: max(fronteras, default=0) for topologia, fronteras in self._fronterasDp.items()},
+            "fronteras_hibrido": sorted(self._fronterasHibrido),
+        }
+
+    def _respuesta(self, origen, registro):
+        self._contadores[origen] += 1
+        return {"origen": origen, "registro": registro}
+
+    # -------------------- Fronteras --------------------
+
+    async def _desde_frontera_dp(self, topologia, totalNodes, requiredReliability):
+        from Modelos.frontera_dp import costos_minimos
+
+        fronteras = self._fronterasDp.setdefault(topologia, {})
+        if totalNodes not in fronteras:
+            # Una sola extensión a la vez por topología; las consultas concurrentes la esperan
+            async with self._candadosDp.setdefault(topologia, asyncio.Lock()):
+                if totalNodes not in fronteras:
+                    await asyncio.to_thread(self._extender_frontera_dp, topologia, totalNodes)
+
+        inicio = time.perf_counter()
+        solucion, = costos_minimos(fronteras[totalNodes], topologia, totalNodes, [requiredReliability], self.params)
+        return registro_dp(topologia, totalNodes, requiredReliability, solucion, time.perf_counter() - inicio, self.params)
+
+    def _extender_frontera_dp(self, topologia, totalNodes):
+        from Modelos.frontera_dp import iterar_fronteras
+
+        fronteras = self._fronterasDp[topologia]
+        ultimo = max(fronteras, default=None)
+        inicial = (ultimo, fronteras[ultimo]) if ultimo is not None else None
+        for n, frontera in iterar_fronteras(topologia, totalNodes, self.params, inicial):
+            fronteras[n] = frontera
+
+    def _desde_frontera_hibrido(self, totalNodes, requiredReliability):
+        from Modelos.frontera_hibrido import costos_en_grilla
+
+        paso, = costos_en_grilla(self._fronterasHibrido[totalNodes], [requiredReliability])
+        return None if paso is None else registro_escalon(totalNodes, requiredReliability, paso, self.params)
+
+    # -------------------- Lotes del solver --------------------
+
+    async def _encolar(self, clave, requiredReliability):
+        futuro = self._enVuelo.get(clave)
+        if futuro is not None:
+            self._contadores["coalescidas"] += 1
+        else:
+            topologia, totalNodes, claveObjetivo = clave
+            claveLote = (topologia, totalNodes)
+            lote = self._lotes.get(claveLote)
+            if lote is None:
+                lote = self._lotes[claveLote] = {}
+                asyncio.get_running_loop().call_later(self.ventanaLote, self._despachar, claveLote)
+            futuro = self._enVuelo[clave] = asyncio.get_running_loop().create_future()
+            lote[claveObjetivo] = (requiredReliability, futuro)
+        # shield: si una consulta se cancela, el resultado sigue disponible para las demás
+        return await asyncio.shield(futuro)
+
+    def _despachar(self, claveLote):
+        lote = self._lotes.pop(claveLote)
+        tarea = asyncio.ensure_future(self._ejecutar_lote(claveLote, lote))
+        self._tareas.add(tarea)
+        tarea.add_done_callback(self._tareas.discard)
+
+    async def _ejecutar_lote(self, claveLote, lote):
+        topologia, totalNodes = claveLote
+        confiabilidades = [reqRel for reqRel, _ in lote.values()]
+        self._contadores["lotes"] += 1
+        self._contadores["resoluciones"] += len(confiabilidades)
+        try:
+            registros = await asyncio.get_running_loop().run_in_executor(
+                self._pool, _resolver_lote, totalNodes, topologia, confiabilidades, self.params)
+        except Exception as e:
+            for _, futuro in lote.values():
+                futuro.set_exception(e)
+        else:
+            for (claveObjetivo, (_, futuro)), registro in zip(lote.items(), registros):
+                self._guardar_cache((topologia, totalNodes, claveObjetivo), registro)
+                futuro.set_result(registro)
+        finally:
+            for claveObjetivo in lote:
+                self._enVuelo.pop((topologia, totalNodes, claveObjetivo), None)
+
+    def _guardar_cache(self, clave, registro):
+        self._cache[clave] = registro
+        self._cache.move_to_end(clave)
+        while len(self._cache) > self.tamanoCache:
+            self._cache.popitem(last=False)
+
+
+# ============================================================
+# Socket local: una consulta JSON por línea
+# ============================================================
+# Consulta: {"id": ..., "topologia": ..., "nodos": ..., "confiabilidad": ...}, con "nueves" o
+#           "log_inconfiabilidad" (log natural de 1 - R) en lugar de "confiabilidad" para objetivos de
+#           alta confiabilidad; o {"id": ..., "operacion": "estadisticas"}
+# Respuesta: {"id": ..., "ok": true, "origen": ..., "registro": {...}, "latencia_ms": ...}
+#            o {"id": ..., "ok": false, "error": "..."}
+# Las respuestas de una misma conexión pueden llegar en otro orden que las consultas (usar "id").
+
+
+def objetivo_consulta(consulta):
+    """
+    Confiabilidad requerida de una consulta, dada por "confiabilidad", "nueves" o "log_inconfiabilidad".
+    """
+    claves = [clave for clave in ("confiabilidad", "nueves", "log_inconfiabilidad") if clave in consulta]
+    if len(claves) != 1:
+        raise ValueError("La consulta debe indicar exactamente uno de: confiabilidad, nueves, log_inconfiabilidad.")
+    if claves[0] == "nueves":
+        return desde_nueves(float(consulta["nueves"]))
+    if claves[0] == "log_inconfiabilidad":
+        return desde_log_inconfiabilidad(float(consulta["log_inconfiabilidad"]))
+    return float(consulta["confiabilidad"])
+
+
+async def _atender_consulta(servicio, consulta):
+    inicio = time.perf_counter()
+    if consulta.get("operacion") == "estadisticas":
+        respuesta = {"estadisticas": servicio.estadisticas()}
+    else:
+        respuesta = await servicio.resolver(consulta["topologia"], consulta["nodos"], objetivo_consulta(consulta))
+    return {"id": consulta.get("id"), "ok": True, **respuesta, "latencia_ms": (time.perf_counter() - inicio) * 1000}
+
+
+async def servir(servicio, host=HOST_SERVICIO, puerto=PUERTO_SERVICIO, alIniciar=None):
+    """
+    Atiende consultas por un socket TCP local hasta que se cancela la tarea.
+
+    Parámetros:
+    - servicio (ServicioResolucion): Servicio ya iniciado.
+    - host (str): Interfaz donde escuchar (por defecto solo la local).
+    - puerto (int): Puerto TCP (0 elige uno libre).
+    - alIniciar (callable, opcional): Se llama con el puerto efectivo cuando el socket está listo.
+    """
+    async def atender(lector, escritor):
+        pendientes = set()
+
+        async def responder(linea):
+            consulta = {}
+            try:
+                consulta = json.loads(linea)
+                respuesta = await _atender_consulta(servicio, consulta)
+            except Exception as e:
+                respuesta = {"id": consulta.get("id") if isinstance(consulta, dict) else None,
+                             "ok": False, "error": f"{type(e).__name__}: {e}"}
+            escritor.write((json.dumps(respuesta) + "\n").encode())
+            await escritor.drain()
+
+        try:
+            while linea := await lector.readline():
+                tarea = asyncio.ensure_future(responder(linea))
+                pendientes.add(tarea)
+                tarea.add_done_callback(pendientes.discard)
+            await asyncio.gather(*pendientes, return_exceptions=True)
+        finally:
+            escritor.close()
+
+    servidor = await asyncio.start_server(atender, host, puerto)
+    if alIniciar is not None:
+        alIniciar(servidor.sockets[0].getsockname()[1])
+    async with servidor:
+        await servidor.serve_forever()
+
+
+class ClienteServicio:
+    """
+    Cliente del socket local: envía consultas concurrentes por una sola conexión y empareja las
+    respuestas por id.
+
+    >>> async with ClienteServicio(puerto=8765) as cliente:
+    ...     respuesta = await cliente.consultar("serie", 10, 0.99)
+    """
+
+    def __init__(self, host=HOST_SERVICIO, puerto=PUERTO_SERVICIO):
+        self.host = host
+        self.puerto = puerto
+        self._ids = itertools.count()
+        self._esperando = {}
+
+    async def __aenter__(self):
+        self._lector, self._escritor = await asyncio.open_connection(self.host, self.puerto)
+        self._receptor = asyncio.ensure_future(self._recibir())
+        return self
+
+    async def __aexit__(self, *excepcion):
+        self._escritor.close()
+        self._receptor.cancel()
+        await asyncio.gather(self._receptor, return_exceptions=True)
+
+    async def _recibir(self):
+        while linea := await self._lector.readline():
+            respuesta = json.loads(linea)
+            futuro = self._esperando.pop(respuesta.get("id"), None)
+            if futuro is not None and not futuro.done():
+                futuro.set_result(respuesta)
+        for futuro in self._esperando.values():
+            futuro.set_exception(ConnectionError("El servicio cerró la conexión."))
+
+    async def _enviar(self, consulta):
+        consulta["id"] = next(self._ids)
+        futuro = self._esperando[consulta["id"]] = asyncio.get_running_loop().create_future()
+        self._escritor.write((json.dumps(consulta) + "\n").encode())
+        await self._escritor.drain()
+        return await futuro
+
+    async def consultar(self, topologia, totalNodes, requiredReliability):
+        """
+        Retorna la respuesta del servicio (ver el protocolo arriba) a una consulta; una
+        ConfiabilidadRequerida se envía como log-inconfiabilidad para no perder precisión.
+        """
+        consulta = {"topologia": topologia, "nodos": totalNodes}
+        if isinstance(requiredReliability, ConfiabilidadRequerida):
+            consulta["log_inconfiabilidad"] = requiredReliability.logInconfiabilidad
+        else:
+            consulta["confiabilidad"] = requiredReliability
+        return await self._enviar(consulta)
+
+    async def estadisticas(self):
+        return (await self._enviar({"operacion": "estadisticas"}))["estadisticas"]
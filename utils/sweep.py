@@ -0,0 +1,506 @@
+import hashlib
+import importlib
+import json
+import os
+
+from utils.utils import generate_equidistant_list, indice_variable
+from config import DEFAULT_PARAMS
+
+# Modelos por topología, indexados con la clave usada en los resultados (nodos_{n}_{topologia}).
+# Se guardan como (módulo, función) y se importan al primer uso: gurobipy solo se carga
+# cuando realmente hay que resolver.
+TOPOLOGIAS = {
+    "serie": ("Modelos.serie_model", "serie_model"),
+    "paralelo": ("Modelos.parallel_model", "parallel_model"),
+    "hibrido": ("Modelos.hybrid_model", "hybrid_model"),
+}
+
+# Tipos de grilla de confiabilidades requeridas
+TIPOS_GRILLA = ("lineal", "nueves")
+
+# Motores de resolución: "gurobi" resuelve cada punto con su modelo; "dp" calcula las fronteras
+# de serie y paralelo para todos los n en una pasada (Modelos.frontera_dp) y usa Gurobi para el resto
+MOTORES = ("gurobi", "dp")
+
+# Códigos de estado de Gurobi para los registros del motor DP (sin importar gurobipy)
+ESTADO_OPTIMO = 2  # GRB.OPTIMAL
+ESTADO_INFACTIBLE = 3  # GRB.INFEASIBLE
+
+
+def obtener_modelo(topologia):
+    """
+    Importa y retorna la función de modelo de una topología.
+
+    Parámetros:
+    - topologia (str): Clave de la topología ("serie", "paralelo", "hibrido").
+
+    Retorna:
+    - callable: Función (baseModel, totalNodes, requiredReliability) -> (costo, variables, modelo).
+    """
+    if topologia not in TOPOLOGIAS:
+        raise ValueError(
+            f"Topología desconocida: {topologia}. Opciones: {', '.join(TOPOLOGIAS)}")
+    modulo, funcion = TOPOLOGIAS[topologia]
+    return getattr(importlib.import_module(modulo), funcion)
+
+
+def construir_modelo_base(totalNodes, params=None):
+    """
+    Construye el modelo base importando gurobipy bajo demanda.
+    """
+    from Modelos.base_model import base_model
+    return base_model(totalNodes, params)
+
+
+def generar_confiabilidades(tipoGrilla, inicio, fin, cantidad):
+    """
+    Genera la grilla de confiabilidades requeridas compartida por todas las topologías.
+
+    Parámetros:
+    - tipoGrilla (str): Tipo de grilla: "lineal" en confiabilidad o "nueves", equiespaciada en
+      número de nueves (ver Modelos.objetivo.grilla_nueves).
+    - inicio (float): Confiabilidad inicial (excluida) o, con "nueves", nueves del primer punto (incluido).
+    - fin (float): Confiabilidad final (excluida) o, con "nueves", nueves del último punto (incluido).
+    - cantidad (int): Número de puntos de la grilla.
+
+    Retorna:
+    - list[float]: Confiabilidades requeridas en orden creciente (ConfiabilidadRequerida con "nueves").
+    """
+    if tipoGrilla == "lineal":
+        return generate_equidistant_list(inicio, fin, cantidad)
+    if tipoGrilla == "nueves":
+        from Modelos.objetivo import grilla_nueves
+        return grilla_nueves(inicio, fin, cantidad)
+    raise ValueError(
+        f"Tipo de grilla desconocido: {tipoGrilla}. Opciones: {', '.join(TIPOS_GRILLA)}")
+
+
+def _resumen_variables(decisionVariables, numTipos):
+    """
+    Nodos por tipo y por subred de una solución (listas vacías/en cero si no hay solución).
+    """
+    nodosPorTipo = [0] * numTipos
+    nodosPorSubred = []
+    if decisionVariables is not None:
+        for var, val in decisionVariables.items():
+            if var.startswith("x[") and round(val) == 1:
+                _, tipo = indice_variable(var)[1]
+                nodosPorTipo[tipo] += 1
+            elif var.startswith("nodesBySubnet["):
+                nodosPorSubred.append(int(round(val)))
+    return nodosPorTipo, nodosPorSubred
+
+
+def registro_solucion(topologia, totalNodes, requiredReliability, minCost, decisionVariables, model, params):
+    """
+    Resume una solución en un registro plano (una fila por resolución).
+
+    Parámetros:
+    - topologia (str): Clave de la topología.
+    - totalNodes (int): Número de nodos.
+    - requiredReliability (float): Confiabilidad requerida.
+    - minCost (float | None): Costo mínimo retornado por el modelo.
+    - decisionVariables (dict | None): Variables de decisión retornadas por el modelo.
+    - model (gurobipy.Model): Modelo optimizado (para las estadísticas del solver).
+    - params (ModelParams): Parámetros del escenario.
+
+    Retorna:
+    - dict: Costo, nodos por tipo, nodos por subred y estadísticas del solver.
+    """
+    nodosPorTipo, nodosPorSubred = _resumen_variables(decisionVariables, len(params.costByNodeType))
+
+    return {
+        "topologia": topologia,
+        "n": totalNodes,
+        "confiabilidad_requerida": requiredReliability,
+        "costo": minCost,
+        "costo_nodos": decisionVariables.get("nodesCost") if decisionVariables else None,
+        "costo_enlaces": decisionVariables.get("linksCost") if decisionVariables else None,
+        "nodos_por_tipo": nodosPorTipo,
+        "nodos_por_subred": nodosPorSubred,
+        "estado": model.Status,
+        "tiempo_s": model.Runtime,
+        "nodos_bnb": model.NodeCount,
+        "iteraciones": model.IterCount,
+    }
+
+
+def registro_dp(topologia, totalNodes, requiredReliability, solucion, tiempo, params):
+    """
+    Registro en el formato de registro_solucion para una solución del motor DP.
+
+    Parámetros:
+    - solucion (tuple): (costo de nodos, costo de enlaces, conteo por tipo) de costos_minimos.
+    - tiempo (float): Tiempo atribuido a la resolución; nodos_bnb e iteraciones son 0.
+    """
+    costoNodos, costoEnlaces, conteo = solucion
+    return {
+        "topologia": topologia,
+        "n": totalNodes,
+        "confiabilidad_requerida": requiredReliability,
+        "costo": None if costoNodos is None else costoNodos + costoEnlaces,
+        "costo_nodos": costoNodos,
+        "costo_enlaces": costoEnlaces,
+        "nodos_por_tipo": list(conteo) if conteo else [0] * len(params.costByNodeType),
+        "nodos_por_subred": [],
+        "estado": ESTADO_INFACTIBLE if costoNodos is None else ESTADO_OPTIMO,
+        "tiempo_s": tiempo,
+        "nodos_bnb": 0,
+        "iteraciones": 0,
+    }
+
+
+def registro_escalon(totalNodes, requiredReliability, paso, params):
+    """
+    Registro en el formato de registro_solucion a partir de un escalón de frontera_hibrido.
+    """
+    variables = paso["variables"]
+    nodosPorTipo, nodosPorSubred = _resumen_variables(variables, len(params.costByNodeType))
+    return {
+        "topologia": "hibrido",
+        "n": totalNodes,
+        "confiabilidad_requerida": requiredReliability,
+        "costo": paso["costo"],
+        "costo_nodos": variables.get("nodesCost"),
+        "costo_enlaces": variables.get("linksCost"),
+        "nodos_por_tipo": nodosPorTipo,
+        "nodos_por_subred": nodosPorSubred,
+        "estado": paso["estado"],
+        "tiempo_s": paso["tiempo_s"],
+        "nodos_bnb": paso["nodos_bnb"],
+        "iteraciones": paso["iteraciones"],
+    }
+
+
+def calcular_registros_dp(totalNodes, topologia, requiredReliabilities, params=None):
+    """
+    Registros de serie o paralelo para varios números de nodos con una sola pasada DP.
+
+    Parámetros:
+    - totalNodes (list[int]): Números de nodos a evaluar.
+    - topologia (str): "serie" o "paralelo".
+    - requiredReliabilities (list[float]): Confiabilidades requeridas.
+    - params (ModelParams, opcional): Parámetros del escenario (por defecto DEFAULT_PARAMS).
+
+    Retorna:
+    - dict: Registros en el formato de registro_solucion indexados por n. El tiempo de la pasada
+      DP de cada n se reparte entre sus confiabilidades; nodos_bnb e iteraciones son 0.
+    """
+    from Modelos.frontera_dp import resolver_multi_n
+
+    if params is None:
+        params = DEFAULT_PARAMS
+
+    registrosPorN = {}
+    for n, (soluciones, tiempo) in resolver_multi_n(topologia, totalNodes, requiredReliabilities, params).items():
+        tiempoPorPunto = tiempo / max(1, len(requiredReliabilities))
+        registrosPorN[n] = [
+            registro_dp(topologia, n, reqRel, solucion, tiempoPorPunto, params)
+            for reqRel, solucion in zip(requiredReliabilities, soluciones)
+        ]
+    return registrosPorN
+
+
+def entorno_parametros(parametrosSolver):
+    """
+    Entorno compartido con los parámetros de un perfil del solver (None si no hay parámetros:
+    los modelos usan el entorno de su modelo base).
+    """
+    if not parametrosSolver:
+        return None
+    from Modelos.entorno_gurobi import obtener_entorno
+    return obtener_entorno(parametrosSolver)
+
+
+def calcular_registros_topologia(totalNodes, topologia, requiredReliabilities, baseModel=None, params=None,
+                                 parametrosSolver=None):
+    """
+    Resuelve una topología para cada confiabilidad requerida y retorna un registro por resolución.
+
+    Parámetros:
+    - totalNodes (int): Número de nodos de la red.
+    - topologia (str): Clave de la topología ("serie", "paralelo", "hibrido").
+    - requiredReliabilities (list[float]): Confiabilidades requeridas.
+    - baseModel (gurobipy.Model, opcional): Modelo base ya construido para `totalNodes` y `params`.
+    - params (ModelParams, opcional): Parámetros del escenario (por defecto DEFAULT_PARAMS).
+    - parametrosSolver (dict, opcional): Parámetros de Gurobi de la topología (ver Modelos.perfiles_solver).
+
+    Retorna:
+    - list[dict]: Registros en el formato de registro_solucion.
+    """
+    modelo = obtener_modelo(topologia)
+    if params is None:
+        params = DEFAULT_PARAMS
+
+    if baseModel is None:
+        baseModel = construir_modelo_base(totalNodes, params)
+    env = entorno_parametros(parametrosSolver)
+
+    registros = []
+    for reqRel in requiredReliabilities:
+        minCost, decisionVariables, model = modelo(baseModel, totalNodes, reqRel, params, env=env)
+        registros.append(registro_solucion(
+            topologia, totalNodes, reqRel, minCost, decisionVariables, model, params))
+        model.dispose()
+    return registros
+
+
+def calcular_costos_topologia(totalNodes, topologia, requiredReliabilities, baseModel=None, params=None):
+    """
+    Calcula los costos minimizados de una topología para cada confiabilidad requerida.
+
+    Parámetros:
+    - totalNodes (int): Número de nodos de la red.
+    - topologia (str): Clave de la topología ("serie", "paralelo", "hibrido").
+    - requiredReliabilities (list[float]): Confiabilidades requeridas.
+    - baseModel (gurobipy.Model, opcional): Modelo base ya construido para `totalNodes` y `params`.
+    - params (ModelParams, opcional): Parámetros del escenario (por defecto DEFAULT_PARAMS).
+
+    Retorna:
+    - list[float | None]: Costo mínimo por confiabilidad (None si no hay solución).
+    """
+    registros = calcular_registros_topologia(totalNodes, topologia, requiredReliabilities, baseModel, params)
+    return [registro["costo"] for registro in registros]
+
+
+def _usa_dp(topologia, motor):
+    """
+    Indica si una topología se resuelve con el motor DP.
+    """
+    from Modelos.frontera_dp import TOPOLOGIAS_DP
+    return motor == "dp" and topologia in TOPOLOGIAS_DP
+
+
+def _clave_cache(totalNodes, topologia, requiredReliabilities, params, motor="gurobi", parametrosSolver=None):
+    """
+    Clave de caché para una combinación (n, topología, grilla, parámetros del escenario, motor y
+    parámetros del solver).
+    """
+    contenido = {
+        "formato": "registros",
+        "n": totalNodes,
+        "topologia": topologia,
+        "confiabilidades": list(requiredReliabilities),
+        "costos": list(params.costByNodeType),
+        "confiabilidadesNodo": list(params.reliabilityByNodeType),
+        "costoEnlace": params.linkCost,
+    }
+    if params.linkReliability != 1:  # Enlaces perfectos: misma clave que antes de modelar sus fallas
+        contenido["confiabilidadEnlace"] = params.linkReliability
+    if _usa_dp(topologia, motor):
+        contenido["motor"] = "dp"
+    elif parametrosSolver:  # Sin perfil: misma clave que antes de los perfiles del solver
+        contenido["solver"] = dict(sorted(parametrosSolver.items()))
+    return hashlib.sha1(json.dumps(contenido).encode()).hexdigest()[:16]
+
+
+def _leer_cache(cacheDir, clave):
+    ruta = os.path.join(cacheDir, f"{clave}.json")
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta) as archivo:
+        return json.load(archivo)
+
+
+def _escribir_cache(cacheDir, clave, registros):
+    os.makedirs(cacheDir, exist_ok=True)
+    ruta = os.path.join(cacheDir, f"{clave}.json")
+    temporal = f"{ruta}.tmp"
+    with open(temporal, "w") as archivo:
+        json.dump(registros, archivo)
+    os.replace(temporal, ruta)
+
+
+def _tarea_topologia(totalNodes, topologia, requiredReliabilities, params, parametrosSolver=None):
+    """
+    Unidad de trabajo para los procesos del pool: cada proceso construye su propio modelo base.
+    """
+    return calcular_registros_topologia(totalNodes, topologia, requiredReliabilities, params=params,
+                                        parametrosSolver=parametrosSolver)
+
+
+def calcular_registros_barrido(totalNodes, requiredReliabilities, topologias=tuple(TOPOLOGIAS),
+                               workers=1, cacheDir=None, params=None, motor="gurobi", perfiles=None):
+    """
+    Resuelve cada número de nodos y topología solicitada y retorna los registros de cada resolución.
+
+    Parámetros:
+    - totalNodes (list[int]): Números de nodos a evaluar.
+    - requiredReliabilities (list[float]): Grilla de confiabilidades compartida por las topologías.
+    - topologias (iterable[str]): Topologías a resolver (por defecto todas).
+    - workers (int): Número de procesos; con 1 se resuelve en el proceso actual.
+    - cacheDir (str, opcional): Directorio donde se guardan/leen resultados ya calculados.
+    - params (ModelParams, opcional): Parámetros del escenario (por defecto DEFAULT_PARAMS).
+    - motor (str): "gurobi" o "dp" (serie y paralelo en una pasada para todos los n; ver MOTORES).
+    - perfiles (dict, opcional): Parámetros de Gurobi por topología (ver Modelos.perfiles_solver.cargar_perfiles).
+
+    Retorna:
+    - dict: Listas de registros (ver registro_solucion) indexadas por "nodos_{n}_{topologia}".
+    """
+    if params is None:
+        params = DEFAULT_PARAMS
+    if perfiles is None:
+        perfiles = {}
+
+    for topologia in topologias:
+        if topologia not in TOPOLOGIAS:
+            raise ValueError(
+                f"Topología desconocida: {topologia}. Opciones: {', '.join(TOPOLOGIAS)}")
+    if motor not in MOTORES:
+        raise ValueError(f"Motor desconocido: {motor}. Opciones: {', '.join(MOTORES)}")
+
+    diccionarioResultados = {}
+    pendientes = []
+
+    for n in totalNodes:
+        for topologia in topologias:
+            if cacheDir:
+                registros = _leer_cache(cacheDir, _clave_cache(
+                    n, topologia, requiredReliabilities, params, motor, perfiles.get(topologia)))
+                if registros is not None:
+                    diccionarioResultados[f"nodos_{n}_{topologia}"] = registros
+                    print(f"Costos para {n} nodos en {topologia} leídos de caché")
+                    continue
+            pendientes.append((n, topologia))
+
+    def registrar(n, topologia, registros):
+        diccionarioResultados[f"nodos_{n}_{topologia}"] = registros
+        if cacheDir:
+            _escribir_cache(cacheDir, _clave_cache(
+                n, topologia, requiredReliabilities, params, motor, perfiles.get(topologia)), registros)
+        print(f"Calculo de costos minimizados para {n} nodos en {topologia} terminado")
+
+    # Motor DP: una pasada por topología cubre todos los n pendientes
+    for topologia in topologias:
+        nodosDp = [n for n, pendiente in pendientes if pendiente == topologia and _usa_dp(topologia, motor)]
+        if nodosDp:
+            for n, registros in calcular_registros_dp(nodosDp, topologia, requiredReliabilities, params).items():
+                registrar(n, topologia, registros)
+    pendientes = [(n, topologia) for n, topologia in pendientes if not _usa_dp(topologia, motor)]
+
+    if workers <= 1:
+        baseModels = {}
+        for n, topologia in pendientes:
+            if n not in baseModels:
+                baseModels[n] = construir_modelo_base(n, params)
+            registrar(n, topologia, calcular_registros_topologia(
+                n, topologia, requiredReliabilities, baseModels[n], params, perfiles.get(topologia)))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futuros = {
+                (n, topologia): pool.submit(_tarea_topologia, n, topologia, requiredReliabilities, params,
+                                             perfiles.get(topologia))
+                for n, topologia in pendientes
+            }
+            for (n, topologia), futuro in futuros.items():
+                registrar(n, topologia, futuro.result())
+
+    # Mantener el orden de entrada (nodos, topologías) en el diccionario
+    return {
+        f"nodos_{n}_{topologia}": diccionarioResultados[f"nodos_{n}_{topologia}"]
+        for n in totalNodes for topologia in topologias
+    }
+
+
+def costos_desde_registros(registrosPorClave):
+    """
+    Extrae los costos minimizados de los registros de calcular_registros_barrido.
+
+    Retorna:
+    - dict: Costos minimizados indexados por "nodos_{n}_{topologia}".
+    """
+    return {
+        clave: [registro["costo"] for registro in registros]
+        for clave, registros in registrosPorClave.items()
+    }
+
+
+def calcular_combinaciones_confLineal(totalNodes, requiredReliabilities, topologias=tuple(TOPOLOGIAS),
+                                      workers=1, cacheDir=None, params=None, motor="gurobi", perfiles=None):
+    """
+    Calcula los costos minimizados para cada número de nodos y topología solicitada.
+
+    Parámetros:
+    - totalNodes (list[int]): Números de nodos a evaluar.
+    - requiredReliabilities (list[float]): Grilla de confiabilidades compartida por las topologías.
+    - topologias (iterable[str]): Topologías a resolver (por defecto todas).
+    - workers (int): Número de procesos; con 1 se resuelve en el proceso actual.
+    - cacheDir (str, opcional): Directorio donde se guardan/leen resultados ya calculados.
+    - params (ModelParams, opcional): Parámetros del escenario (por defecto DEFAULT_PARAMS).
+    - motor (str): "gurobi" o "dp" (ver calcular_registros_barrido).
+    - perfiles (dict, opcional): Parámetros de Gurobi por topología (ver calcular_registros_barrido).
+
+    Retorna:
+    - dict: Costos minimizados indexados por "nodos_{n}_{topologia}".
+    """
+    return costos_desde_registros(calcular_registros_barrido(
+        totalNodes, requiredReliabilities, topologias, workers, cacheDir, params, motor, perfiles))
+
+
+def guardar_resultados(ruta, formato, totalNodes, topologias, requiredReliabilities, minimizedCosts):
+    """
+    Guarda los resultados de un barrido en JSON o CSV.
+
+    Parámetros:
+    - ruta (str): Archivo de salida.
+    - formato (str): "json" o "csv".
+    - totalNodes (list[int]): Números de nodos evaluados.
+    - topologias (list[str]): Topologías evaluadas.
+    - requiredReliabilities (list[float]): Grilla de confiabilidades.
+    - minimizedCosts (dict): Resultados de calcular_combinaciones_confLineal.
+    """
+    directorio = os.path.dirname(ruta)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+
+    if formato == "json":
+        with open(ruta, "w") as archivo:
+            json.dump({
+                "nodos": list(totalNodes),
+                "topologias": list(topologias),
+                "confiabilidades": list(requiredReliabilities),
+                "resultados": minimizedCosts,
+            }, archivo, indent=2)
+    elif formato == "csv":
+        with open(ruta, "w") as archivo:
+            archivo.write("topologia,nodos,confiabilidad,costo\n")
+            for n in totalNodes:
+                for topologia in topologias:
+                    costos = minimizedCosts[f"nodos_{n}_{topologia}"]
+                    for reqRel, costo in zip(requiredReliabilities, costos):
+                        archivo.write(
+                            f"{topologia},{n},{reqRel!r},{'' if costo is None else repr(costo)}\n")
+    else:
+        raise ValueError(f"Formato desconocido: {formato}. Opciones: json, csv")
+
+
+def cargar_resultados(ruta):
+    """
+    Carga los resultados guardados por guardar_resultados (JSON o CSV).
+
+    Retorna:
+    - Tuple[list[int], list[str], list[float], dict]: nodos, topologías, confiabilidades y resultados.
+    """
+    if ruta.endswith(".csv"):
+        totalNodes, topologias, requiredReliabilities = [], [], []
+        minimizedCosts = {}
+        with open(ruta) as archivo:
+            next(archivo)
+            for linea in archivo:
+                topologia, n, reqRel, costo = linea.rstrip("\n").split(",")
+                n, reqRel = int(n), float(reqRel)
+                if n not in totalNodes:
+                    totalNodes.append(n)
+                if topologia not in topologias:
+                    topologias.append(topologia)
+                if reqRel not in requiredReliabilities:
+                    requiredReliabilities.append(reqRel)
+                minimizedCosts.setdefault(f"nodos_{n}_{topologia}", []).append(
+                    float(costo) if costo else None)
+        return totalNodes, topologias, requiredReliabilities, minimizedCosts
+
+    with open(ruta) as archivo:
+        datos = json.load(archivo)
+    return datos["nodos"], datos["topologias"], datos["confiabilidades"], datos["resultados"]
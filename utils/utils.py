@@ -1,10 +1,37 @@
 from collections import defaultdict
+from functools import lru_cache
 from itertools import product
-import pandas as pd
-import re
 import os
-import numpy as np
-import matplotlib.pyplot as plt
+
+# pandas y matplotlib se importan en la primera función que los usa, para que
+# la validación, las grillas y los procesos de barrido no paguen su carga.
+
+
+# Nombres de los tipos de nodo en tablas y gráficas
+NOMBRES_TIPOS = ("Low", "Medium", "High")
+
+# Con más tipos que esto, la tabla de nodos muestra una columna con el tipo de cada nodo
+MAX_COLUMNAS_TIPOS = 8
+
+
+def cargar_pyplot():
+    """
+    Importa matplotlib.pyplot bajo demanda.
+
+    Retorna:
+    - module: matplotlib.pyplot.
+    """
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def ajustar_eje_confiabilidad(plt, requiredReliabilities):
+    """
+    Usa escala logit en el eje x cuando toda la grilla es de alta confiabilidad (p. ej. la grilla
+    "nueves"): en escala lineal los puntos se amontonan junto a 1.
+    """
+    if min(requiredReliabilities) >= 0.99:
+        plt.xscale("logit")
 
 
 def procesarResultadosTabla(totalNodes, decisionVariables, tipo="general"):
@@ -31,7 +58,7 @@ def procesarResultadosTabla(totalNodes, decisionVariables, tipo="general"):
     return xactiveNodes, yactiveNodes
 
 
-def mostrarResultadosTabla(totalNodes, minimizedCost, decisionVariables, tipo="general"):
+def mostrarResultadosTabla(totalNodes, minimizedCost, decisionVariables, tipo="general", nombresTipos=None):
     """
     Muestra los resultados de optimización en formato tabular.
 
@@ -40,6 +67,7 @@ def mostrarResultadosTabla(totalNodes, minimizedCost, decisionVariables, tipo="g
     - minimizedCost (float): Costo total de la solución.
     - decisionVariables (dict): Variables de decisión y sus valores.
     - tipo (str): Tipo de modelo ("general", "hibrido").
+    - nombresTipos (list[str], opcional): Nombre de cada tipo de nodo (por defecto Low/Mid/High Cost).
     """
     print("=" * 52)
     print(f"Cantidad de Nodos: {totalNodes}")
@@ -56,21 +84,29 @@ def mostrarResultadosTabla(totalNodes, minimizedCost, decisionVariables, tipo="g
     print(f"Costo enlaces: {decisionVariables.get('linksCost', 'N/A')}")
     print("=" * 52)
 
-    xactiveNodes, yactiveNodes = procesarResultadosTabla(
-        totalNodes, decisionVariables, tipo)
+    import pandas as pd
+
+    # Las tablas se construyen directamente desde las matrices (nodos × tipo / subred)
+    xactiveNodes = matriz_variables(decisionVariables, totalNodes, "x")
+    yactiveNodes = matriz_variables(decisionVariables, totalNodes, "y") if tipo == "hibrido" else None
 
     # Mostrar tabla de nodos activos (x)
-    columns_titles_x = ["Low Cost", "Mid Cost", "High Cost"]
+    columns_titles_x = ["Low Cost", "Mid Cost", "High Cost"] if nombresTipos is None else list(nombresTipos)
+    columns_titles_x += [f"Tipo {i}" for i in range(len(columns_titles_x), xactiveNodes.shape[1])]
     row_index = [u + 1 for u in range(totalNodes)]
-    tablax = pd.DataFrame(
-        xactiveNodes, columns=columns_titles_x, index=row_index)
+    if xactiveNodes.shape[1] > MAX_COLUMNAS_TIPOS:
+        tablax = pd.DataFrame(
+            {"Tipo": [columns_titles_x[i] for i in xactiveNodes.argmax(axis=1)]}, index=row_index)
+    else:
+        tablax = pd.DataFrame(
+            xactiveNodes, columns=columns_titles_x[:xactiveNodes.shape[1]], index=row_index)
     print("Nodos activos (x):")
     print(tablax)
     print("=" * 52)
 
     # Mostrar tabla de nodos activos (y) si es modelo híbrido
-    if tipo == "hibrido" and yactiveNodes:
-        columns_titles_y = [f"Subred {i}" for i in range(len(yactiveNodes[0]))]
+    if tipo == "hibrido" and yactiveNodes.size:
+        columns_titles_y = [f"Subred {i}" for i in range(yactiveNodes.shape[1])]
         tablay = pd.DataFrame(
             yactiveNodes, columns=columns_titles_y, index=row_index)
         print("Nodos activos (y):")
@@ -78,6 +114,49 @@ def mostrarResultadosTabla(totalNodes, minimizedCost, decisionVariables, tipo="g
         print("=" * 52)
 
 
+@lru_cache(maxsize=None)
+def indice_variable(nombre):
+    """
+    Separa el nombre de una variable de Gurobi en prefijo e índices.
+
+    Los nombres se repiten entre soluciones, por lo que el resultado se guarda en caché.
+
+    Ejemplo:
+    >>> indice_variable("x[3,1]")
+    ('x', (3, 1))
+    """
+    prefijo, _, indices = nombre.partition("[")
+    return prefijo, tuple(int(i) for i in indices[:-1].split(","))
+
+
+def matriz_variables(variables: dict, cantidadNodos: int, prefix: str):
+    """
+    Construye la matriz (nodos × índice) de las variables con un prefijo dado.
+
+    Parámetros:
+    - variables (dict): Variables de decisión y sus valores.
+    - cantidadNodos (int): Número de nodos en el modelo.
+    - prefix (str): Prefijo de las variables ("x" o "y").
+
+    Retorna:
+    - numpy.ndarray: Matriz de enteros con el valor redondeado de cada variable.
+    """
+    import numpy as np
+
+    filas, columnas, valores = [], [], []
+    inicio = prefix + "["
+    for var, val in variables.items():
+        if var.startswith(inicio):
+            u, j = indice_variable(var)[1]
+            filas.append(u)
+            columnas.append(j)
+            valores.append(val)
+
+    matriz = np.zeros((cantidadNodos, max(columnas, default=-1) + 1), dtype=int)
+    matriz[filas, columnas] = np.rint(valores).astype(int) if valores else 0
+    return matriz
+
+
 def procesarVariablesActivas(variables: dict, cantidadNodos: int, prefix: str) -> list[list[int]]:
     """
     Procesa las variables activas para construir una lista de valores por nodo.
@@ -90,12 +169,7 @@ def procesarVariablesActivas(variables: dict, cantidadNodos: int, prefix: str) -
     Retorna:
     - List[List[int]]: Lista de listas con los valores de las variables activas.
     """
-    activeNodes = [[] for _ in range(cantidadNodos)]
-    for var, val in variables.items():
-        if var.startswith(prefix):
-            u, _ = map(int, var[len(prefix) + 1:-1].split(","))
-            activeNodes[u].append(int(val))
-    return activeNodes
+    return matriz_variables(variables, cantidadNodos, prefix).tolist()
 
 
 def generate_equidistant_list(start, end, num_elements):
@@ -137,8 +211,10 @@ def graficar_costos_minimizados(requiredReliabilities, serieMinimizedCosts, topo
     Ejemplo:
     >>> graficar_costos_minimizados([0.6, 0.7, 0.8], [100, 120, 150])
     """
+    plt = cargar_pyplot()
     plt.figure(figsize=(10, 6))
     plt.plot(requiredReliabilities, serieMinimizedCosts, linestyle='-', color='b', marker='.')
+    ajustar_eje_confiabilidad(plt, requiredReliabilities)
     plt.title(f'Minimized Costs vs Required Reliability - {topology} Topology - {totalNodes} Nodes')
     plt.xlabel('Required Reliability')
     plt.ylabel('Minimized Costs')
@@ -185,6 +261,8 @@ def graficar_costos_totales(confiabilidades, cantidades_nodos, costos_totales):
     - costos_totales (list[float]): lista de costos en orden de product(confiabilidad, nodos)
     """
 
+    plt = cargar_pyplot()
+
     # Construir costos_por_confiabilidad internamente
     combinaciones = list(product(confiabilidades, cantidades_nodos))
     costos_por_confiabilidad = defaultdict(list)
@@ -207,93 +285,138 @@ def graficar_costos_totales(confiabilidades, cantidades_nodos, costos_totales):
     plt.tight_layout()
     plt.show()
 
+def matriz_tipos_por_solucion(decision_sets, numTipos=3):
+    """
+    Construye en una sola pasada la matriz (soluciones × tipos) con la cantidad de nodos de cada tipo.
+
+    Parámetros:
+    - decision_sets (list[dict]): variables de decisión de cada solución (pueden venir filtradas a x activas).
+    - numTipos (int): número mínimo de columnas (tipos de nodo).
+
+    Retorna:
+    - numpy.ndarray: matriz de enteros de forma (len(decision_sets), numTipos o más).
+    """
+    import numpy as np
+
+    filas = []
+    tipos = []
+    for s, decision in enumerate(decision_sets):
+        for var, val in decision.items():
+            if var.startswith("x[") and val > 0.5:
+                filas.append(s)
+                tipos.append(indice_variable(var)[1][1])
+
+    numTipos = max(numTipos, max(tipos, default=-1) + 1)
+    conteos = np.bincount(np.asarray(filas, dtype=np.int64) * numTipos + np.asarray(tipos, dtype=np.int64),
+                          minlength=len(decision_sets) * numTipos)
+    return conteos.reshape(len(decision_sets), numTipos)
+
+
+def tabla_distribucion_tipos(confiabilidades, cantidades_nodos, decision_sets, nombresTipos=NOMBRES_TIPOS):
+    """
+    Tabla con la cantidad de nodos por tipo para cada combinación (confiabilidad, número de nodos).
+
+    Parámetros:
+    - confiabilidades (list[float]): valores de confiabilidad (en orden de ejecución)
+    - cantidades_nodos (list[int]): cantidades de nodos (en orden de ejecución)
+    - decision_sets (list[dict]): lista de variables de decisión tal como las retorna el modelo
+    - nombresTipos (list[str]): nombre de cada tipo de nodo.
+
+    Retorna:
+    - pandas.DataFrame: columnas confiabilidad, cantidad_nodos y una columna por tipo.
+    """
+    import numpy as np
+    import pandas as pd
+
+    conteos = matriz_tipos_por_solucion(decision_sets, len(nombresTipos))
+    combinaciones = np.array(list(product(confiabilidades, cantidades_nodos))[:len(decision_sets)],
+                             dtype=float).reshape(-1, 2)
+
+    tabla = pd.DataFrame(conteos, columns=_nombres_columnas(nombresTipos, conteos.shape[1]))
+    tabla.insert(0, "confiabilidad", combinaciones[:, 0])
+    tabla.insert(1, "cantidad_nodos", combinaciones[:, 1].astype(int))
+    return tabla
+
+
+def _nombres_columnas(nombresTipos, numTipos):
+    return [nombre.lower() for nombre in nombresTipos[:numTipos]] + \
+        [f"tipo_{i}" for i in range(len(nombresTipos), numTipos)]
+
+
 # -------grafica barras
 
-def graficar_distribucion_apilada(confiabilidades, cantidades_nodos, decision_sets):
+def graficar_distribucion_apilada(confiabilidades, cantidades_nodos, decision_sets, nombresTipos=NOMBRES_TIPOS,
+                                  etiquetas=None):
     """
-    Genera una gráfica de barras apiladas de tipos de nodos (low, medium, high),
+    Genera una gráfica de barras apiladas de tipos de nodos (low, medium, high o los del catálogo),
     agrupadas por combinación de confiabilidad y número de nodos.
 
+    Los conteos se calculan con matriz_tipos_por_solucion y cada tipo se dibuja con una
+    sola llamada a `bar`, por lo que escala a miles de soluciones.
+
     Parámetros:
     - confiabilidades (list[float]): valores de confiabilidad (en orden de ejecución)
     - cantidades_nodos (list[int]): cantidades de nodos (en orden de ejecución)
     - decision_sets (list[dict]): lista de variables de decisión tal como las retorna el modelo
+    - nombresTipos (list[str]): nombre de cada tipo de nodo para la leyenda.
+    - etiquetas (bool, opcional): escribir la cantidad dentro de cada segmento; por defecto solo
+      si hay a lo sumo 100 barras.
     """
+    import numpy as np
+    plt = cargar_pyplot()
 
-    combinaciones = list(product(confiabilidades, cantidades_nodos))
-
-    datos = []
-    for idx, decision in enumerate(decision_sets):
-        conf, nodos = combinaciones[idx]
-        low = medium = high = 0
+    conteos = matriz_tipos_por_solucion(decision_sets, len(nombresTipos))
+    confs = np.array([conf for conf, _ in product(confiabilidades, cantidades_nodos)][:len(decision_sets)])
 
-        for var, val in decision.items():
-            if var.startswith("x[") and round(val) == 1:
-                _, tipo = map(
-                    int, var[var.find("[")+1:var.find("]")].split(","))
-                if tipo == 0:
-                    low += 1
-                elif tipo == 1:
-                    medium += 1
-                elif tipo == 2:
-                    high += 1
-
-        datos.append({
-            "confiabilidad": conf,
-            "cantidad_nodos": nodos,
-            "low": low,
-            "medium": medium,
-            "high": high
-        })
-
-    # Agrupar por confiabilidad para graficar
-    agrupados = defaultdict(list)
-    for d in datos:
-        agrupados[d["confiabilidad"]].append(d)
+    # Grupo (confiabilidad ordenada) y posición dentro del grupo (orden de ejecución)
+    confsUnicas, grupo = np.unique(confs, return_inverse=True)
+    orden = np.argsort(grupo, kind="stable")
+    inicioGrupo = np.searchsorted(grupo[orden], np.arange(len(confsUnicas)))
+    posicionEnGrupo = np.empty_like(grupo)
+    posicionEnGrupo[orden] = np.arange(len(grupo)) - inicioGrupo[grupo[orden]]
+    tamanoGrupo = np.bincount(grupo, minlength=len(confsUnicas))
 
     fig, ax = plt.subplots(figsize=(12, 6))
     bar_width = 0.25
     espacio_entre_grupos = 1.0
-    posiciones = []
-
-    colores = {
-        "low": "#1f77b4",
-        "medium": "#ff7f0e",
-        "high": "#2ca02c"
-    }
-
-    for i, conf in enumerate(sorted(agrupados.keys())):
-        grupo = agrupados[conf]
-        for j, item in enumerate(grupo):
-            x = i * espacio_entre_grupos + j * bar_width
-            posiciones.append(x)
-
-            l, m, h = item["low"], item["medium"], item["high"]
-            ax.bar(x, l, bar_width, color=colores["low"], edgecolor='black', linewidth=0.8)
-            ax.bar(x, m, bar_width, bottom=l, color=colores["medium"], edgecolor='black', linewidth=0.8)
-            ax.bar(x, h, bar_width, bottom=l + m, color=colores["high"], edgecolor='black', linewidth=0.8)
-
-            for height, y0, text in [(l, 0, l), (m, l, m), (h, l + m, h)]:
-                if height > 0:
-                    ax.text(x, y0 + height / 2, str(int(text)),
-                            ha='center', va='center', fontsize=8, color="white")
-
-    xtick_positions = [
-        i * espacio_entre_grupos + (len(agrupados[conf]) - 1) * bar_width / 2
-        for i, conf in enumerate(sorted(agrupados.keys()))
-    ]
-    xtick_labels = [f'{round(conf*100, 10)}%' for conf in sorted(agrupados.keys())]
+    posiciones = grupo * espacio_entre_grupos + posicionEnGrupo * bar_width
+
+    colores = ["#1f77b4", "#ff7f0e", "#2ca02c"]
+    if conteos.shape[1] > 20:
+        mapa = plt.get_cmap("turbo")
+        colores = [mapa(i / (conteos.shape[1] - 1)) for i in range(conteos.shape[1])]
+    elif conteos.shape[1] > len(colores):
+        mapa = plt.get_cmap("tab20")
+        colores = [mapa(i) for i in range(conteos.shape[1])]
+    nombres = list(nombresTipos[:conteos.shape[1]]) + [f"Tipo {i}" for i in range(len(nombresTipos), conteos.shape[1])]
+
+    # Con catálogos grandes solo se dibujan (y se listan en la leyenda) los tipos usados
+    tiposUsados = range(conteos.shape[1]) if conteos.shape[1] <= len(NOMBRES_TIPOS) else \
+        np.flatnonzero(conteos.sum(axis=0))
+
+    bases = np.zeros(len(conteos))
+    for k in tiposUsados:
+        ax.bar(posiciones, conteos[:, k], bar_width, bottom=bases, color=colores[k],
+               edgecolor='black', linewidth=0.8, label=nombres[k])
+        bases = bases + conteos[:, k]
+
+    if etiquetas is None:
+        etiquetas = len(conteos) <= 100
+    if etiquetas:
+        centros = np.cumsum(conteos, axis=1) - conteos / 2
+        for s, k in zip(*np.nonzero(conteos)):
+            ax.text(posiciones[s], centros[s, k], str(int(conteos[s, k])),
+                    ha='center', va='center', fontsize=8, color="white")
+
+    xtick_positions = np.arange(len(confsUnicas)) * espacio_entre_grupos + (tamanoGrupo - 1) * bar_width / 2
+    xtick_labels = [f'{round(conf*100, 10)}%' for conf in confsUnicas]
 
     ax.set_xticks(xtick_positions)  # Centrar las etiquetas en el grupo
     ax.set_xticklabels(xtick_labels)
     ax.set_ylabel('Cantidad de nodos')
     ax.set_xlabel('Confiabilidad')
     ax.set_title('Distribución de Nodos por Confiabilidad')
-    ax.legend(handles=[
-        plt.Rectangle((0, 0), 1, 1, color=colores["low"], label='Low', edgecolor='black', linewidth=0.8),
-        plt.Rectangle((0, 0), 1, 1, color=colores["medium"], label='Medium', edgecolor='black', linewidth=0.8),
-        plt.Rectangle((0, 0), 1, 1, color=colores["high"], label='High', edgecolor='black', linewidth=0.8),
-    ], title="Node Type")
+    ax.legend(title="Node Type")
 
     ax.grid(True, axis='y', linestyle='--', alpha=0.6)
     ax.set_yticks(range(0, max(cantidades_nodos) + 2, 1))  # Saltos en y de 1 en 1
@@ -1,11 +1,11 @@
-def validar_entrada(totalNodes: int, linkCost: float, reliabilityByNodeType: list | dict) -> None:
+def validar_entrada(totalNodes: int, linkCost: float, reliabilityByNodeType: list | tuple | dict) -> None:
     """
     Valida los parámetros de entrada para los modelos de optimización.
 
     Args:
         totalNodes (int): Número total de nodos en la red. Debe ser >= 4.
         linkCost (float): Costo de los enlaces en la red. Debe ser > 0.
-        reliabilityByNodeType (list | dict): Fiabilidad por tipo de nodo. Debe ser una lista o diccionario no vacío.
+        reliabilityByNodeType (list | tuple | dict): Fiabilidad por tipo de nodo. Debe ser una lista, tupla o diccionario no vacío.
 
     Raises:
         ValueError: Si alguno de los parámetros no cumple con los requisitos.
@@ -20,11 +20,11 @@ def validar_entrada(totalNodes: int, linkCost: float, reliabilityByNodeType: lis
     if linkCost <= 0:
         raise ValueError(
             f"El costo de un enlace debe ser mayor a 0. Se recibió: {linkCost}")
-    if not isinstance(reliabilityByNodeType, (list, dict)) or len(reliabilityByNodeType) == 0:
+    if not isinstance(reliabilityByNodeType, (list, tuple, dict)) or len(reliabilityByNodeType) == 0:
         raise ValueError(
-            f"reliabilityByNodeType debe ser una lista o diccionario no vacío. Se recibió: {type(reliabilityByNodeType)} con longitud {len(reliabilityByNodeType) if isinstance(reliabilityByNodeType, (list, dict)) else 'N/A'}"
+            f"reliabilityByNodeType debe ser una lista, tupla o diccionario no vacío. Se recibió: {type(reliabilityByNodeType)} con longitud {len(reliabilityByNodeType) if isinstance(reliabilityByNodeType, (list, tuple, dict)) else 'N/A'}"
         )
-    if isinstance(reliabilityByNodeType, list):
+    if isinstance(reliabilityByNodeType, (list, tuple)):
         if not all(isinstance(value, (int, float)) and 0 <= value <= 1 for value in reliabilityByNodeType):
             raise ValueError(
                 "Todos los valores en reliabilityByNodeType deben ser números entre 0 y 1.")